@@ -1,7 +1,28 @@
 """
 This file is for the code that will run every time this support package is run. 
+It exposes the in-process API, so importing the package no longer pulls every
+support module into its namespace. The API is only imported on first access,
+so the CLI does not pay for it at startup.
 
 Author: Rani Hinnawi
 Date: 2023-08-08
 """
-from support import *
+from typing import TYPE_CHECKING
+
+# Resolved lazily by __getattr__ at runtime, imported here for type checkers
+if TYPE_CHECKING:
+    from quickmerge.api import SortStats, sort
+
+# __all__ is the module attribute Python reads, so it keeps its dunder name
+__all__ = ["SortStats", "sort"]  # pylint: disable=invalid-name
+
+
+def __getattr__(name: str):
+    """
+    Loads the in-process API the first time one of its names is accessed
+    """
+    if name in __all__:
+        from quickmerge import api
+        return getattr(api, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,30 +12,233 @@ main module here.
 Author: Rani Hinnawi
 Date: 2023-08-22
 """
-from sys import stderr
+from sys import argv, stderr
 from pathlib import Path
+from importlib import import_module
 import argparse
-from support.is_valid_io import is_valid_io
-from quickmerge.run import run
+from support.is_valid_io import is_valid_io, is_valid_output
+from quickmerge.run_matrix import ALGORITHMS, PIVOT_OPTIONS, \
+    REFERENCE_ENGINES, REPRESENTATIONS, add_reference_jobs, build_run_matrix, \
+    load_run_matrix
 
 DEFAULT_FREQUENCY_TABLE_PATH = "hencoding/DefaultFreqTable.txt"
 
+# Subcommands are dispatched to their own modules before the main parser runs
+SUBCOMMANDS = {"convert": "quickmerge.convert", "serve": "quickmerge.daemon",
+               "submit": "quickmerge.client", "compare": "quickmerge.compare",
+               "scale": "quickmerge.scaling",
+               "generate": "quickmerge.generate"}
+
+if len(argv) > 1 and argv[1] in SUBCOMMANDS:
+    raise SystemExit(import_module(SUBCOMMANDS[argv[1]]).main(argv[2:]))
+
 # Set up command line argument parsing
 arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument("input_file", type=str, help="Input file pathname")
-arg_parser.add_argument("output_file", type=str, help="Output file pathname")
+arg_parser.add_argument("input_file", type=str,
+                        help="Input file pathname, - for stdin, or a "
+                        "directory to run every file in it")
+arg_parser.add_argument("output_file", type=str,
+                        help="Report output file pathname, - for stdout, or "
+                        "the report directory of a batch")
 arg_parser.add_argument("--debug", action="store_true",
                         help="Toggles debug mode to log errors to stderr")
+arg_parser.add_argument("--fast-parse", action="store_true",
+                        help="Parse input in bulk blocks into a typed array")
+arg_parser.add_argument("--parse-workers", type=int, metavar="N",
+                        help="Parse input in N worker processes over byte "
+                        "ranges of the file (0 for all cores)")
+arg_parser.add_argument("--binary", action="store_true",
+                        help="Read input as packed little-endian int64 records"
+                        " (implied by a .bin extension)")
+arg_parser.add_argument("--external", action="store_true",
+                        help="Run an external merge sort that spills sorted "
+                        "runs to disk instead of loading all records")
+arg_parser.add_argument("--memory-budget", type=float, default=64,
+                        help="Memory budget in MB for --external "
+                        "(default: 64)")
+arg_parser.add_argument("--sorted-output", type=str,
+                        help="Stream the full sorted records to this "
+                        "pathname (.bin for the binary format) or - for "
+                        "stdout, separately from the report. Required with "
+                        "--external and stdin input")
+arg_parser.add_argument("--temp-dir", type=str,
+                        help="Directory for --external spill files")
+arg_parser.add_argument("--warmup", type=int, default=0, metavar="N",
+                        help="Unlogged warmup runs before each configuration")
+arg_parser.add_argument("--repeat", type=int, metavar="N",
+                        help="Measured runs per configuration, overriding the "
+                        "run matrix")
+arg_parser.add_argument("--gc", choices=["enabled", "disabled", "collect"],
+                        default="enabled",
+                        help="Garbage collector handling around each run")
+arg_parser.add_argument("--config", type=str, metavar="PATH",
+                        help="TOML or JSON file declaring the run matrix")
+arg_parser.add_argument("--algorithm", nargs="+",
+                        choices=ALGORITHMS + REFERENCE_ENGINES,
+                        help="Only run these algorithms or reference engines")
+arg_parser.add_argument("--reference", action="store_true",
+                        help="Also run every available reference engine "
+                        "(sorted, list.sort, heapq heapsort, NumPy sort) and "
+                        "report each configuration's slowdown")
+arg_parser.add_argument("--pivot", nargs="+", choices=PIVOT_OPTIONS,
+                        help="Quicksort pivot options, overriding the run "
+                        "matrix")
+arg_parser.add_argument("--threshold", nargs="+", type=int, metavar="N",
+                        help="Quicksort insertion sort thresholds, overriding "
+                        "the run matrix")
+arg_parser.add_argument("--representation", nargs="+",
+                        choices=REPRESENTATIONS,
+                        help="Record representations sorted, overriding the "
+                        "run matrix")
+arg_parser.add_argument("--batch-workers", type=int, metavar="N",
+                        help="Worker processes for a directory of inputs "
+                        "(default: all cores)")
+arg_parser.add_argument("--export", nargs="+", metavar="PATH",
+                        help="Export all metrics with the environment to "
+                        "these .json or .csv pathnames")
+arg_parser.add_argument("--phases", action="store_true",
+                        help="Time the phases of the run (parse, convert, "
+                        "sort, format, write) and report their breakdown")
+arg_parser.add_argument("--trace", type=str, metavar="PATH",
+                        help="Trace sampled operations of each configuration "
+                        "in an extra untimed run, exported as Chrome trace "
+                        "events (.json) or in a compact binary format")
+arg_parser.add_argument("--trace-capacity", type=int, metavar="N",
+                        help="Events kept per configuration by --trace, the "
+                        "most recent ones (default: 100000)")
+arg_parser.add_argument("--trace-rate", type=float, metavar="RATE",
+                        help="Share of operations sampled by --trace "
+                        "(default: 1)")
+arg_parser.add_argument("--profile", type=str, metavar="DIR",
+                        help="Profile each configuration with cProfile in an "
+                        "extra untimed run, saving one .pstats file per "
+                        "configuration to this directory")
+arg_parser.add_argument("--profile-top", type=int, metavar="N",
+                        help="Hot functions reported per profile (default: "
+                        "10)")
+arg_parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the untimed run per configuration that "
+                        "traces memory with tracemalloc")
+arg_parser.add_argument("--no-cache", action="store_true",
+                        help="Always parse and sort, bypassing the result "
+                        "cache")
+arg_parser.add_argument("--cache-dir", type=str, metavar="DIR",
+                        help="Result cache directory (default: "
+                        "$QUICKMERGE_CACHE_DIR or ~/.cache/quickmerge)")
+arg_parser.add_argument("--cache-size", type=float, default=1024,
+                        metavar="MB",
+                        help="Result cache size in MB before the least "
+                        "recently used results are evicted (default: 1024)")
 args = arg_parser.parse_args()
+batch = Path(args.input_file).is_dir()
+
+if batch and (args.external or args.sorted_output or args.trace or
+              args.profile):
+    arg_parser.error("--external, --sorted-output, --trace and --profile "
+                     "cannot be used with an input directory")
+
+if args.trace and (args.external or "-" in (args.input_file, args.trace)):
+    arg_parser.error("--trace cannot be used with --external, stdin input or "
+                     "stdout")
+
+if args.profile and (args.external or args.input_file == "-"):
+    arg_parser.error("--profile cannot be used with --external or stdin "
+                     "input")
+
+if args.profile and not Path(args.profile).is_dir():
+    arg_parser.error("--profile requires an existing directory")
+
+if args.profile_top is not None and args.profile_top < 1:
+    arg_parser.error("--profile-top must be >= 1")
+
+if (args.trace_capacity is not None and args.trace_capacity < 1) or \
+        (args.trace_rate is not None and not 0 < args.trace_rate <= 1):
+    arg_parser.error("--trace-capacity must be >= 1 and --trace-rate above 0 "
+                     "and up to 1")
+
+if batch and not Path(args.output_file).is_dir():
+    arg_parser.error("an input directory requires an existing output "
+                     "directory")
+
+if batch and Path(args.output_file).resolve() == \
+        Path(args.input_file).resolve():
+    arg_parser.error("the output directory of a batch cannot be its input "
+                     "directory")
+
+if (args.external or args.input_file == "-") and not args.sorted_output:
+    arg_parser.error("--external and stdin input require --sorted-output")
+
+if args.export and any(Path(export).suffix.lower() not in (".json", ".csv")
+                       for export in args.export):
+    arg_parser.error("--export pathnames must end with .json or .csv")
+
+if args.output_file == "-" and args.sorted_output == "-":
+    arg_parser.error("only one of output_file and --sorted-output can be -")
+
+# Expand the run matrix from the config file and CLI overrides
+try:
+    jobs = build_run_matrix(
+        load_run_matrix(args.config) if args.config else None,
+        args.algorithm, args.pivot, args.threshold, args.representation,
+        args.repeat)
+except (OSError, ValueError) as error:
+    arg_parser.error(str(error))
+
+# Reference engines only run where their packages are installed
+if args.reference or any(job.algorithm in REFERENCE_ENGINES for job in jobs):
+    from quickmerge.reference_sorts import get_available_engines, \
+        is_available
+    for job in jobs:
+        if job.algorithm in REFERENCE_ENGINES and \
+                not is_available(job.algorithm):
+            arg_parser.error(f"{job.algorithm} requires a package that is "
+                             "not installed")
+    if args.reference:
+        jobs = add_reference_jobs(jobs, get_available_engines())
 
 # Convert file names into paths
 in_file = Path(args.input_file)
 out_file = Path(args.output_file)
+sorted_file = Path(args.sorted_output) if args.sorted_output else None
+trace_file = Path(args.trace) if args.trace else None
+
+# Results of byte-identical inputs run with the same settings are reused
+cache = None
+if not args.no_cache:
+    from support.result_cache import DEFAULT_CACHE_DIR, ResultCache
+    cache = ResultCache(args.cache_dir or DEFAULT_CACHE_DIR,
+                        int(args.cache_size * 1024 * 1024))
+
+# Run every file of an input directory in parallel. The runners are only
+# imported once the arguments are valid, so -h and usage errors stay fast
+if batch:
+    from quickmerge.run_batch import run_batch
+    raise SystemExit(0 if run_batch(
+        in_file, out_file, args.debug, args.batch_workers,
+        fast_parse=args.fast_parse, binary=args.binary,
+        parse_workers=args.parse_workers, warmup=args.warmup,
+        gc_mode=args.gc, jobs=jobs, cache=cache,
+        memory=not args.no_memory, phases=args.phases,
+        export=args.export or ()) else 1)
 
 # Validate file paths then run main program
 try:
-    is_valid_io(in_file, out_file)
-    run(in_file, out_file)
+    is_valid_io(in_file)
+    is_valid_output(*filter(None, [out_file, sorted_file, trace_file]),
+                    *map(Path, args.export or []))
+
+    from quickmerge.run import run
+    performance = run(
+        in_file, out_file, args.debug, args.fast_parse, args.binary,
+        args.external, int(args.memory_budget * 1024 * 1024), sorted_file,
+        args.temp_dir, args.parse_workers, args.warmup, args.gc, jobs, cache,
+        not args.no_memory, args.phases, trace_file, args.trace_capacity,
+        args.trace_rate, args.profile, args.profile_top)
+
+    if args.export:
+        from support.metrics_export import export_metrics
+        for export_file in args.export:
+            export_metrics(performance, export_file)
 except FileNotFoundError as fnfe:
     error_message = fnfe.args[0]
     if args.debug:
@@ -0,0 +1,169 @@
+"""
+api
+
+This module contains the in-process API of QuickMerge. It runs the sorting
+engines directly on in-memory data, without parsing an input file or writing a
+report, and returns the sorted records with the metrics of the run:
+
+    from quickmerge import sort
+    result, stats = sort([5, 3, 9], algorithm="quicksort", pivot="first")
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from array import array
+from importlib import import_module
+from typing import Any, Iterable, NamedTuple, Optional, Sequence, Tuple
+from support.benchmark_harness import copy_records
+from support.performance import Performance
+from quickmerge.run_matrix import ALGORITHMS, PIVOT_OPTIONS, RECORD_TYPECODE
+
+RECORD_SIZE = 8
+BYTE_FORMATS = ('B', 'b', 'c')
+
+# Engines are imported on first use, as module and class name per algorithm
+ENGINES = {"quicksort": ("quickmerge.quicksort", "Quicksort"),
+           "natural_merge_sort": ("quickmerge.natural_merge_sort",
+                                  "NaturalMergeSort")}
+
+
+class SortStats(NamedTuple):
+    """
+    Metrics of one sort run. Runtime is in nanoseconds and peak memory in
+    bytes, or None if the run was not instrumented.
+    """
+    algorithm: str
+    size: int
+    comparisons: int
+    exchanges: int
+    runtime: int
+    peak_memory: Optional[int] = None
+
+
+def sort(data: Any, algorithm="quicksort", pivot="first", threshold=2,
+         instrument=False, in_place=False) -> Tuple[Sequence[int], "SortStats"]:
+    """
+    Function that sorts in-memory records with one of the QuickMerge engines.
+    Lists and typed arrays are sorted as they are. Other buffers are sorted as
+    a typed array: untyped bytes-like objects are read as packed native-endian
+    int64 records. Any other iterable is sorted as a list.
+
+    Args:
+        data (Any): list, typed array, buffer or iterable of integer records
+        algorithm (str): "quicksort", "natural_merge_sort" or "auto" to
+            measure the records and pick the engine, pivot option and
+            threshold, in which case pivot and threshold are ignored
+        pivot (str): Quicksort pivot option
+        threshold (int): partition size Quicksort sorts by insertion sort
+        instrument (bool): True if tracing peak memory with tracemalloc,
+            which slows the sort down, otherwise False
+        in_place (bool): True if sorting a list, typed array or writable
+            typed buffer in place rather than a copy, otherwise False
+
+    Returns:
+        Sequence[int]: sorted records
+        SortStats: metrics of the run, naming the engine that was run
+
+    Raises:
+        ValueError: if an option is invalid or a buffer is not made of whole
+            records
+        TypeError: if data is neither a buffer nor an iterable
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Invalid algorithm: {algorithm}. Must be one of "
+                         f"{', '.join(ALGORITHMS)}")
+    if pivot not in PIVOT_OPTIONS:
+        raise ValueError(f"Invalid pivot: {pivot}. Must be one of "
+                         f"{', '.join(PIVOT_OPTIONS)}")
+
+    records = _as_records(data, in_place)
+    performance = Performance().set_size(len(records)) \
+        .set_memory_tracking(instrument)
+
+    if algorithm == "auto":
+        from quickmerge.presortedness import analyze_presortedness, \
+            choose_plan
+        algorithm, pivot, threshold, _ = choose_plan(
+            analyze_presortedness(records))
+
+    engine = load_engine(algorithm)
+
+    # As in the CLI, building the engine is traced but not timed. Stopping in
+    # all cases also stops the memory tracing
+    performance.start_memory_tracing()
+    try:
+        if algorithm == "quicksort":
+            sorter = engine(records, pivot, threshold)
+            performance.start()
+            result = sorter.q_sort()
+        else:
+            sorter = engine(records)
+            performance.start()
+            result = sorter.n_merge_sort()
+    finally:
+        performance.stop()
+
+    if algorithm != "quicksort":
+        # Natural Merge Sort relinks nodes, so copy values back to the records
+        _write_back(records, result)
+
+    stats = SortStats(algorithm, performance.get_size(),
+                      sorter.get_num_comparisons(), sorter.get_num_exchanges(),
+                      performance.get_runtime(), performance.get_peak_memory())
+    return records, stats
+
+
+def load_engine(algorithm: str) -> type:
+    """
+    Function that imports the sorting engine class of an algorithm
+
+    Args:
+        algorithm (str): "quicksort" or "natural_merge_sort"
+
+    Returns:
+        type: engine class, Quicksort or NaturalMergeSort
+    """
+    module_name, class_name = ENGINES[algorithm]
+    return getattr(import_module(module_name), class_name)
+
+
+def _as_records(data: Any, in_place: bool) -> Sequence[int]:
+    """
+    Helper function that turns the caller's data into sortable records, copying
+    it unless sorting in place was requested and is possible
+
+    Args:
+        data (Any): list, typed array, buffer or iterable of integer records
+        in_place (bool): True if the data should be sorted in place
+
+    Returns:
+        Sequence[int]: records to sort
+
+    Raises:
+        ValueError: if a buffer is not made of whole records
+        TypeError: if data is neither a buffer nor an iterable
+    """
+    if isinstance(data, (list, array)):
+        return data if in_place else copy_records(data)
+
+    try:
+        view = memoryview(data)
+    except TypeError:
+        # Case: plain iterable such as a tuple or generator
+        return list(data)
+
+    if view.format in BYTE_FORMATS:
+        if view.nbytes % RECORD_SIZE:
+            raise ValueError(f"buffer size {view.nbytes} is not a multiple "
+                             f"of {RECORD_SIZE} bytes")
+        view = view.cast('B').cast(RECORD_TYPECODE)
+
+    return view if in_place and not view.readonly else copy_records(view)
+
+
+def _write_back(records: Sequence[int], result: Iterable[int]) -> None:
+    """
+    Helper function that overwrites the records with sorted values in order
+    """
+    for i, value in enumerate(result):
+        records[i] = value
@@ -0,0 +1,131 @@
+"""
+client
+
+This module contains the thin client of the QuickMerge sort daemon. It sends
+one request over the daemon's Unix socket and prints the reply, so submitting a
+job costs a socket round trip rather than a full interpreter start with every
+engine imported. It is run as a subcommand of the package:
+python -m quickmerge submit input_file [...optional arguments]
+
+Requests and replies are single lines of JSON.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+import json
+import socket
+from pathlib import Path
+from sys import stderr, stdin
+from typing import Any, Dict, List
+from quickmerge.run_matrix import ALGORITHMS, PIVOT_OPTIONS
+
+DEFAULT_SOCKET_PATH = "/tmp/quickmerge.sock"
+
+
+def send_request(message: Dict[str, Any],
+                 socket_path=DEFAULT_SOCKET_PATH) -> Dict[str, Any]:
+    """
+    Function that sends one request to the sort daemon and waits for its reply
+
+    Args:
+        message (Dict[str, Any]): request, such as {"op": "sort", "data": [...]}
+        socket_path (str): Unix socket the daemon listens on
+
+    Returns:
+        Dict[str, Any]: reply of the daemon
+
+    Raises:
+        OSError: if the daemon cannot be reached
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+        with connection.makefile("rb") as replies:
+            reply = replies.readline()
+
+    if not reply:
+        raise ConnectionError("the sort daemon closed the connection")
+
+    return json.loads(reply)
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the submit subcommand
+
+    Args:
+        argv (List[str]): command line arguments after the subcommand name
+
+    Returns:
+        int: exit status
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m quickmerge submit")
+    arg_parser.add_argument("input_file", type=str, nargs="?",
+                            help="Input file pathname read by the daemon, or "
+                            "- to send records from stdin inline")
+    arg_parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET_PATH,
+                            help="Unix socket of the daemon (default: "
+                            f"{DEFAULT_SOCKET_PATH})")
+    arg_parser.add_argument("--algorithm", choices=ALGORITHMS,
+                            default="quicksort", help="Sorting algorithm")
+    arg_parser.add_argument("--pivot", choices=PIVOT_OPTIONS, default="first",
+                            help="Quicksort pivot option")
+    arg_parser.add_argument("--threshold", type=int, default=2, metavar="N",
+                            help="Quicksort insertion sort threshold")
+    arg_parser.add_argument("--instrument", action="store_true",
+                            help="Trace the peak memory of the sort")
+    arg_parser.add_argument("--sorted-output", type=str, metavar="PATH",
+                            help="Have the daemon write the sorted records to "
+                            "this pathname")
+    arg_parser.add_argument("--print", action="store_true",
+                            help="Print the sorted records")
+    arg_parser.add_argument("--stats", action="store_true",
+                            help="Print the daemon's queue depth and latency")
+    arg_parser.add_argument("--shutdown", action="store_true",
+                            help="Stop the daemon")
+    args = arg_parser.parse_args(argv)
+
+    if args.stats or args.shutdown:
+        message = {"op": "stats" if args.stats else "shutdown"}
+    elif args.input_file:
+        message = {"op": "sort", "algorithm": args.algorithm,
+                   "pivot": args.pivot, "threshold": args.threshold,
+                   "instrument": args.instrument, "return_data": args.print}
+
+        if args.input_file == "-":
+            try:
+                message["data"] = [int(num) for num in stdin.read().split()]
+            except ValueError as ve:
+                print(f"ERROR: {ve.args[0]}", file=stderr)
+                return 1
+        else:
+            message["path"] = str(Path(args.input_file).absolute())
+
+        if args.sorted_output:
+            message["output"] = str(Path(args.sorted_output).absolute())
+    else:
+        arg_parser.error("an input file, --stats or --shutdown is required")
+
+    try:
+        reply = send_request(message, args.socket)
+    except OSError as error:
+        print(f"ERROR: cannot reach the sort daemon at {args.socket}: "
+              f"{error}", file=stderr)
+        return 1
+
+    if not reply.get("ok"):
+        print(f"ERROR: {reply.get('error')}", file=stderr)
+        return 1
+
+    if "data" in reply:
+        print(' '.join(map(str, reply.pop("data"))))
+        reply.pop("ok")
+        print(json.dumps(reply), file=stderr)
+    else:
+        reply.pop("ok")
+        if reply:
+            print(json.dumps(reply, indent=2))
+
+    return 0
@@ -0,0 +1,131 @@
+"""
+compare
+
+This module contains the regression check of QuickMerge. It compares the
+runtimes of a new run against a stored baseline, both exported with --export,
+configuration by configuration. A configuration regresses when the bootstrap
+confidence interval of its speedup lies entirely below 1 and its median slows
+down by more than the threshold. It is run as a subcommand of the package and
+exits with status 1 on any regression, so it can gate a deployment:
+python -m quickmerge compare baseline.json current.json [--threshold PCT]
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+from sys import stderr
+from typing import Dict, List, NamedTuple, Optional
+from support.metrics_export import load_runtimes
+from support.output_formatters import format_metrics_comparison
+from support.performance import MetricKey
+from support.runtime_stats import CONFIDENCE, RuntimeComparison, \
+    compare_runtimes, percentile
+
+DEFAULT_THRESHOLD = 5.0
+
+
+class ConfigComparison(NamedTuple):
+    """
+    Outcome for one configuration: "regression", "improvement", "unchanged",
+    "new" (only in the current run) or "missing" (only in the baseline).
+    Medians are in ns.
+    """
+    key: "MetricKey"
+    status: str
+    baseline_median: Optional[float] = None
+    current_median: Optional[float] = None
+    comparison: Optional["RuntimeComparison"] = None
+
+
+def compare_metrics(baseline: Dict["MetricKey", List[int]],
+                    current: Dict["MetricKey", List[int]],
+                    threshold=DEFAULT_THRESHOLD, confidence=CONFIDENCE) \
+        -> List["ConfigComparison"]:
+    """
+    Function that compares the runtimes of every configuration of a current
+    run against a baseline. With a single run on either side the interval
+    collapses to the point estimate, so only the threshold applies.
+
+    Args:
+        baseline (Dict[MetricKey, List[int]]): baseline runtimes
+        current (Dict[MetricKey, List[int]]): current runtimes
+        threshold (float): change of the median, in percent, that a
+            significant difference must exceed to count
+        confidence (float): coverage of the speedup's confidence interval
+
+    Returns:
+        List[ConfigComparison]: outcome per configuration, baseline order
+            first
+    """
+    outcomes = []
+    limit = 1 + threshold / 100
+
+    for key in list(baseline) + [key for key in current
+                                 if key not in baseline]:
+        if key not in current:
+            outcomes.append(ConfigComparison(key, "missing"))
+            continue
+        if key not in baseline:
+            outcomes.append(ConfigComparison(key, "new"))
+            continue
+
+        comparison = compare_runtimes(baseline[key], current[key],
+                                      confidence)
+        baseline_median = percentile(sorted(baseline[key]), 50)
+        current_median = percentile(sorted(current[key]), 50)
+
+        # Speedup is baseline over current, so a slowdown is below 1
+        status = "unchanged"
+        if comparison.ci_high < 1 and comparison.speedup * limit < 1:
+            status = "regression"
+        elif comparison.ci_low > 1 and comparison.speedup > limit:
+            status = "improvement"
+
+        outcomes.append(ConfigComparison(key, status, baseline_median,
+                                         current_median, comparison))
+
+    return outcomes
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the compare subcommand
+
+    Args:
+        argv (List[str]): command line arguments after the subcommand name
+
+    Returns:
+        int: exit status, 1 if any configuration regressed and 2 if an export
+            cannot be read
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m quickmerge compare")
+    arg_parser.add_argument("baseline", type=str,
+                            help="Baseline metrics export (.json or .csv)")
+    arg_parser.add_argument("current", type=str,
+                            help="Current metrics export (.json or .csv)")
+    arg_parser.add_argument("--threshold", type=float, metavar="PCT",
+                            default=DEFAULT_THRESHOLD,
+                            help="Slowdown of a median, in percent, beyond "
+                            "which a significant difference fails the check "
+                            f"(default: {DEFAULT_THRESHOLD:g})")
+    arg_parser.add_argument("--confidence", type=float, default=CONFIDENCE,
+                            help="Coverage of the bootstrap confidence "
+                            f"intervals (default: {CONFIDENCE:g})")
+    args = arg_parser.parse_args(argv)
+
+    if not 0 < args.confidence < 1:
+        arg_parser.error("--confidence must be between 0 and 1")
+
+    try:
+        baseline = load_runtimes(args.baseline)
+        current = load_runtimes(args.current)
+    except (OSError, ValueError) as error:
+        print(f"ERROR: {error}", file=stderr)
+        return 2
+
+    outcomes = compare_metrics(baseline, current, args.threshold,
+                               args.confidence)
+    print(format_metrics_comparison(outcomes, args.threshold))
+
+    return 1 if any(outcome.status == "regression" for outcome in outcomes) \
+        else 0
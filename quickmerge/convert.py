@@ -0,0 +1,66 @@
+"""
+convert
+
+This module contains the command for converting record files between the
+whitespace-separated text format and the packed int64 binary format. It is run
+as a subcommand of the package:
+python -m quickmerge convert input_file output_file
+
+The direction of the conversion is taken from the file extensions.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+from pathlib import Path
+from sys import stderr, stdout
+from typing import List
+from support.binary_records import is_binary_file, convert_text_to_binary, \
+    convert_binary_to_text
+from support.pipeline import is_stdio
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the convert subcommand
+
+    Args:
+        argv (List[str]): command line arguments after the subcommand name
+
+    Returns:
+        int: exit status
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m quickmerge convert")
+    arg_parser.add_argument("input_file", type=str,
+                            help="Input file pathname (.dat or .bin)")
+    arg_parser.add_argument("output_file", type=str,
+                            help="Output file pathname (.dat or .bin), or - "
+                            "for text on stdout")
+    args = arg_parser.parse_args(argv)
+
+    in_file = Path(args.input_file)
+    out_file = Path(args.output_file)
+
+    if not in_file.exists():
+        print(f"ERROR: the file below does not exist\n- {in_file.name}",
+              file=stderr)
+        return 1
+
+    if is_binary_file(in_file) == is_binary_file(out_file):
+        print("ERROR: exactly one of the files must use the .bin extension",
+              file=stderr)
+        return 1
+
+    try:
+        if is_binary_file(in_file):
+            count = convert_binary_to_text(in_file, out_file)
+        else:
+            count = convert_text_to_binary(in_file, out_file)
+    except (ValueError, OverflowError) as error:
+        print(f"ERROR: {error.args[0]}", file=stderr)
+        return 1
+
+    # Keep stdout clean when the converted records are written to it
+    print(f"Converted {count} records: {in_file} -> {out_file}",
+          file=stderr if is_stdio(out_file) else stdout)
+    return 0
@@ -0,0 +1,318 @@
+"""
+daemon
+
+This module contains the long-running sort daemon of QuickMerge. It listens on
+a Unix socket and hands sort jobs to a pool of worker processes that are
+started, with every engine imported, before the first job arrives. Requests
+are handled with asyncio. Jobs beyond the number of workers wait for one to
+free up, and once the number waiting reaches its limit, new jobs are turned
+away with a "busy" reply so clients can back off and retry. It is run as a
+subcommand of the package:
+python -m quickmerge serve [--socket PATH] [--workers N]
+
+Requests and replies are single lines of JSON:
+    {"op": "sort", "data": [3, 1, 2]} or {"op": "sort", "path": "in.dat"}
+    {"op": "stats"}
+    {"op": "shutdown"}
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import signal
+import socket
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from os import cpu_count
+from sys import stderr
+from time import monotonic_ns
+from typing import Any, Dict, List, Optional
+from support.binary_records import is_binary_file, load_binary_records
+from support.fast_parse import parse_all_records_fast
+from support.record_writer import write_sorted_records
+from quickmerge.api import sort
+from quickmerge.client import DEFAULT_SOCKET_PATH
+
+DEFAULT_MAX_PENDING = 64
+LATENCY_WINDOW = 1024
+STREAM_LIMIT = 1 << 26
+
+
+class SortDaemon:
+    """
+    Class for serving sort jobs over a Unix socket from a warm worker pool
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH,
+                 workers: Optional[int] = None,
+                 max_pending=DEFAULT_MAX_PENDING) -> None:
+        """
+        Creates instance of SortDaemon
+
+        Args:
+            socket_path (str): Unix socket the daemon listens on
+            workers (int): number of worker processes, or None for all cores
+            max_pending (int): number of jobs waiting for a worker before
+                new ones are turned away as busy
+        """
+        self._socket_path = socket_path
+        self._workers = workers or cpu_count() or 1
+        self._max_pending = max(max_pending, 1)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+        # Jobs in flight, jobs waiting for a slot and recent latencies in ns
+        self._num_running = 0
+        self._num_waiting = 0
+        self._num_done = 0
+        self._num_failed = 0
+        self._num_rejected = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def serve(self) -> None:
+        """
+        Method that starts the worker pool and serves requests until a shutdown
+        request or a SIGINT/SIGTERM arrives
+        """
+        loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self._workers)
+        self._stopped = asyncio.Event()
+        _remove_stale_socket(self._socket_path)
+
+        with ProcessPoolExecutor(max_workers=self._workers,
+                                 initializer=_warm_worker) as pool:
+            self._pool = pool
+
+            # Workers start lazily, so make every one of them start now
+            await asyncio.gather(*(loop.run_in_executor(pool, os.getpid)
+                                   for _ in range(self._workers)))
+
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signal_number, self._stopped.set)
+
+            server = await asyncio.start_unix_server(
+                self._handle_connection, self._socket_path, limit=STREAM_LIMIT)
+            print(f"Sort daemon listening on {self._socket_path} with "
+                  f"{self._workers} workers", file=stderr)
+
+            try:
+                async with server:
+                    await self._stopped.wait()
+            finally:
+                if os.path.exists(self._socket_path):
+                    os.unlink(self._socket_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Method that reports the queue depth and the latency of recent jobs.
+        Latency runs from receiving a request to having its result, in μs.
+
+        Returns:
+            Dict[str, Any]: queue depth, job counts and latency percentiles
+        """
+        latencies = sorted(self._latencies)
+        stats = {"workers": self._workers, "max_pending": self._max_pending,
+                 "running": self._num_running, "waiting": self._num_waiting,
+                 "done": self._num_done, "failed": self._num_failed,
+                 "rejected": self._num_rejected}
+
+        if latencies:
+            stats["latency_us"] = {
+                "p50": latencies[len(latencies) // 2] // 1000,
+                "p95": latencies[int(len(latencies) * 0.95)] // 1000,
+                "max": latencies[-1] // 1000}
+
+        return stats
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """
+        Helper method that answers the requests of one connection in order
+        """
+        try:
+            while not self._stopped.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+
+                reply = await self._handle_request(line)
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError) as error:
+            # Case: client went away, or sent a line over the stream limit
+            print(f"Connection dropped: {error}", file=stderr)
+        finally:
+            writer.close()
+
+    async def _handle_request(self, line: bytes) -> Dict[str, Any]:
+        """
+        Helper method that runs one request and builds its reply
+
+        Args:
+            line (bytes): JSON request
+
+        Returns:
+            Dict[str, Any]: reply, with "ok" False and an "error" on failure
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as ve:
+            return {"ok": False, "error": f"invalid request: {ve}"}
+
+        op = request.get("op") if isinstance(request, dict) else None
+
+        if op == "stats":
+            return {"ok": True, **self.get_stats()}
+        if op == "shutdown":
+            self._stopped.set()
+            return {"ok": True}
+        if op != "sort":
+            return {"ok": False, "error": f"unknown op: {op}"}
+
+        # Turn the job away rather than queueing it without bound
+        if self._num_waiting >= self._max_pending:
+            self._num_rejected += 1
+            return {"ok": False, "error": "busy"}
+
+        received = monotonic_ns()
+
+        # Wait for a free worker
+        self._num_waiting += 1
+        async with self._slots:
+            self._num_waiting -= 1
+            self._num_running += 1
+            try:
+                reply = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, run_job, request)
+            except (BrokenProcessPool, pickle.PicklingError,
+                    RuntimeError) as error:
+                # Case: a worker died, the request could not be sent to it or
+                # the pool is shutting down
+                reply = {"ok": False,
+                         "error": f"{type(error).__name__}: {error}"}
+            finally:
+                self._num_running -= 1
+
+        latency = monotonic_ns() - received
+        self._latencies.append(latency)
+        if reply["ok"]:
+            self._num_done += 1
+        else:
+            self._num_failed += 1
+
+        reply["latency_us"] = latency // 1000
+        return reply
+
+
+def run_job(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Function run by a worker process for one sort job. Records come inline as
+    "data" or are loaded from the text or binary file at "path". The sorted
+    records are returned when "return_data" is set (the default for inline
+    data) and written to "output" when given.
+
+    Args:
+        request (Dict[str, Any]): sort request
+
+    Returns:
+        Dict[str, Any]: reply with the stats of the run, or an error
+    """
+    try:
+        if "data" in request:
+            records = request["data"]
+        elif "path" in request:
+            load = load_binary_records if is_binary_file(request["path"]) \
+                else parse_all_records_fast
+            records, error = load(request["path"])
+            if error:
+                return {"ok": False, "error": records[0]}
+        else:
+            return {"ok": False, "error": "a sort job needs data or a path"}
+
+        result, stats = sort(records, request.get("algorithm", "quicksort"),
+                             request.get("pivot", "first"),
+                             request.get("threshold", 2),
+                             request.get("instrument", False), in_place=True)
+
+        # Write sorted records outside of the timed region
+        if request.get("output"):
+            write_sorted_records(request["output"], result)
+
+        reply = {"ok": True, "stats": stats._asdict()}
+        if request.get("return_data", "data" in request):
+            reply["data"] = list(result)
+
+        return reply
+    except (OSError, ValueError, TypeError) as error:
+        return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+
+def _warm_worker() -> None:
+    """
+    Helper function that warms a worker up by running a tiny sort with each
+    engine, so first jobs do not pay for lazy setup
+    """
+    for algorithm in ("quicksort", "natural_merge_sort"):
+        sort([3, 1, 2], algorithm)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Helper function that removes a socket file left behind by a daemon that
+    did not shut down cleanly
+
+    Raises:
+        OSError: if another daemon is still listening on the socket
+    """
+    if not os.path.exists(socket_path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+
+    raise OSError(f"a sort daemon is already listening on {socket_path}")
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the serve subcommand
+
+    Args:
+        argv (List[str]): command line arguments after the subcommand name
+
+    Returns:
+        int: exit status
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m quickmerge serve")
+    arg_parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET_PATH,
+                            help="Unix socket to listen on (default: "
+                            f"{DEFAULT_SOCKET_PATH})")
+    arg_parser.add_argument("--workers", type=int, metavar="N",
+                            help="Worker processes (default: all cores)")
+    arg_parser.add_argument("--max-pending", type=int, metavar="N",
+                            default=DEFAULT_MAX_PENDING,
+                            help="Jobs waiting for a worker before new ones "
+                            "are turned away as busy (default: "
+                            f"{DEFAULT_MAX_PENDING})")
+    args = arg_parser.parse_args(argv)
+
+    daemon = SortDaemon(args.socket, args.workers, args.max_pending)
+
+    try:
+        asyncio.run(daemon.serve())
+    except OSError as error:
+        print(f"ERROR: {error}", file=stderr)
+        return 1
+
+    return 0
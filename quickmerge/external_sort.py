@@ -0,0 +1,324 @@
+"""
+external_sort
+
+This module contains a class for running an external merge sort on inputs that
+do not fit in memory. The input is streamed in chunks that fit a memory budget.
+Each chunk is sorted in memory, then spilled to a temporary file as a sorted
+run. The spilled runs are then k-way merged with buffered readers, the same
+run/merge structure as the natural merge sort but backed by disk.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import heapq
+from array import array
+from tempfile import TemporaryDirectory
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+from quickmerge.quicksort import Quicksort
+from quickmerge.natural_merge_sort import NaturalMergeSort
+from support.binary_records import iter_record_blocks, RECORD_SIZE
+from support.fast_parse import RECORD_TYPECODE
+from support.record_writer import RecordWriter
+
+# Approximate in-memory cost of one record for each chunk sorting engine
+BYTES_PER_RECORD = {"quicksort": RECORD_SIZE, "natural_merge": 200}
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_MAX_FAN_IN = 64
+
+
+class ExternalMergeSort:
+    """
+    Class for running and tracking an external merge sort. Methods can be
+    chained.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, engine="quicksort",
+                 pivot_option="median_of_three", insertion_threshold=16,
+                 max_fan_in=DEFAULT_MAX_FAN_IN,
+                 temp_dir: Optional[str] = None) -> "ExternalMergeSort":
+        if engine not in BYTES_PER_RECORD:
+            raise ValueError(f"Unknown chunk sorting engine: {engine}")
+
+        self._memory_budget = memory_budget
+        self._engine = engine
+        self._pivot_option = pivot_option
+        self._insertion_threshold = insertion_threshold
+        self._max_fan_in = max(max_fan_in, 2)
+        self._temp_dir = temp_dir
+        self._run_length = max(memory_budget // BYTES_PER_RECORD[engine], 1)
+
+        self._num_records = 0
+        self._num_comparisons = 0
+        self._num_exchanges = 0
+        self._num_spills = 0
+        self._bytes_spilled = 0
+        self._merge_fan_in = 0
+        self._num_merge_passes = 0
+
+    def sort(self, input_stream, writer: "RecordWriter", binary=False) \
+            -> "ExternalMergeSort":
+        """
+        Sort all records from an input stream into the writer. Chunks of up to
+        the run length are sorted in memory. If the whole input fits in one
+        chunk, it is written directly without spilling.
+
+        Args:
+            input_stream (BinaryIO): input stream opened in binary mode
+            writer (RecordWriter): destination of the sorted records
+            binary (bool): True if the input uses the binary record format
+
+        Returns:
+            ExternalMergeSort: current object instance
+
+        Raises:
+            ValueError: if a non-integer record is found
+        """
+        with TemporaryDirectory(prefix="quickmerge-",
+                                dir=self._temp_dir) as spill_dir:
+            spills = []
+            last_run = None
+
+            for chunk in self._iter_chunks(input_stream, binary):
+                last_run = self._sort_chunk(chunk)
+                if len(chunk) == self._run_length:
+                    # Case: input may exceed the budget. Spill the sorted run
+                    spills.append(self._spill(last_run, spill_dir))
+                    last_run = None
+
+            if not spills:
+                # Case: the whole input fit in a single in-memory chunk
+                writer.write_records(last_run)
+                return self
+
+            if last_run:
+                spills.append(self._spill(last_run, spill_dir))
+
+            # Merge spill files in passes until one pass can reach the output
+            while len(spills) > self._max_fan_in:
+                spills = self._merge_pass(spills, spill_dir)
+
+            self._merge_into(spills, writer)
+
+        return self
+
+    def _iter_chunks(self, input_stream, binary: bool) -> Iterator[array]:
+        """
+        Generator that regroups the input blocks into chunks of exactly the
+        run length, except for the last chunk.
+
+        Args:
+            input_stream (BinaryIO): input stream opened in binary mode
+            binary (bool): True if the input uses the binary record format
+
+        Yields:
+            array: chunk of unsorted records
+        """
+        chunk = array(RECORD_TYPECODE)
+        block_size = min(self._run_length * RECORD_SIZE, 1 << 22)
+
+        for block in iter_record_blocks(input_stream, binary, block_size):
+            start = 0
+            while start < len(block):
+                end = start + self._run_length - len(chunk)
+                chunk.extend(block[start:end])
+                start = end
+
+                if len(chunk) == self._run_length:
+                    yield chunk
+                    chunk = array(RECORD_TYPECODE)
+
+        if chunk or not self._num_records:
+            yield chunk
+
+    def _sort_chunk(self, chunk: array) -> Iterable[int]:
+        """
+        Sort one chunk in memory with the configured engine
+
+        Args:
+            chunk (array): unsorted records
+
+        Returns:
+            Iterable[int]: sorted records
+        """
+        self._num_records += len(chunk)
+
+        if self._engine == "quicksort":
+            sorter = Quicksort(chunk, self._pivot_option,
+                               self._insertion_threshold)
+            result = sorter.q_sort()
+        else:
+            sorter = NaturalMergeSort(chunk)
+            result = array(RECORD_TYPECODE, sorter.n_merge_sort().to_list())
+
+        self._num_comparisons += sorter.get_num_comparisons()
+        self._num_exchanges += sorter.get_num_exchanges()
+        return result
+
+    def _spill(self, records: Iterable[int], spill_dir: str) -> Path:
+        """
+        Write one sorted run to a new binary spill file
+
+        Args:
+            records (Iterable[int]): sorted records
+            spill_dir (str): directory holding the spill files
+
+        Returns:
+            Path: path of the spill file
+        """
+        spill_file = Path(spill_dir) / f"run{self._num_spills:06d}.bin"
+        with RecordWriter(spill_file, binary=True) as spill:
+            spill.write_records(records)
+            self._bytes_spilled += spill.get_num_bytes()
+
+        self._num_spills += 1
+        return spill_file
+
+    def _merge_pass(self, spills: List[Path], spill_dir: str) -> List[Path]:
+        """
+        Merge groups of up to max_fan_in spill files into new spill files
+
+        Args:
+            spills (List[Path]): spill files to merge
+            spill_dir (str): directory holding the spill files
+
+        Returns:
+            List[Path]: merged spill files
+        """
+        merged_spills = []
+        for i in range(0, len(spills), self._max_fan_in):
+            group = spills[i:i + self._max_fan_in]
+            spill_file = Path(spill_dir) / f"run{self._num_spills:06d}.bin"
+
+            with RecordWriter(spill_file, binary=True) as spill:
+                self._merge_into(group, spill)
+                self._bytes_spilled += spill.get_num_bytes()
+
+            self._num_spills += 1
+            merged_spills.append(spill_file)
+
+        return merged_spills
+
+    def _merge_into(self, spills: List[Path], writer: "RecordWriter") \
+            -> "ExternalMergeSort":
+        """
+        K-way merge sorted spill files into a writer. Each spill is read
+        through its own buffer sized so all buffers fit the memory budget.
+        Merged spill files are removed once consumed.
+
+        Args:
+            spills (List[Path]): sorted spill files
+            writer (RecordWriter): destination of the merged records
+
+        Returns:
+            ExternalMergeSort: current object instance
+        """
+        buffer_size = self._memory_budget // (len(spills) + 1)
+        buffer_size = max(buffer_size - buffer_size % RECORD_SIZE,
+                          RECORD_SIZE)
+
+        streams = [open(spill, 'rb') for spill in spills]
+        try:
+            readers = [self._read_spill(stream, buffer_size)
+                       for stream in streams]
+            writer.write_records(heapq.merge(*readers))
+        finally:
+            for stream in streams:
+                stream.close()
+
+        for spill in spills:
+            spill.unlink()
+
+        self._merge_fan_in = max(self._merge_fan_in, len(spills))
+        self._num_merge_passes += 1
+        return self
+
+    @staticmethod
+    def _read_spill(stream, buffer_size: int) -> Iterator[int]:
+        """
+        Generator that reads a spill file one buffer at a time
+
+        Args:
+            stream (BinaryIO): open spill file
+            buffer_size (int): bytes read per buffer
+
+        Yields:
+            int: next record of the spill file
+        """
+        for block in iter_record_blocks(stream, True, buffer_size):
+            yield from block
+
+    def get_num_records(self) -> int:
+        """
+        Method for indicating the number of records sorted
+
+        Returns:
+            int: number of records
+        """
+        return self._num_records
+
+    def get_run_length(self) -> int:
+        """
+        Method for indicating the number of records per in-memory chunk
+
+        Returns:
+            int: records per chunk
+        """
+        return self._run_length
+
+    def get_num_comparisons(self) -> int:
+        """
+        Method for indicating the number of comparisons that occurred while
+        sorting the in-memory chunks
+
+        Returns:
+            int: number of comparisons
+        """
+        return self._num_comparisons
+
+    def get_num_exchanges(self) -> int:
+        """
+        Method for indicating the number of exchanges that occurred while
+        sorting the in-memory chunks
+
+        Returns:
+            int: number of exchanges
+        """
+        return self._num_exchanges
+
+    def get_num_spills(self) -> int:
+        """
+        Method for indicating the number of spill files written, including
+        those written by intermediate merge passes
+
+        Returns:
+            int: number of spill files
+        """
+        return self._num_spills
+
+    def get_bytes_spilled(self) -> int:
+        """
+        Method for indicating the total number of bytes written to spill files
+
+        Returns:
+            int: bytes spilled
+        """
+        return self._bytes_spilled
+
+    def get_merge_fan_in(self) -> int:
+        """
+        Method for indicating the largest number of spill files merged at once
+
+        Returns:
+            int: merge fan-in
+        """
+        return self._merge_fan_in
+
+    def get_num_merge_passes(self) -> int:
+        """
+        Method for indicating the number of k-way merges performed
+
+        Returns:
+            int: number of merges
+        """
+        return self._num_merge_passes
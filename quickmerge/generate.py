@@ -0,0 +1,89 @@
+"""
+generate
+
+This module contains the command for generating synthetic input files. Records
+of a pattern are generated deterministically from a seed and streamed to the
+file block by block, so multi-GB inputs for benchmarks and --external runs can
+be made locally without holding them in memory. It is run as a subcommand of
+the package:
+python -m quickmerge generate output_file --pattern ran --size 10M
+
+The output format and compression are taken from the file extension.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+from sys import stderr, stdout
+from time import perf_counter_ns
+from typing import List
+from support.pipeline import is_stdio
+from support.synthetic_records import DEFAULT_BATCHES, DEFAULT_SEED, \
+    DEFAULT_TEETH, DEFAULT_UNIQUE, PATTERNS, parse_size, \
+    write_synthetic_records
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the generate subcommand
+
+    Args:
+        argv (List[str]): command line arguments after the subcommand name
+
+    Returns:
+        int: exit status
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m quickmerge generate")
+    arg_parser.add_argument("output_file", type=str,
+                            help="Output file pathname (.dat, .bin, "
+                            "optionally .gz, .bz2 or .xz), or - for stdout")
+    arg_parser.add_argument("--pattern", choices=PATTERNS, default="ran",
+                            help="Input pattern (default: ran)")
+    arg_parser.add_argument("--size", type=parse_size, required=True,
+                            metavar="N",
+                            help="Number of records, with an optional K, M "
+                            "or G suffix")
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                            help="Seed of the random patterns")
+    arg_parser.add_argument("--min-value", type=int, default=1,
+                            help="Smallest value (default: 1)")
+    arg_parser.add_argument("--max-value", type=int,
+                            help="Largest value (default: the smallest value "
+                            "plus the size minus 1)")
+    arg_parser.add_argument("--swaps", type=int, metavar="K",
+                            help="Random swaps of nearly_sorted (default: 1%% "
+                            "of the size)")
+    arg_parser.add_argument("--unique", type=int, default=DEFAULT_UNIQUE,
+                            metavar="K",
+                            help="Distinct values of few_unique (default: "
+                            f"{DEFAULT_UNIQUE})")
+    arg_parser.add_argument("--teeth", type=int, default=DEFAULT_TEETH,
+                            metavar="K",
+                            help="Ascending teeth of sawtooth (default: "
+                            f"{DEFAULT_TEETH})")
+    arg_parser.add_argument("--batches", type=int, default=DEFAULT_BATCHES,
+                            metavar="K",
+                            help="Sorted batches of sorted_batches (default: "
+                            f"{DEFAULT_BATCHES})")
+    arg_parser.add_argument("--binary", action="store_true",
+                            help="Write packed little-endian int64 records "
+                            "(implied by a .bin extension)")
+    args = arg_parser.parse_args(argv)
+
+    start = perf_counter_ns()
+    try:
+        num_bytes = write_synthetic_records(
+            args.output_file, args.pattern, args.size, args.seed, args.binary,
+            min_value=args.min_value, max_value=args.max_value,
+            swaps=args.swaps, unique=args.unique, teeth=args.teeth,
+            batches=args.batches)
+    except ValueError as error:
+        print(f"ERROR: {error.args[0]}", file=stderr)
+        return 1
+    seconds = (perf_counter_ns() - start) / 1e9
+
+    # Keep stdout clean when the records are written to it
+    print(f"Generated {args.size} {args.pattern} records ({num_bytes} bytes) "
+          f"in {seconds:.2f}s: {args.output_file}",
+          file=stderr if is_stdio(args.output_file) else stdout)
+    return 0
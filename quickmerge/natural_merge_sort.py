@@ -2,12 +2,17 @@
 natural_merge_sort
 
 This module contains a class for running an iterative natural merge sort while
-tracking the number of exchanges and comparisons done.
+tracking the number of exchanges and comparisons done. With phase timing, run
+detection and each merge pass are timed as phases of their own. With an
+operation trace, comparisons, exchanges, run detection and merges are sampled
+into it, whatever the input size.
 
 Author: Rani Hinnawi
 Date: 2023-08-22
 """
-from typing import List, Tuple
+from contextlib import nullcontext
+from time import perf_counter_ns
+from typing import ContextManager, List, Optional, Tuple
 from support.doubly_linked_list import DoublyLinkedList
 
 
@@ -17,11 +22,17 @@ class NaturalMergeSort:
     Original list is converted to a DoublyLinkedList for space optimization.
     """
 
-    def __init__(self, data: List[int]) -> "NaturalMergeSort":
+    def __init__(self, data: List[int],
+                 phases: Optional["Performance"] = None,
+                 trace: Optional["OperationTrace"] = None) \
+            -> "NaturalMergeSort":
+        self._phases = phases
+        self._trace = trace
         self._data = DoublyLinkedList().append_list(data)
         self._num_comparisons = 0
         self._num_exchanges = 0
         self._illustrate_merge = len(data) <= 50
+        self._logging = self._illustrate_merge or trace is not None
         self._comparisons = []
         self._exchanges = []
 
@@ -38,9 +49,17 @@ class NaturalMergeSort:
             return self._data
 
         # Partition into sorted runs then merge
-        runs = self._find_sorted_runs()
+        with self._phase("run detection"):
+            start = perf_counter_ns()
+            runs = self._find_sorted_runs()
+            if self._trace is not None:
+                self._trace.span("run detection", start, len(runs))
+
+        merge_pass = 0
         while len(runs) > 1:
-            runs = self._merge_runs(runs)
+            merge_pass += 1
+            with self._phase(f"merge pass {merge_pass}"):
+                runs = self._merge_runs(runs)
 
         return runs[0]
 
@@ -57,15 +76,19 @@ class NaturalMergeSort:
         # Cycle through data and identify runs. Add runs as smaller lists
         while current:
             sorted_run = DoublyLinkedList()
+            run_continues = True
 
-            while current and (not current.get_next() or
-                               current.get_next() >= current):
+            # Every run takes at least its first node, then extends while the
+            # next node does not descend
+            while current and run_continues:
                 # Log comparison
-                if current.get_next() and self._illustrate_merge:
-                    self._comparisons.append((current.get_data(),
-                                              current.get_next().get_data()))
+                if current.get_next() and self._logging:
+                    self._log_comparison(current.get_data(),
+                                         current.get_next().get_data())
                 self._num_comparisons += 1
 
+                run_continues = not current.get_next() or \
+                    current.get_next() >= current
                 temp = self._data.remove_head_node()
                 sorted_run.append_node(temp)
                 # Update the current pointer after removal
@@ -111,15 +134,19 @@ class NaturalMergeSort:
         Returns:
             DoublyLinkedList: Merged run.
         """
+        if self._trace is not None:
+            start = perf_counter_ns()
+            left_size, right_size = len(left), len(right)
+
         merged_run = DoublyLinkedList()
         left_node = left.get_head()
         right_node = right.get_head()
 
         while left_node and right_node:
             # Log the comparison
-            if self._illustrate_merge:
-                self._comparisons.append((left_node.get_data(),
-                                          right_node.get_data()))
+            if self._logging:
+                self._log_comparison(left_node.get_data(),
+                                     right_node.get_data())
             self._num_comparisons += 1
 
             if left_node <= right_node:
@@ -134,9 +161,8 @@ class NaturalMergeSort:
                 merged_run.append_node(temp)
 
                 # Log exchange: a farther-right number is being moved forward
-                if self._illustrate_merge:
-                    self._exchanges.append((left_node.get_data(),
-                                            temp.get_data()))
+                if self._logging:
+                    self._log_exchange(left_node.get_data(), temp.get_data())
                 self._num_exchanges += 1
 
         while left_node:
@@ -151,9 +177,50 @@ class NaturalMergeSort:
             right_node = right.get_head()
             merged_run.append_node(temp)
 
+        if self._trace is not None:
+            self._trace.span("merge", start, left_size, right_size)
+
         # Return merged list
         return merged_run
 
+    def _log_comparison(self, first: int, second: int) -> None:
+        """
+        Helper method for logging a comparison for the output and the trace
+
+        Args:
+            first (int): value compared
+            second (int): value it is compared against
+        """
+        if self._illustrate_merge:
+            self._comparisons.append((first, second))
+        if self._trace is not None:
+            self._trace.comparison(first, second)
+
+    def _log_exchange(self, first: int, second: int) -> None:
+        """
+        Helper method for logging an exchange for the output and the trace
+
+        Args:
+            first (int): value that stays behind
+            second (int): farther-right value moved forward
+        """
+        if self._illustrate_merge:
+            self._exchanges.append((first, second))
+        if self._trace is not None:
+            self._trace.exchange(first, second)
+
+    def _phase(self, name: str) -> ContextManager:
+        """
+        Helper method that times a phase of the sort, if phases are timed
+
+        Args:
+            name (str): name of the phase
+
+        Returns:
+            ContextManager: phase timer, or a context manager doing nothing
+        """
+        return self._phases.phase(name) if self._phases else nullcontext()
+
     def get_num_comparisons(self) -> int:
         """
         Method for indicating the number of comparisons that occurred during
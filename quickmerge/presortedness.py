@@ -0,0 +1,155 @@
+"""
+presortedness
+
+This module contains a cheap sampling pass that measures how presorted a set of
+records is, and the rules that pick a sorting engine and its settings from
+those measurements for the "auto" algorithm. The pass reads a fixed number of
+records whatever the input size:
+
+- run count and descending runs are estimated from the ascents and descents
+  between neighbours in evenly spaced windows of the records
+- the inversion ratio is the share of randomly sampled pairs that are out of
+  order
+- the duplicate ratio is the share of randomly sampled records whose value
+  repeats in the sample
+
+Sampling is seeded, so the same records always get the same plan.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from random import Random
+from typing import NamedTuple, Sequence
+
+SAMPLE_SIZE = 2048
+WINDOW_SIZE = 64
+SAMPLE_SEED = 0
+
+# Thresholds of the plan rules, calibrated on the resources/input patterns.
+# The Quicksort partition sends keys equal to the pivot to one side, so heavy
+# duplicates degrade it towards quadratic time
+HEAVY_DUPLICATE_RATIO = 0.5
+MAX_MERGE_RUNS = 4
+SORTED_INVERSIONS = 0.01
+NEARLY_SORTED_INVERSIONS = 0.25
+MIN_LONG_RUN = 16
+NEARLY_SORTED_THRESHOLD = 16
+
+
+class PresortednessFeatures(NamedTuple):
+    """
+    Measurements of the sampling pass. Runs are estimates for all records.
+    """
+    size: int
+    sample_size: int
+    runs: int
+    descending_runs: int
+    inversion_ratio: float
+    duplicate_ratio: float
+
+
+class SortPlan(NamedTuple):
+    """
+    Engine and settings chosen for a set of records, with the reason
+    """
+    algorithm: str
+    pivot: str
+    insertion_threshold: int
+    reason: str
+
+
+def analyze_presortedness(records: Sequence[int], sample_size=SAMPLE_SIZE,
+                          seed=SAMPLE_SEED) -> "PresortednessFeatures":
+    """
+    Function that estimates the presortedness of the records from a sample of
+    about sample_size records. Inputs no larger than the sample are measured
+    exactly, apart from the inversion ratio.
+
+    Args:
+        records (Sequence[int]): records to measure
+        sample_size (int): number of records read by each estimate
+        seed (int): seed of the random pair and record samples
+
+    Returns:
+        PresortednessFeatures: run count, descending runs, inversion ratio
+            and duplicate ratio
+    """
+    size = len(records)
+    if size < 2:
+        return PresortednessFeatures(size, size, size, size, 0.0, 0.0)
+
+    sample_size = max(min(sample_size, size), 2)
+    rng = Random(seed)
+
+    # Neighbours are compared within evenly spaced windows, so local order is
+    # measured without reading every record
+    window = min(WINDOW_SIZE, size)
+    num_windows = max(sample_size // window, 1)
+    step = (size - window) / max(num_windows - 1, 1)
+    pairs = descents = ascents = 0
+
+    for start in {int(i * step) for i in range(num_windows)}:
+        for i in range(start, start + window - 1):
+            pairs += 1
+            if records[i + 1] < records[i]:
+                descents += 1
+            elif records[i + 1] > records[i]:
+                ascents += 1
+
+    # Ascending runs end at a descent and descending runs at an ascent
+    runs = 1 + round(descents / pairs * (size - 1))
+    descending_runs = 1 + round(ascents / pairs * (size - 1))
+
+    # Pairs of equal indices can never be inverted, so they are not counted
+    indices = rng.choices(range(size), k=2 * sample_size)
+    num_pairs = inversions = 0
+    for i, j in zip(indices[::2], indices[1::2]):
+        if i != j:
+            num_pairs += 1
+            if records[min(i, j)] > records[max(i, j)]:
+                inversions += 1
+
+    values = [records[i] for i in rng.sample(range(size), sample_size)]
+    duplicate_ratio = 1 - len(set(values)) / sample_size
+
+    return PresortednessFeatures(size, sample_size, runs, descending_runs,
+                                 inversions / max(num_pairs, 1),
+                                 duplicate_ratio)
+
+
+def choose_plan(features: "PresortednessFeatures") -> "SortPlan":
+    """
+    Function that picks the engine, pivot option and insertion sort threshold
+    for records with the measured features
+
+    Args:
+        features (PresortednessFeatures): measurements of the records
+
+    Returns:
+        SortPlan: chosen engine and settings
+    """
+    if features.duplicate_ratio >= HEAVY_DUPLICATE_RATIO:
+        return SortPlan("natural_merge_sort", "first", 2,
+                        "heavy duplicates degrade Quicksort partitioning")
+
+    # A few run boundaries can fall between the sampled windows, so sorted
+    # input also needs next to no inversions
+    if features.runs <= MAX_MERGE_RUNS and \
+            features.inversion_ratio <= SORTED_INVERSIONS:
+        return SortPlan("natural_merge_sort", "first", 2,
+                        "records are sorted or nearly so, which Natural Merge "
+                        "Sort finishes in few passes")
+
+    # Median of three keeps sorted and reversed stretches from producing
+    # one-sided partitions, which the first and last pivots do not
+    if features.inversion_ratio <= NEARLY_SORTED_INVERSIONS or \
+            features.size / features.runs >= MIN_LONG_RUN:
+        return SortPlan("quicksort", "median_of_three",
+                        NEARLY_SORTED_THRESHOLD,
+                        "small partitions of long ascending runs are cheap to "
+                        "insertion sort")
+
+    return SortPlan("quicksort", "median_of_three", 2,
+                    "mostly descending records"
+                    if features.descending_runs < features.runs
+                    else "unordered records")
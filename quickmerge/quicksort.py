@@ -2,12 +2,16 @@
 quicksort
 
 This module contains a class for running an iterative quicksort algorithm while
-tracking the number of exchanges and comparisons done.
+tracking the number of exchanges and comparisons done. With phase timing, the
+time spent partitioning and insertion sorting small partitions is also logged.
+With an operation trace, comparisons, exchanges, partitions and insertion sorts
+are sampled into it, whatever the input size.
 
 Author: Rani Hinnawi
 Date: 2023-08-22
 """
-from typing import List, Tuple
+from time import perf_counter_ns
+from typing import List, Optional, Tuple
 
 
 class Quicksort:
@@ -16,11 +20,16 @@ class Quicksort:
     """
 
     def __init__(self, data: List[int], pivot_option: str,
-                 insertion_threshold: int) -> "Quicksort":
+                 insertion_threshold: int,
+                 phases: Optional["Performance"] = None,
+                 trace: Optional["OperationTrace"] = None) -> "Quicksort":
         self._data = data
+        self._phases = phases
+        self._trace = trace
         self._num_comparisons = 0
         self._num_exchanges = 0
         self._illustrate_sort = len(data) <= 50
+        self._logging = self._illustrate_sort or trace is not None
         self._comparisons = []
         self._exchanges = []
         self._pivot_option = pivot_option
@@ -33,32 +42,58 @@ class Quicksort:
         Returns:
             List[int]: sorted data
         """
+        # Phase times are summed locally and logged once, to keep the timers
+        # cheap next to small partitions
+        time_phases = self._phases is not None
+        tracing = self._trace is not None
+        timing = time_phases or tracing
+        partition_time = partition_calls = 0
+        insertion_time = insertion_calls = 0
+
         # Initialize the stack with the entire array
         stack = [(0, len(self._data) - 1)]
         while stack:
             low, high = stack.pop()
             if low < high:
                 # Log comparison
-                if self._illustrate_sort:
-                    self._comparisons.append((low, high))
+                if self._logging:
+                    self._log_comparison(low, high)
                 self._num_comparisons += 1
 
                 if high - low + 1 <= self._insertion_threshold:
                     # Log comparison
-                    if self._illustrate_sort:
-                        self._comparisons.append(
-                            (high - low + 1, self._insertion_threshold))
+                    if self._logging:
+                        self._log_comparison(high - low + 1,
+                                             self._insertion_threshold)
                     self._num_comparisons += 1
 
                     # Run insertion sort on partition
+                    start = perf_counter_ns() if timing else 0
                     self._insertion_sort(low, high)
+                    if time_phases:
+                        insertion_time += perf_counter_ns() - start
+                        insertion_calls += 1
+                    if tracing:
+                        self._trace.span("insertion sort", start, low, high)
                 else:
                     # Partition size > insertion threshold
+                    start = perf_counter_ns() if timing else 0
                     pivot_index = self._choose_pivot(low, high)
                     pivot_index = self._partition(low, high, pivot_index)
+                    if time_phases:
+                        partition_time += perf_counter_ns() - start
+                        partition_calls += 1
+                    if tracing:
+                        self._trace.span("partition", start, low, high)
                     stack.append((low, pivot_index - 1))
                     stack.append((pivot_index + 1, high))
 
+        if time_phases:
+            self._phases.log_phase("partition", partition_time,
+                                   partition_calls)
+            self._phases.log_phase("insertion sort", insertion_time,
+                                   insertion_calls)
+
         return self._data
 
     def _choose_pivot(self, low: int, high: int) -> int:
@@ -97,21 +132,21 @@ class Quicksort:
             # Compare and potentially move elements to the right
             while j >= low and self._data[j] > key:
                 # Log comparison
-                if self._illustrate_sort:
-                    self._comparisons.append((self._data[j], low))
+                if self._logging:
+                    self._log_comparison(self._data[j], low)
                 self._num_comparisons += 1
 
                 # Move the element to the right and log exchange
-                if self._illustrate_sort:
-                    self._exchanges.append((self._data[j + 1], self._data[j]))
+                if self._logging:
+                    self._log_exchange(self._data[j + 1], self._data[j])
                 self._num_exchanges += 1
 
                 self._data[j + 1] = self._data[j]
                 j -= 1
 
             # Insert key at correct position and log exchange
-            if self._illustrate_sort:
-                self._exchanges.append((self._data[j + 1], key))
+            if self._logging:
+                self._log_exchange(self._data[j + 1], key)
             self._num_exchanges += 1
 
             self._data[j + 1] = key
@@ -137,12 +172,13 @@ class Quicksort:
         # Partition around pivot
         i = low
         for j in range(low, high):
+            # Every element is compared against the pivot, moved or not
+            if self._logging:
+                self._log_comparison(self._data[j], pivot_value)
+            self._num_comparisons += 1
+
             if self._data[j] <= pivot_value:
                 # Swap around pivot
-                if self._illustrate_sort:
-                    self._comparisons.append((self._data[j], pivot_value))
-                self._num_comparisons += 1
-
                 self._swap(i, j)
                 i += 1
 
@@ -180,13 +216,39 @@ class Quicksort:
             Quicksort: current object instance
         """
         # Log exchange
-        if self._illustrate_sort:
-            self._exchanges.append((self._data[i], self._data[j]))
+        if self._logging:
+            self._log_exchange(self._data[i], self._data[j])
         self._num_exchanges += 1
 
         self._data[i], self._data[j] = self._data[j], self._data[i]
         return self
 
+    def _log_comparison(self, first: int, second: int) -> None:
+        """
+        Helper method for logging a comparison for the output and the trace
+
+        Args:
+            first (int): value compared
+            second (int): value it is compared against
+        """
+        if self._illustrate_sort:
+            self._comparisons.append((first, second))
+        if self._trace is not None:
+            self._trace.comparison(first, second)
+
+    def _log_exchange(self, first: int, second: int) -> None:
+        """
+        Helper method for logging an exchange for the output and the trace
+
+        Args:
+            first (int): value moved out of place
+            second (int): value moved into its place
+        """
+        if self._illustrate_sort:
+            self._exchanges.append((first, second))
+        if self._trace is not None:
+            self._trace.exchange(first, second)
+
     def get_num_comparisons(self) -> int:
         """
         Method for indicating the number of comparisons that occurred during
@@ -0,0 +1,103 @@
+"""
+reference_sorts
+
+This module contains the reference engines that Quicksort and Natural Merge
+Sort are compared against: what the platform offers out of the box. They
+neither count comparisons nor exchanges, so only their runtimes are logged.
+
+- sorted: the built-in sorted(), returning a new list
+- list_sort: list.sort(), sorting a list in place
+- heapsort: heapq.heapify() followed by n calls to heapq.heappop()
+- numpy_sort: numpy.ndarray.sort() on 64-bit integers, if NumPy is installed
+
+Each engine's input is prepared outside the timed region, since list.sort()
+and heapq need a list and NumPy its own array, so runtimes cover the sort
+alone.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from heapq import heapify, heappop
+from importlib.util import find_spec
+from typing import Any, List, Sequence
+from quickmerge.run_matrix import LIST_ENGINES, REFERENCE_ENGINES
+
+# Engines that need a package that may not be installed
+OPTIONAL_PACKAGES = {"numpy_sort": "numpy"}
+
+
+def is_available(engine: str) -> bool:
+    """
+    Function that checks whether a reference engine can run here
+
+    Args:
+        engine (str): one of REFERENCE_ENGINES
+
+    Returns:
+        bool: True if the engine's package is installed, otherwise False
+    """
+    package = OPTIONAL_PACKAGES.get(engine)
+    return package is None or find_spec(package) is not None
+
+
+def get_available_engines() -> List[str]:
+    """
+    Function that lists the reference engines that can run here
+
+    Returns:
+        List[str]: available engines, in REFERENCE_ENGINES order
+    """
+    return [engine for engine in REFERENCE_ENGINES if is_available(engine)]
+
+
+def prepare_records(engine: str, records: Sequence[int]) -> Any:
+    """
+    Function that puts a copy of the records in the form an engine sorts, to
+    be called before the timer starts. Lists are used as they are.
+
+    Args:
+        engine (str): one of REFERENCE_ENGINES
+        records (Sequence[int]): isolated copy of the records
+
+    Returns:
+        Any: records ready for reference_sort
+
+    Raises:
+        ValueError: if a record does not fit in a 64-bit integer for NumPy
+    """
+    if engine == "numpy_sort":
+        import numpy
+        try:
+            return numpy.asarray(records, dtype=numpy.int64)
+        except OverflowError as error:
+            raise ValueError(f"NumPy sort requires 64-bit records: "
+                             f"{error}") from error
+
+    if engine in LIST_ENGINES and not isinstance(records, list):
+        return list(records)
+
+    return records
+
+
+def reference_sort(engine: str, records: Any) -> Sequence[int]:
+    """
+    Function that sorts records prepared by prepare_records with a reference
+    engine. This is the part that is timed.
+
+    Args:
+        engine (str): one of REFERENCE_ENGINES
+        records (Any): records returned by prepare_records
+
+    Returns:
+        Sequence[int]: sorted records, a list or NumPy array
+    """
+    if engine == "sorted":
+        return sorted(records)
+
+    if engine == "heapsort":
+        heapify(records)
+        return [heappop(records) for _ in range(len(records))]
+
+    # list.sort() and ndarray.sort() both sort in place
+    records.sort()
+    return records
@@ -3,24 +3,50 @@ run
 
 This module contains the primary function for QuickMerge. It assumes valid I/O.
 While running, it logs performance metrics. All results are written to the 
-output file.
+output file. The external sort, the parallel parser and each sort runner are
+imported only when a run needs them, to keep startup short.
 
 Author: Rani Hinnawi
 Date: 2023-08-22
 """
+from functools import partial
+from io import TextIOWrapper
+from os import path
+from pathlib import Path
+from shutil import copyfile
 from sys import stderr
-from typing import TextIO, List, Union
-from support.output_formatters import write_to_output, format_original_records
-from support.format_performance_report import format_performance_report
+from typing import Callable, List, Optional, Sequence, TextIO, Tuple, Union
+from support.benchmark_harness import BenchmarkHarness, get_records_footprint
+from support.binary_records import is_binary_file, load_binary_records, \
+    read_binary_records
+from support.compressed_io import detect_compression, open_input_stream, \
+    open_records
+from support.fast_parse import parse_all_records_fast
+from support.output_formatters import write_to_output, \
+    format_original_records, format_parse_throughput, format_decompression, \
+    format_sort_plan, format_records_memory, format_trace_summary, \
+    format_profile_summary
+from support.format_performance_report import format_performance_report, \
+    format_phase_breakdown
 from support.performance import Performance
-from quickmerge.run_quicksort import run_quicksort
-from quickmerge.run_n_merge_sort import run_n_merge_sort
+from support.pipeline import is_stdio
+from support.result_cache import ResultCache
+from quickmerge.run_matrix import REFERENCE_ENGINES, SortJob, \
+    build_run_matrix, input_pattern, to_representation
+
+SECTION_TITLES = {"quicksort": "Quicksort",
+                  "natural_merge_sort": "Natural Merge Sort", "auto": "Auto",
+                  "sorted": "Reference: sorted()",
+                  "list_sort": "Reference: list.sort()",
+                  "heapsort": "Reference: heapq heapsort",
+                  "numpy_sort": "Reference: NumPy sort"}
 
 
 def parse_all_records(input_file: TextIO) -> Union[List[int], bool]:
     """
     Helper function for retrieving all records from a data input file. This
-    assumes multiple records spread across multiple lines. 
+    assumes multiple records spread across multiple lines. The file may be
+    gzip, bz2 or xz compressed, or already open as a binary stream.
 
     Args:
         input_file (TextIO): text file with string items to sort
@@ -35,88 +61,484 @@ def parse_all_records(input_file: TextIO) -> Union[List[int], bool]:
     all_integers = []
 
     # Read each line in input file. Add records to output list
-    with open(input_file, 'r', encoding="utf-8") as records:
-        for line in records:
-            line = line.strip()
-            if line:
-                # If empty line, skip to the next. Ensure records are integers
-                try:
-                    integers = [int(num) for num in line.split()]
-                    all_integers.extend(integers)
-                except ValueError as ve:
-                    # If record cannot be cast as an int, it is invalid
-                    error_message = [ve.args[0]]
-                    return error_message, True
+    with open_records(input_file) as stream:
+        records = TextIOWrapper(stream, encoding="utf-8")
+        try:
+            for line in records:
+                line = line.strip()
+                if line:
+                    # If empty line, skip to the next. Ensure records are ints
+                    try:
+                        integers = [int(num) for num in line.split()]
+                        all_integers.extend(integers)
+                    except ValueError as ve:
+                        # If record cannot be cast as an int, it is invalid
+                        error_message = [ve.args[0]]
+                        return error_message, True
+        finally:
+            # Leave the underlying stream open for its owner to close
+            records.detach()
 
     return all_integers, False
 
 
-def run(input_file: TextIO, output_file: TextIO, debug=False):
+def run(input_file: TextIO, output_file: TextIO, debug=False,
+        fast_parse=False, binary=False, external=False,
+        memory_budget: Optional[int] = None,
+        sorted_output: Optional[TextIO] = None,
+        temp_dir: Optional[str] = None, parse_workers: Optional[int] = None,
+        warmup=0, gc_mode="enabled", jobs: Optional[List["SortJob"]] = None,
+        cache: Optional["ResultCache"] = None, memory=True,
+        phases=False, trace_output: Optional[TextIO] = None,
+        trace_capacity: Optional[int] = None,
+        trace_rate: Optional[float] = None,
+        profile_dir: Optional[str] = None,
+        profile_top: Optional[int] = None) -> "Performance":
     """
     Wrapper function for running Quicksort and Natural Merge Sort using input
     file data, then writing results and performance metrics to output file.
+    Reading from stdin ("-") always runs the streaming external merge sort.
+    With a cache, a byte-identical input run with the same settings is
+    answered from the cache instead of being parsed and sorted again, unless
+    operations are traced or profiled.
 
     Args:
-        input_file (TextIO): text file with string items to sort
-        output_file (TextIO): text file where results are written
+        input_file (TextIO): text file with string items to sort, or "-"
+        output_file (TextIO): text file where results are written, or "-"
         debug (bool): True if debug mode is toggled on, otherwise False
+        fast_parse (bool): True if parsing the input in bulk into a typed
+            array, otherwise False
+        binary (bool): True if the input uses the binary record format. Also
+            detected from the input file extension
+        external (bool): True if running the external merge sort instead of
+            the in-memory sorts, otherwise False
+        memory_budget (int): bytes of records held in memory at once by the
+            external merge sort, or None for its default
+        sorted_output (TextIO): file where the sorted records are streamed,
+            separately from the report. Required by the external merge sort
+        temp_dir (str): directory for external merge sort spill files
+        parse_workers (int): number of processes parsing the input in
+            parallel, 0 for all cores, or None to parse in this process
+        warmup (int): number of unlogged runs before each configuration
+        gc_mode (str): garbage collector handling around each run. One of
+            "enabled", "disabled" or "collect"
+        jobs (List[SortJob]): run matrix jobs to run, or None for the default
+            run matrix
+        cache (ResultCache): cache of earlier results, or None to always run
+        memory (bool): True if tracing the memory of each configuration in an
+            extra untimed run, otherwise False
+        phases (bool): True if timing the phases of the run and reporting
+            their breakdown, otherwise False
+        trace_output (TextIO): file where the operation trace of every
+            configuration is exported, or None to skip tracing
+        trace_capacity (int): number of events kept per configuration, or
+            None for DEFAULT_CAPACITY
+        trace_rate (float): share of operations sampled, or None for
+            DEFAULT_SAMPLE_RATE
+        profile_dir (str): directory where a .pstats profile of every
+            configuration is saved, or None to skip profiling
+        profile_top (int): number of hot functions reported per profile, or
+            None for DEFAULT_TOP
+
+    Returns:
+        Performance: metrics logged by every measured run
+    """
+    if external or is_stdio(input_file):
+        # Case: records are streamed, from a large file or from a pipe
+        return run_external(input_file, output_file, sorted_output,
+                            memory_budget, debug, binary, temp_dir)
+
+    jobs = jobs or build_run_matrix()
+    key = None
+
+    # Traces and profiles are side outputs of running the sorts, so they are
+    # never cached
+    if cache is not None and not is_stdio(sorted_output) \
+            and trace_output is None and profile_dir is None:
+        # Everything that changes the report or the sorted output is hashed
+        # with the input, including the pattern its runs are logged under,
+        # which comes from the file name. The sorted output is cached in its
+        # own format
+        key = cache.make_key(input_file, {
+            "jobs": [tuple(job) for job in jobs],
+            "pattern": input_pattern(Path(input_file)),
+            "fast_parse": fast_parse,
+            "binary": binary, "parse_workers": parse_workers is not None,
+            "warmup": warmup, "gc_mode": gc_mode, "memory": memory,
+            "phases": phases,
+            "sorted_output": "".join(Path(sorted_output).suffixes).lower()
+            if sorted_output else None})
+        cached = cache.get(key, path.getsize(input_file))
+
+        if cached:
+            performance, out, sorted_file = cached
+            if sorted_output and sorted_file:
+                copyfile(sorted_file, sorted_output)
+            out.append(f"\nResult cache: hit ({cache})")
+            write_to_output(output_file, out)
+
+            if debug:
+                print('OK (CACHED)', file=stderr)
+
+            return performance
+
+    performance, out, error = run_in_memory(
+        input_file, debug, fast_parse, binary, sorted_output, parse_workers,
+        warmup, gc_mode, jobs, memory, phases, trace_output, trace_capacity,
+        trace_rate, profile_dir, profile_top)
+
+    if key is not None:
+        if not error:
+            cache.put(key, performance, out, sorted_output)
+        out.append(f"\nResult cache: miss ({cache})")
+
+    # Output results
+    write_to_output(output_file, out)
+
+    if debug:
+        print('ERROR CAUGHT. SEE OUTPUT FILE.' if error else 'OK', file=stderr)
+
+    return performance
+
+
+def run_in_memory(input_file: TextIO, debug=False, fast_parse=False,
+                  binary=False, sorted_output: Optional[TextIO] = None,
+                  parse_workers: Optional[int] = None, warmup=0,
+                  gc_mode="enabled", jobs: Optional[List["SortJob"]] = None,
+                  memory=True, phases=False,
+                  trace_output: Optional[TextIO] = None,
+                  trace_capacity: Optional[int] = None,
+                  trace_rate: Optional[float] = None,
+                  profile_dir: Optional[str] = None,
+                  profile_top: Optional[int] = None) \
+        -> Tuple["Performance", List[str], bool]:
+    """
+    Function for loading all records of the input file, then running each job
+    of the run matrix on them. The report is returned rather than written.
+
+    Args:
+        input_file (TextIO): text or binary file with records to sort
+        debug (bool): True if debug mode is toggled on, otherwise False
+        fast_parse (bool): True if parsing the input in bulk into a typed
+            array, otherwise False
+        binary (bool): True if the input uses the binary record format
+        sorted_output (TextIO): file where the sorted records are streamed
+        parse_workers (int): number of processes parsing the input in
+            parallel, 0 for all cores, or None to parse in this process
+        warmup (int): number of unlogged runs before each configuration
+        gc_mode (str): garbage collector handling around each run
+        jobs (List[SortJob]): run matrix jobs to run, or None for the default
+            run matrix
+        memory (bool): True if tracing the memory of each configuration in an
+            extra untimed run, otherwise False
+        phases (bool): True if timing the phases of the run and reporting
+            their breakdown, otherwise False
+        trace_output (TextIO): file where the operation trace of every
+            configuration is exported, or None to skip tracing
+        trace_capacity (int): number of events kept per configuration, or
+            None for DEFAULT_CAPACITY
+        trace_rate (float): share of operations sampled, or None for
+            DEFAULT_SAMPLE_RATE
+        profile_dir (str): directory where a .pstats profile of every
+            configuration is saved, or None to skip profiling
+        profile_top (int): number of hot functions reported per profile, or
+            None for DEFAULT_TOP
+
+    Returns:
+        Performance: metrics logged by every measured run
+        List[str]: report lines
+        bool: True if the input or a run returned an error, otherwise False
     """
     # Set up Performance object and output strings used by runner functions
-    performance = Performance()
+    performance = Performance().set_phase_timing(phases)
     out = []
-    RUNS_PER_SORT = 5
-    records, error = parse_all_records(input_file)
+
+    # Pick the loader for the input format. Compressed inputs cannot be
+    # memory-mapped, so they are streamed through a decompressing reader
+    compression = detect_compression(input_file)
+    reader = None
+
+    if is_binary_file(input_file, binary) and not compression:
+        parse = load_binary_records
+    elif parse_workers is not None and not compression:
+        from support.parallel_parse import parse_all_records_parallel
+        parse = partial(parse_all_records_parallel, workers=parse_workers)
+    elif fast_parse and not is_binary_file(input_file, binary) \
+            and not compression:
+        # Parsed from the path, so the typed array is preallocated from the
+        # file size
+        parse = parse_all_records_fast
+    else:
+        reader = open_input_stream(input_file)
+        if is_binary_file(input_file, binary):
+            parse = read_binary_records
+        elif fast_parse:
+            parse = parse_all_records_fast
+        else:
+            parse = parse_all_records
+
+    # Time the load for its throughput, apart from decompression time
+    parse_timer = Performance().start()
+    with performance.phase("parse"):
+        records, error = parse(input_file if reader is None else reader)
+    parse_timer.stop()
     print_results = len(records) <= 50
 
     out.append("-------Quicksort and Natural Merge Sort Results-------")
+    if compression:
+        reader.close()
+        out.append(format_decompression(
+            compression, path.getsize(input_file), reader.get_bytes_read(),
+            reader.get_decompression_time()))
+        out.append(format_parse_throughput(
+            reader.get_bytes_read(),
+            parse_timer.get_runtime() - reader.get_decompression_time()))
+    else:
+        if reader is not None:
+            reader.close()
+        out.append(format_parse_throughput(path.getsize(input_file),
+                                           parse_timer.get_runtime()))
     if print_results:
         out.extend(format_original_records(records, error))
     else:
         out.append(f"Size: {len(records)} Records\n")
 
     if error:
-        # Output results
-        write_to_output(output_file, out)
+        return performance, out, error
 
-        if debug:
-            print('ERROR CAUGHT. SEE OUTPUT FILE.', file=stderr)
+    # Every run sorts a fresh copy of the records, made outside the timer
+    harness = BenchmarkHarness(warmup, gc_mode=gc_mode, memory=memory)
+    out.append(str(harness))
 
-        return
+    # Run each job of the run matrix, grouped under a header per algorithm
+    # and representation. Line numbers continue within a group
+    jobs = jobs or build_run_matrix()
+    representations = {}
+    section = None
+    plan = None
+    pattern = input_pattern(Path(input_file))
+    traces = {}
+    profiles = {}
 
-    # Run Quicksort using specified settings
-    out.append("\n-----Quicksort:")
-    qs_settings = {
-        "pivot": ["first", "first", "first", "median_of_three"],
-        "insertion_threshold": [2, 100, 50, 2]}
+    for job_number, job in enumerate(jobs):
+        label = _job_label(job)
+        if (job.algorithm, job.representation) != section:
+            section = (job.algorithm, job.representation)
+            header = SECTION_TITLES[job.algorithm]
+            if job.representation != "parsed":
+                header += f" ({job.representation})"
+            out.append(f"\n-----{header}:")
+            line_number = 1
+            print_results = len(records) <= 50
 
-    for line_number in range(1, RUNS_PER_SORT):
-        i = line_number - 1
-        error, result_text = run_quicksort(
-            line_number, records, qs_settings["insertion_threshold"][i],
-            performance, print_results, qs_settings["pivot"][i], debug)
-        print_results = False
+        # Convert the records once per representation, outside the timer
+        if job.representation not in representations:
+            with performance.phase(f"convert to {job.representation}"):
+                representations[job.representation] = to_representation(
+                    records, job.representation)
+            if memory:
+                out.append(format_records_memory(
+                    get_records_footprint(representations[job.representation]),
+                    len(records)))
 
-        out.append(result_text)
-        if error:
-            break
+        # Measure the records once, then run the chosen engine for "auto".
+        # Its runs are still logged as "auto", next to the plan in the report
+        job_plan = None
+        if job.algorithm == "auto":
+            if plan is None:
+                from quickmerge.presortedness import analyze_presortedness, \
+                    choose_plan
+                analysis_timer = Performance().start()
+                with performance.phase("presortedness analysis"):
+                    features = analyze_presortedness(records)
+                    plan = choose_plan(features)
+                analysis_timer.stop()
+            out.append(format_sort_plan(features, plan,
+                                        analysis_timer.get_runtime()))
+            job_plan = plan
 
-    # Run Natural Merge Sort
-    out.append("\n-----Natural Merge Sort:")
-    print_results = len(records) <= 50
-    for line_number in range(1, RUNS_PER_SORT + 1):
-        error, result_text = run_n_merge_sort(
-            line_number, records, performance, print_results, debug)
+        run_once = _job_runner(job, line_number, print_results, debug,
+                               sorted_output if job_number == 0 else None,
+                               pattern, plan=job_plan)
+        with performance.phase(label):
+            error, result_texts = harness.measure(
+                run_once, representations[job.representation], performance,
+                job.repetitions)
         print_results = False
 
-        out.append(result_text)
+        # Operations are traced in an extra run, so the tracing overhead
+        # stays out of the measured runs. Reference engines have none
+        if trace_output is not None and not error and label not in traces \
+                and job.algorithm not in REFERENCE_ENGINES:
+            from support.operation_trace import DEFAULT_CAPACITY, \
+                DEFAULT_SAMPLE_RATE, OperationTrace
+            traces[label] = OperationTrace(trace_capacity or DEFAULT_CAPACITY,
+                                           trace_rate or DEFAULT_SAMPLE_RATE)
+            with performance.phase("operation trace"):
+                error, _ = harness.run_untimed(
+                    _job_runner(job, line_number, debug=debug,
+                                pattern=pattern, trace=traces[label],
+                                plan=job_plan),
+                    representations[job.representation])
+
+        # Profiled in an extra run too, and compared against the measured
+        # runs of the same configuration for the profiler's overhead
+        if profile_dir is not None and not error and label not in profiles:
+            from support.profiling import DEFAULT_TOP, profiled, \
+                summarize_profile
+            run_profiled, profiler = profiled(run_once)
+            probe = Performance()
+            with performance.phase("profile"):
+                error, _ = harness.run_untimed(
+                    run_profiled, representations[job.representation], probe)
+            if not error:
+                record = performance.get_records().get(probe.get_key())
+                profiles[label] = summarize_profile(
+                    profiler, label, profile_dir, probe.get_runtime(),
+                    record.runtimes if record else [],
+                    profile_top or DEFAULT_TOP)
+
+        out.extend(result_texts)
+        line_number += len(result_texts)
         if error:
             break
 
     # Output performance report
-    out.append(format_performance_report(performance, micro_sec=True))
+    with performance.phase("format report"):
+        out.append(format_performance_report(performance, micro_sec=True))
+    if phases:
+        out.append(format_phase_breakdown(performance.get_phases()))
+    if traces:
+        from support.operation_trace import write_traces
+        write_traces(traces, trace_output)
+        out.append(format_trace_summary(traces, trace_output))
+    if profiles:
+        out.append(format_profile_summary(list(profiles.values())))
 
-    # Output results
+    return performance, out, error
+
+
+def _job_runner(job: "SortJob", first_line: int, print_results=False,
+                debug=False, sorted_output: Optional[TextIO] = None,
+                pattern: Optional[str] = None,
+                trace: Optional["OperationTrace"] = None,
+                plan: Optional["SortPlan"] = None) \
+        -> Callable[[Sequence[int], "Performance", int], Tuple[bool, str]]:
+    """
+    Helper function that builds the harness runner for one run matrix job.
+    Only the first measured run prints its results or writes sorted output.
+    Runs are logged under the job's configuration and the input pattern, so
+    an "auto" job is logged as "auto" while its plan's engine runs.
+
+    Args:
+        job (SortJob): algorithm and settings being run
+        first_line (int): line number of the first measured run
+        print_results (bool): True if printing sorted results, otherwise False
+        debug (bool): True if debug mode is toggled on, otherwise False
+        sorted_output (TextIO): file where sorted records are streamed
+        pattern (str): input pattern of the records (asc, rev, ran, ...)
+        trace (OperationTrace): trace sampling the operations of every run,
+            or None to skip tracing
+        plan (SortPlan): engine and settings chosen for an "auto" job, or
+            None for any other job
+
+    Returns:
+        Callable: runner taking a copy of the records, a Performance object
+            and the measured run index
+    """
+    engine_job = job if plan is None else job._replace(
+        algorithm=plan.algorithm, pivot=plan.pivot,
+        insertion_threshold=plan.insertion_threshold)
+
+    def run_once(records: Sequence[int], performance: "Performance",
+                 index: int) -> Tuple[bool, str]:
+        line_number = first_line + max(index, 0)
+        print_run = print_results and index == 0
+        sorted_run = sorted_output if index == 0 else None
+
+        if job.algorithm == "quicksort":
+            performance.set_config(job.algorithm, job.pivot,
+                                   job.insertion_threshold, job.representation,
+                                   pattern)
+        else:
+            performance.set_config(job.algorithm,
+                                   representation=job.representation,
+                                   pattern=pattern)
+
+        if engine_job.algorithm == "quicksort":
+            from quickmerge.run_quicksort import run_quicksort
+            return run_quicksort(
+                line_number, records, engine_job.insertion_threshold,
+                performance, print_run, engine_job.pivot, debug, sorted_run,
+                trace)
+
+        if job.algorithm in REFERENCE_ENGINES:
+            # Reference engines have no operations to trace
+            from quickmerge.run_reference_sort import run_reference_sort
+            return run_reference_sort(line_number, records, job.algorithm,
+                                      performance, print_run, debug,
+                                      sorted_run)
+
+        from quickmerge.run_n_merge_sort import run_n_merge_sort
+        return run_n_merge_sort(line_number, records, performance, print_run,
+                                debug, sorted_run, trace)
+
+    return run_once
+
+
+def _job_label(job: "SortJob") -> str:
+    """
+    Helper function that names a job's configuration for the phase breakdown
+    """
+    if job.algorithm == "quicksort":
+        return f"{job.algorithm}, {job.pivot} pivot, threshold " \
+            f"{job.insertion_threshold}, {job.representation}"
+    return f"{job.algorithm}, {job.representation}"
+
+
+def run_external(input_file: TextIO, output_file: TextIO,
+                 sorted_output: TextIO, memory_budget: Optional[int] = None,
+                 debug=False, binary=False, temp_dir: Optional[str] = None) \
+        -> "Performance":
+    """
+    Wrapper function for running the external merge sort on input file data
+    that may not fit in memory. Sorted records are written to the sorted
+    output file and the report with spill and merge metrics to the output file.
+
+    Args:
+        input_file (TextIO): text or binary file with records to sort
+        output_file (TextIO): text file where the report is written
+        sorted_output (TextIO): file where the sorted records are written
+        memory_budget (int): bytes of records held in memory at once, or None
+            for DEFAULT_MEMORY_BUDGET
+        debug (bool): True if debug mode is toggled on, otherwise False
+        binary (bool): True if the input uses the binary record format
+        temp_dir (str): directory for spill files, or None for the default
+
+    Returns:
+        Performance: metrics logged by the external sort
+    """
+    from quickmerge.external_sort import DEFAULT_MEMORY_BUDGET
+    from quickmerge.run_external_sort import run_external_sort
+
+    performance = Performance().set_config(
+        "external_merge_sort", representation="stream",
+        pattern=None if is_stdio(input_file) else input_pattern(
+            Path(input_file)))
+    out = ["-------External Merge Sort Results-------"]
+    memory_budget = memory_budget or DEFAULT_MEMORY_BUDGET
+
+    error, result_text = run_external_sort(
+        1, input_file, sorted_output, memory_budget, performance, binary,
+        temp_dir, debug)
+    out.append(f"Size: {performance.get_size()} Records")
+    out.append(result_text)
+
+    # Output performance report
+    out.append(format_performance_report(performance, micro_sec=True))
     write_to_output(output_file, out)
 
     if debug:
-        print('OK', file=stderr)
+        print('ERROR CAUGHT. SEE OUTPUT FILE.' if error else 'OK', file=stderr)
+
+    return performance
@@ -0,0 +1,153 @@
+"""
+run_batch
+
+This module contains the batch mode of QuickMerge. Every file in an input
+directory is run as its own job on a pool of worker processes, with the largest
+files scheduled first so a big file does not start last and hold up the batch.
+Each job writes its report to the output directory as <stem>.report.txt,
+named after its input without the compression extension, and the metrics of
+all jobs are aggregated into one summary by configuration, input pattern and
+size.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import cpu_count
+from pathlib import Path
+from sys import stderr
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from support.compressed_io import strip_compression_suffix
+from support.metrics_export import export_metrics
+from support.output_formatters import write_to_output, format_batch_summary
+from support.performance import Performance
+from quickmerge.run import run
+from quickmerge.run_matrix import input_pattern
+
+BATCH_SUMMARY_FILE = "batch_summary.txt"
+REPORT_SUFFIX = ".report.txt"
+
+
+def find_batch_inputs(input_dir: Path) -> List[Path]:
+    """
+    Function that lists the input files of a directory, largest first. Hidden
+    files and subdirectories are skipped.
+
+    Args:
+        input_dir (Path): directory holding the input files
+
+    Returns:
+        List[Path]: input files in scheduling order
+    """
+    files = [file for file in input_dir.iterdir()
+             if file.is_file() and not file.name.startswith('.')
+             and file.name != BATCH_SUMMARY_FILE]
+    return sorted(files, key=lambda file: (-file.stat().st_size, file.name))
+
+
+def get_report_name(input_file: Path) -> str:
+    """
+    Function that names the report of an input file, so "ran1K.dat.gz" is
+    reported in "ran1K.report.txt". Reports are never compressed and never
+    share the name of an input.
+
+    Args:
+        input_file (Path): input file
+
+    Returns:
+        str: file name of the report
+    """
+    return strip_compression_suffix(input_file).stem + REPORT_SUFFIX
+
+
+def run_batch(input_dir: Path, output_dir: Path, debug=False,
+              workers: Optional[int] = None, export: Sequence[str] = (),
+              **run_options: Any) -> bool:
+    """
+    Wrapper function for running QuickMerge on every file of a directory in
+    parallel, then writing the aggregated summary to the output directory.
+
+    Args:
+        input_dir (Path): directory holding the input files
+        output_dir (Path): directory where the reports are written
+        debug (bool): True if debug mode is toggled on, otherwise False
+        workers (int): number of worker processes, or None for all cores
+        export (Sequence[str]): .json or .csv pathnames where the metrics of
+            all files are exported together
+        **run_options: keyword arguments passed on to run for every file
+
+    Returns:
+        bool: True if every file ran without an error, otherwise False
+    """
+    input_files = find_batch_inputs(input_dir)
+    workers = min(workers or cpu_count() or 1, max(len(input_files), 1))
+    results: Dict[str, Tuple[str, "Performance"]] = {}
+    failures: Dict[str, str] = {}
+
+    # Inputs differing only in extension, such as "ran1K.dat" and
+    # "ran1K.bin", would write the same report, so only the first one runs
+    report_files: Dict[Path, Path] = {}
+    for input_file in input_files:
+        report_file = output_dir / get_report_name(input_file)
+        if report_file in report_files.values():
+            failures[input_file.name] = f"report {report_file.name} " \
+                "already written for another input"
+        else:
+            report_files[input_file] = report_file
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Submission order is the scheduling order, so largest files go first
+        futures = {
+            pool.submit(_run_file, input_file, report_file, debug,
+                        run_options): input_file
+            for input_file, report_file in report_files.items()}
+
+        for future in as_completed(futures):
+            input_file = futures[future]
+            error, performance = future.result()
+
+            if error:
+                failures[input_file.name] = error
+            else:
+                results[input_file.name] = (input_pattern(input_file),
+                                            performance)
+                if performance.get_num_errors():
+                    failures[input_file.name] = "sort error, see report"
+                elif not performance.get_num_successes():
+                    failures[input_file.name] = "no runs, see report"
+
+            if debug:
+                print(f"{input_file.name}: {error or 'done'}", file=stderr)
+
+    summary = format_batch_summary(
+        [results[name] for name in sorted(results)], failures)
+    write_to_output(output_dir / BATCH_SUMMARY_FILE, [summary])
+
+    for export_file in export:
+        export_metrics([results[name][1] for name in sorted(results)],
+                       export_file)
+
+    return not failures
+
+
+def _run_file(input_file: Path, output_file: Path, debug: bool,
+              run_options: Dict[str, Any]) \
+        -> Tuple[Optional[str], Optional["Performance"]]:
+    """
+    Helper function run by a worker process for one input file. Errors are
+    returned rather than raised, so one bad file does not stop the batch.
+
+    Args:
+        input_file (Path): input file
+        output_file (Path): file where the report is written
+        debug (bool): True if debug mode is toggled on, otherwise False
+        run_options (Dict[str, Any]): keyword arguments passed on to run
+
+    Returns:
+        str: error message, or None if the file ran
+        Performance: metrics logged for the file, or None on an error
+    """
+    try:
+        return None, run(input_file, output_file, debug, **run_options)
+    except (OSError, ValueError) as error:
+        return f"{type(error).__name__}: {error}", None
@@ -0,0 +1,93 @@
+"""
+run_external_sort
+
+This module contains the wrapper function for running the external merge sort
+algorithm. While running, it logs performance metrics. It also accounts for
+possible errors and incorporates them into output text. Output is returned.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from sys import stderr
+from pathlib import Path
+from typing import Optional, Tuple
+from quickmerge.external_sort import ExternalMergeSort
+from support.binary_records import is_binary_file
+from support.compressed_io import open_input_stream
+from support.pipeline import is_stdio, open_stdin
+from support.output_formatters import format_sorted_results, \
+    format_external_stats, format_decompression
+from support.performance import Performance
+from support.record_writer import RecordWriter
+
+
+def run_external_sort(line_number: int, input_file: Path, sorted_output: Path,
+                      memory_budget: int, performance: "Performance",
+                      binary=False, temp_dir: Optional[str] = None,
+                      debug=False) -> Tuple[bool, str]:
+    """
+    Runner function for the external merge sort. Records are streamed from the
+    input file and the sorted records are streamed to the sorted output file,
+    so the input is never held in memory as a whole. With "-" as the input,
+    records are read from stdin as they arrive and chunks are sorted while the
+    rest of the input is still being prefetched.
+
+    Args:
+        line_number (int): number for labelling lines in the output
+        input_file (Path): text or binary file with records to sort, or "-"
+        sorted_output (Path): file where the sorted records are written
+        memory_budget (int): bytes of records held in memory at once
+        performance (Performance): Performance object for storing metrics
+        binary (bool): True if forcing the binary format for the input
+        temp_dir (str): directory for spill files, or None for the default
+        debug (bool): True if debug mode is toggled on, otherwise False
+
+    Returns:
+        bool: True if error returned, otherwise False
+        str: output string
+    """
+    # Set up
+    result = []
+    error = False
+    external_sort = ExternalMergeSort(memory_budget, temp_dir=temp_dir)
+    stdin = is_stdio(input_file)
+    input_stream = open_stdin() if stdin else open_input_stream(input_file)
+
+    performance.start()
+
+    try:
+        with input_stream, RecordWriter(sorted_output) as writer:
+            external_sort.sort(input_stream, writer,
+                               is_binary_file(input_file, binary))
+    except (ValueError, OverflowError) as ve:
+        # Ensure error message gets printed to output file
+        result = ve.args[0].split()
+        error = True
+
+        if debug:
+            print(f"Error Message: {result}", file=stderr)
+    finally:
+        # Stop timer. Account for errors
+        performance.stop()
+        performance.set_size(external_sort.get_num_records())
+
+        if error:
+            performance.log_error()
+        else:
+            performance.log_success(
+                comparisons=external_sort.get_num_comparisons(),
+                exchanges=external_sort.get_num_exchanges())
+
+    # Set up and return output text
+    output_text = format_sorted_results(
+        line_number, result, str(performance.get_runtime_micro_sec()), error)
+    if not stdin and input_stream.get_compression():
+        output_text += "\n" + format_decompression(
+            input_stream.get_compression(), Path(input_file).stat().st_size,
+            input_stream.get_bytes_read(),
+            input_stream.get_decompression_time())
+
+    output_text += format_external_stats(
+        external_sort, memory_budget, sorted_output)
+
+    return error, output_text
@@ -0,0 +1,299 @@
+"""
+run_matrix
+
+This module contains the run matrix that decides which sorts are benchmarked.
+A matrix is a list of entries, each declaring an algorithm with lists of pivot
+options, insertion sort thresholds and record representations plus a number of
+repetitions. Entries are expanded into one job per combination. Matrices are
+read from a TOML or JSON config file and can be narrowed with CLI options:
+
+    [[runs]]
+    algorithm = "quicksort"
+    pivot = ["first", "median_of_three"]
+    insertion_threshold = [2, 50]
+    representation = ["list", "array"]
+    repetitions = 3
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import json
+import re
+from array import array
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+# "auto" measures the records first and runs the engine that suits them
+ALGORITHMS = ("quicksort", "natural_merge_sort", "auto")
+# Platform sorts the algorithms are compared against. See reference_sorts
+REFERENCE_ENGINES = ("sorted", "list_sort", "heapsort", "numpy_sort")
+# Reference engines that only sort a list, so they always run on the list
+# representation
+LIST_ENGINES = ("list_sort", "heapsort")
+PIVOT_OPTIONS = ("first", "median_of_three", "last")
+REPRESENTATIONS = ("parsed", "list", "array")
+RECORD_TYPECODE = 'q'
+
+# Settings of a job that its matrix entry leaves out
+DEFAULT_PIVOT = "first"
+DEFAULT_INSERTION_THRESHOLD = 2
+DEFAULT_REPRESENTATION = "parsed"
+DEFAULT_REPETITIONS = 1
+
+# Input pattern of a file name such as ran10K.dat: the letters before the size
+PATTERN_NAME = re.compile(r"^([A-Za-z_]*[A-Za-z])")
+
+# Reproduces the original hardcoded runs: four Quicksort settings run once
+# and five Natural Merge Sort runs
+DEFAULT_RUN_MATRIX = [
+    {"algorithm": "quicksort", "pivot": ["first"],
+     "insertion_threshold": [2, 100, 50], "repetitions": 1},
+    {"algorithm": "quicksort", "pivot": ["median_of_three"],
+     "insertion_threshold": [2], "repetitions": 1},
+    {"algorithm": "natural_merge_sort", "repetitions": 5}]
+
+
+class SortJob(NamedTuple):
+    """
+    One configuration of the run matrix. Every algorithm but Quicksort ignores
+    the pivot option and the insertion sort threshold, and LIST_ENGINES always
+    run on the list representation.
+    """
+    algorithm: str
+    pivot: str = DEFAULT_PIVOT
+    insertion_threshold: int = DEFAULT_INSERTION_THRESHOLD
+    representation: str = DEFAULT_REPRESENTATION
+    repetitions: int = DEFAULT_REPETITIONS
+
+
+def load_run_matrix(config_file: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Function that reads a run matrix from a TOML (.toml) or JSON config file.
+    Both hold a "runs" list of matrix entries.
+
+    Args:
+        config_file (str | Path): pathname of the config file
+
+    Returns:
+        List[Dict[str, Any]]: matrix entries
+
+    Raises:
+        ValueError: if the file cannot be parsed or has no "runs" list
+    """
+    config_file = Path(config_file)
+
+    try:
+        if config_file.suffix == ".toml":
+            import tomllib
+            with open(config_file, "rb") as config:
+                settings = tomllib.load(config)
+        else:
+            with open(config_file, encoding="utf-8") as config:
+                settings = json.load(config)
+    except ImportError as error:
+        raise ValueError("TOML config files require Python 3.11 or later. "
+                         "Use a JSON config file instead") from error
+    except ValueError as error:
+        raise ValueError(f"Invalid config file {config_file.name}: "
+                         f"{error}") from error
+
+    runs = settings.get("runs") if isinstance(settings, dict) else None
+    if not isinstance(runs, list) or not runs:
+        raise ValueError(f"Config file {config_file.name} must hold a "
+                         "non-empty \"runs\" list")
+
+    return runs
+
+
+def build_run_matrix(entries: Optional[List[Dict[str, Any]]] = None,
+                     algorithms: Optional[Sequence[str]] = None,
+                     pivots: Optional[Sequence[str]] = None,
+                     thresholds: Optional[Sequence[int]] = None,
+                     representations: Optional[Sequence[str]] = None,
+                     repetitions: Optional[int] = None) -> List["SortJob"]:
+    """
+    Function that applies CLI overrides to matrix entries then expands them
+    into jobs. Algorithms keep only the entries for those algorithms, adding a
+    default entry for any algorithm without one. Every other override replaces
+    that setting in all entries. Duplicate jobs are dropped.
+
+    Args:
+        entries (List[Dict[str, Any]]): matrix entries, or None for
+            DEFAULT_RUN_MATRIX
+        algorithms (Sequence[str]): algorithms to run, or None for all
+        pivots (Sequence[str]): pivot options replacing those of the entries
+        thresholds (Sequence[int]): insertion sort thresholds replacing those
+            of the entries
+        representations (Sequence[str]): record representations replacing
+            those of the entries
+        repetitions (int): measured runs per job replacing those of the entries
+
+    Returns:
+        List[SortJob]: jobs in matrix order
+
+    Raises:
+        ValueError: if an entry or override holds an unknown or invalid value
+    """
+    entries = [dict(entry) for entry in (entries or DEFAULT_RUN_MATRIX)]
+
+    if algorithms:
+        entries = [entry for entry in entries
+                   if entry.get("algorithm") in algorithms]
+        present = {entry["algorithm"] for entry in entries}
+        entries.extend({"algorithm": algorithm} for algorithm in algorithms
+                       if algorithm not in present)
+
+    overrides = {"pivot": pivots, "insertion_threshold": thresholds,
+                 "representation": representations, "repetitions": repetitions}
+    for entry in entries:
+        entry.update((key, value) for key, value in overrides.items()
+                     if value is not None)
+
+    # Overrides can make entries identical, so each job is kept only once
+    jobs = []
+    for entry in entries:
+        jobs.extend(job for job in expand_entry(entry) if job not in jobs)
+
+    return jobs
+
+
+def add_reference_jobs(jobs: List["SortJob"], engines: Sequence[str]) \
+        -> List["SortJob"]:
+    """
+    Function that adds a job per reference engine and representation of the
+    jobs, skipping jobs already there. Reference jobs take the most
+    repetitions of any job, so they are measured at least as often.
+
+    Args:
+        jobs (List[SortJob]): jobs of the run matrix
+        engines (Sequence[str]): reference engines to add
+
+    Returns:
+        List[SortJob]: jobs followed by the reference jobs
+    """
+    repetitions = max((job.repetitions for job in jobs), default=1)
+    representations = list(dict.fromkeys(job.representation for job in jobs))
+    jobs = list(jobs)
+
+    for representation, engine in product(representations or ["parsed"],
+                                          engines):
+        if engine in LIST_ENGINES:
+            representation = "list"
+        job = SortJob(engine, representation=representation,
+                      repetitions=repetitions)
+        if not any(job[:4] == existing[:4] for existing in jobs):
+            jobs.append(job)
+
+    return jobs
+
+
+def expand_entry(entry: Dict[str, Any]) -> List["SortJob"]:
+    """
+    Function that validates one matrix entry and expands it into one job per
+    combination of its pivot options, thresholds and representations. Single
+    values are accepted in place of lists.
+
+    Args:
+        entry (Dict[str, Any]): matrix entry
+
+    Returns:
+        List[SortJob]: jobs for the entry
+
+    Raises:
+        ValueError: if the entry holds an unknown or invalid value
+    """
+    unknown = set(entry) - set(SortJob._fields)
+    if unknown:
+        raise ValueError(f"Unknown run matrix settings: "
+                         f"{', '.join(sorted(unknown))}")
+
+    algorithm = entry.get("algorithm")
+    _check_choices("algorithm", [algorithm], ALGORITHMS + REFERENCE_ENGINES)
+
+    pivots = _as_list(entry.get("pivot", DEFAULT_PIVOT))
+    thresholds = _as_list(entry.get("insertion_threshold",
+                                    DEFAULT_INSERTION_THRESHOLD))
+    representations = _as_list(entry.get("representation",
+                                         DEFAULT_REPRESENTATION))
+    repetitions = entry.get("repetitions", DEFAULT_REPETITIONS)
+
+    _check_choices("pivot", pivots, PIVOT_OPTIONS)
+    _check_choices("representation", representations, REPRESENTATIONS)
+    if not all(isinstance(value, int) and value >= 1
+               for value in thresholds + [repetitions]):
+        raise ValueError("Insertion thresholds and repetitions must be "
+                         "integers >= 1")
+
+    if algorithm != "quicksort":
+        # Pivot and threshold do not apply, so only one job per representation
+        pivots, thresholds = pivots[:1], thresholds[:1]
+
+    if algorithm in LIST_ENGINES:
+        # Their records are converted to a list outside the timer, so they
+        # are logged as the list they sort
+        representations = ["list"]
+
+    # Representation varies slowest so its jobs are reported together
+    return [SortJob(algorithm, pivot, threshold, representation, repetitions)
+            for representation, pivot, threshold
+            in product(representations, pivots, thresholds)]
+
+
+def to_representation(records: Sequence[int], representation: str) \
+        -> Sequence[int]:
+    """
+    Function that converts records into the representation a job sorts. Records
+    already in that representation are returned as they are.
+
+    Args:
+        records (Sequence[int]): parsed records
+        representation (str): "parsed" to keep the loader's representation,
+            "list" for a Python list or "array" for a typed array of 64-bit
+            integers
+
+    Returns:
+        Sequence[int]: records in the requested representation
+    """
+    if representation == "parsed":
+        return records
+
+    if representation == "array":
+        if isinstance(records, array):
+            return records
+        return array(RECORD_TYPECODE, records)
+
+    return records if isinstance(records, list) else list(records)
+
+
+def input_pattern(input_file: Path) -> str:
+    """
+    Function that names the input pattern of a file (asc, rev, dup, ran, ...)
+    from the letters its name starts with
+
+    Args:
+        input_file (Path): input file
+
+    Returns:
+        str: input pattern, or "other" if the name starts with no letters
+    """
+    match = PATTERN_NAME.match(input_file.name)
+    return match.group(1) if match else "other"
+
+
+def _as_list(value: Any) -> List[Any]:
+    """
+    Helper function that wraps single matrix values in a list
+    """
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _check_choices(setting: str, values: List[Any],
+                   choices: Sequence[str]) -> None:
+    """
+    Helper function that raises a ValueError for values outside the choices
+    """
+    for value in values:
+        if value not in choices:
+            raise ValueError(f"Invalid {setting}: {value}. Must be one of "
+                             f"{', '.join(choices)}")
@@ -9,15 +9,18 @@ Author: Rani Hinnawi
 Date: 2023-08-22
 """
 from sys import stderr
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from quickmerge.natural_merge_sort import NaturalMergeSort
 from support.output_formatters import format_sorted_results, format_logs
 from support.performance import Performance
+from support.record_writer import write_sorted_records
 
 
 def run_n_merge_sort(line_number: int, records: List[int],
                      performance: "Performance", print_results=False,
-                     debug=False) -> Tuple[bool, str]:
+                     debug=False, sorted_output: Optional[str] = None,
+                     trace: Optional["OperationTrace"] = None) \
+        -> Tuple[bool, str]:
     """
     Runner function for passed-in sort type using inputted records list.
     Returns string fromatted for output.
@@ -28,6 +31,10 @@ def run_n_merge_sort(line_number: int, records: List[int],
         performance (Performance): Performance object for storing metrics
         print_sorted (bool): True if printing sorted results, otherwise False
         debug (bool): True if debug mode is toggled on, otherwise False
+        sorted_output (str): file where the sorted records are streamed, or
+            None to skip writing them
+        trace (OperationTrace): trace sampling the operations of the sort, or
+            None to skip tracing
 
     Returns:
         bool: True if error returned, otherwise False
@@ -38,14 +45,20 @@ def run_n_merge_sort(line_number: int, records: List[int],
     comparisons = []
     exchanges = []
     error = False
-    n_merge_sort = NaturalMergeSort(records)
+    phases = performance if performance.is_timing_phases() else None
+
+    # The linked list is traced with the sort, though not timed with it
+    performance.start_memory_tracing()
+    with performance.phase("convert to linked list"):
+        n_merge_sort = NaturalMergeSort(records, phases, trace)
     MAX_LOG_LENGTH = 50
 
     # Set up error handling and performance metrics
     performance.set_size(len(records)).start()
 
     try:
-        result = n_merge_sort.n_merge_sort()
+        with performance.phase("sort"):
+            result = n_merge_sort.n_merge_sort()
     except ValueError as ve:
         # Ensure error message gets printed to output file
         result = ve.args[0].split()
@@ -63,13 +76,21 @@ def run_n_merge_sort(line_number: int, records: List[int],
         if error:
             performance.log_error()
         else:
-            performance.log_success()
+            performance.log_success(
+                comparisons=n_merge_sort.get_num_comparisons(),
+                exchanges=n_merge_sort.get_num_exchanges())
+
+            # Stream sorted records outside of the timed region
+            if sorted_output:
+                with performance.phase("write sorted output"):
+                    write_sorted_records(sorted_output, result)
 
             # Convert back to regular Python list for output
             if not print_results:
                 result = []
             else:
-                result = result.to_list()
+                with performance.phase("convert to list"):
+                    result = result.to_list()
                 comparisons = n_merge_sort.get_comparisons()
                 exchanges = n_merge_sort.get_exchanges()
 
@@ -83,11 +104,13 @@ def run_n_merge_sort(line_number: int, records: List[int],
         exchanges.append("...")
 
     # Set up and return output text
-    output_text = format_sorted_results(
-        line_number, result, str(performance.get_runtime_micro_sec()), error)
-    output_text += format_logs(comparisons, exchanges,
-                               n_merge_sort.get_num_comparisons(),
-                               n_merge_sort.get_num_exchanges())
+    with performance.phase("format"):
+        output_text = format_sorted_results(
+            line_number, result, str(performance.get_runtime_micro_sec()),
+            error)
+        output_text += format_logs(comparisons, exchanges,
+                                   n_merge_sort.get_num_comparisons(),
+                                   n_merge_sort.get_num_exchanges())
 
     # Return formatted results
     return error, output_text
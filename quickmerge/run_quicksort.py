@@ -9,15 +9,18 @@ Author: Rani Hinnawi
 Date: 2023-08-22
 """
 from sys import stderr
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from quickmerge.quicksort import Quicksort
 from support.output_formatters import format_sorted_results, format_logs
 from support.performance import Performance
+from support.record_writer import write_sorted_records
 
 
 def run_quicksort(line_number: int, records: List[int],
                   insertion_threshold: int, performance: "Performance",
-                  print_results=False, pivot_option="first", debug=False)\
+                  print_results=False, pivot_option="first", debug=False,
+                  sorted_output: Optional[str] = None,
+                  trace: Optional["OperationTrace"] = None) \
         -> Tuple[bool, str]:
     """
     Runner function for passed-in sort type using inputted records list.
@@ -29,6 +32,10 @@ def run_quicksort(line_number: int, records: List[int],
         performance (Performance): Performance object for storing metrics
         print_sorted (bool): True if printing sorted results, otherwise False
         debug (bool): True if debug mode is toggled on, otherwise False
+        sorted_output (str): file where the sorted records are streamed, or
+            None to skip writing them
+        trace (OperationTrace): trace sampling the operations of the sort, or
+            None to skip tracing
 
     Returns:
         bool: True if error returned, otherwise False
@@ -39,14 +46,18 @@ def run_quicksort(line_number: int, records: List[int],
     comparisons = []
     exchanges = []
     error = False
-    quicksort = Quicksort(records, pivot_option, insertion_threshold)
+    phases = performance if performance.is_timing_phases() else None
+    performance.start_memory_tracing()
+    quicksort = Quicksort(records, pivot_option, insertion_threshold, phases,
+                          trace)
     MAX_LOG_LENGTH = 100
 
     # Set up error handling and performance metrics
     performance.set_size(len(records)).start()
 
     try:
-        result = quicksort.q_sort()
+        with performance.phase("sort"):
+            result = quicksort.q_sort()
     except ValueError as ve:
         # Ensure error message gets printed to output file
         result = ve.args[0].split()
@@ -64,7 +75,14 @@ def run_quicksort(line_number: int, records: List[int],
         if error:
             performance.log_error()
         else:
-            performance.log_success()
+            performance.log_success(
+                comparisons=quicksort.get_num_comparisons(),
+                exchanges=quicksort.get_num_exchanges())
+
+            # Stream sorted records outside of the timed region
+            if sorted_output:
+                with performance.phase("write sorted output"):
+                    write_sorted_records(sorted_output, result)
 
             # Convert back to regular Python list for output
             if not print_results:
@@ -83,14 +101,16 @@ def run_quicksort(line_number: int, records: List[int],
         exchanges.append("...")
 
     # Set up and return output text
-    output_text = format_sorted_results(
-        line_number, result, str(performance.get_runtime_micro_sec()), error)
-
-    output_text += f"\nPivot type: {pivot_option}"
-    output_text += f"\nInsertion Sort Threshold: {insertion_threshold}"
-    output_text += format_logs(comparisons, exchanges,
-                               quicksort.get_num_comparisons(),
-                               quicksort.get_num_exchanges())
+    with performance.phase("format"):
+        output_text = format_sorted_results(
+            line_number, result, str(performance.get_runtime_micro_sec()),
+            error)
+
+        output_text += f"\nPivot type: {pivot_option}"
+        output_text += f"\nInsertion Sort Threshold: {insertion_threshold}"
+        output_text += format_logs(comparisons, exchanges,
+                                   quicksort.get_num_comparisons(),
+                                   quicksort.get_num_exchanges())
 
     # Return formatted results
     return error, output_text
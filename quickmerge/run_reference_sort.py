@@ -0,0 +1,100 @@
+"""
+run_reference_sort
+
+This module contains the wrapper function for running a reference engine, such
+as the built-in sorted(), on the same records as the package's own sorts.
+While running, it logs the runtime of the sort alone. It also accounts for
+possible errors and incorporates them into output text. Output is returned.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from sys import stderr
+from typing import List, Optional, Tuple
+from quickmerge.reference_sorts import prepare_records, reference_sort
+from support.output_formatters import format_sorted_results
+from support.performance import Performance
+from support.record_writer import write_sorted_records
+
+
+def run_reference_sort(line_number: int, records: List[int], engine: str,
+                       performance: "Performance", print_results=False,
+                       debug=False, sorted_output: Optional[str] = None) \
+        -> Tuple[bool, str]:
+    """
+    Runner function for a reference engine using inputted records list.
+    Returns string formatted for output.
+
+    Args:
+        line_number (int): number for labelling lines in the output
+        records (List[int]): list of integer records to be sorted
+        engine (str): one of REFERENCE_ENGINES
+        performance (Performance): Performance object for storing metrics
+        print_results (bool): True if printing sorted results, otherwise False
+        debug (bool): True if debug mode is toggled on, otherwise False
+        sorted_output (str): file where the sorted records are streamed, or
+            None to skip writing them
+
+    Returns:
+        bool: True if error returned, otherwise False
+        str: output string
+    """
+    # Set up. The records are put in the engine's form before the timer
+    result = []
+    prepared = None
+    error = False
+    performance.set_size(len(records))
+
+    # The engine's copy of the records is traced, though not timed
+    performance.start_memory_tracing()
+    try:
+        with performance.phase("prepare records"):
+            prepared = prepare_records(engine, records)
+    except ValueError as ve:
+        # Ensure error message gets printed to output file
+        result = ve.args[0].split()
+        error = True
+        print_results = True
+
+        if debug:
+            error_message = f"Records: {records[:80]}"
+            error_message += f"\n\tError Message: {result}"
+            print(error_message, file=stderr)
+
+    performance.start()
+    try:
+        if not error:
+            with performance.phase("sort"):
+                result = reference_sort(engine, prepared)
+    finally:
+        # Stop timer. Account for errors
+        performance.stop()
+
+    if error:
+        performance.log_error()
+    else:
+        performance.log_success()
+
+        # NumPy arrays are converted outside of the timed region
+        if (sorted_output or print_results) and not isinstance(result, list):
+            with performance.phase("convert to list"):
+                result = result.tolist()
+
+        # Stream sorted records outside of the timed region
+        if sorted_output:
+            with performance.phase("write sorted output"):
+                write_sorted_records(sorted_output, result)
+
+        if not print_results:
+            result = []
+
+    # Set up and return output text
+    with performance.phase("format"):
+        output_text = format_sorted_results(
+            line_number, result, str(performance.get_runtime_micro_sec()),
+            error)
+        output_text += f"\nEngine: {engine} (reference, comparisons and " \
+            "exchanges not counted)\n"
+
+    # Return formatted results
+    return error, output_text
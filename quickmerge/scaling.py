@@ -0,0 +1,441 @@
+"""
+scaling
+
+This module contains the scaling suite of QuickMerge. It generates records of
+each input pattern at geometrically growing sizes, 1K to 10M records by
+default, runs every configuration of the run matrix on them with the benchmark
+harness, then fits the median runtimes and comparison counts of each
+configuration to the n, n·log n and n² models and reports where
+configurations overtake each other. It is run as a subcommand of the package:
+python -m quickmerge scale [--min-size N] [--max-size N] [--budget SEC]
+
+Every run has a time budget. A run over budget is aborted on the spot, where
+the platform has interval timers, and its configuration skips the larger sizes
+of that pattern, so a quadratic configuration cannot hang the suite. Without
+interval timers the run finishes, but larger sizes are still skipped.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+import signal
+from contextlib import contextmanager
+from itertools import combinations
+from sys import stderr
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, \
+    Tuple
+from quickmerge.api import ENGINES, load_engine
+from quickmerge.presortedness import analyze_presortedness, choose_plan
+from quickmerge.reference_sorts import get_available_engines, is_available, \
+    prepare_records, reference_sort
+from quickmerge.run_matrix import ALGORITHMS, PIVOT_OPTIONS, \
+    REFERENCE_ENGINES, REPRESENTATIONS, SortJob, add_reference_jobs, \
+    build_run_matrix, load_run_matrix, to_representation
+from support.benchmark_harness import GC_MODES, BenchmarkHarness
+from support.complexity_fit import ComplexityFit, fit_complexity, \
+    find_crossovers
+from support.output_formatters import format_scaling_report
+from support.performance import MetricKey, Performance
+from support.runtime_stats import percentile
+from support.synthetic_records import DEFAULT_SEED, PATTERNS, \
+    generate_records, parse_size
+
+DEFAULT_PATTERNS = ("asc", "rev", "dup", "ran")
+SIZE_STEPS = (1, 2, 5)
+DEFAULT_MIN_SIZE = 1000
+DEFAULT_MAX_SIZE = 10 * 1000 ** 2
+DEFAULT_REPETITIONS = 3
+DEFAULT_BUDGET = 60.0
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised inside a run that takes longer than its time budget
+    """
+
+
+class ScalingSeries(NamedTuple):
+    """
+    Measurements of one configuration on one input pattern across sizes.
+    Medians are by size, runtimes in ns. Aborted is the size a run was
+    aborted at with the reason, or None if every size ran.
+    """
+    key: "MetricKey"
+    runtimes: Dict[int, float]
+    comparisons: Dict[int, float]
+    runtime_fit: Optional["ComplexityFit"]
+    comparison_fit: Optional["ComplexityFit"]
+    aborted: Optional[Tuple[int, str]]
+
+
+class Crossover(NamedTuple):
+    """
+    Estimated size where one configuration overtakes another on a pattern
+    """
+    size: float
+    faster_below: "MetricKey"
+    faster_above: "MetricKey"
+
+
+def geometric_sizes(min_size=DEFAULT_MIN_SIZE,
+                    max_size=DEFAULT_MAX_SIZE) -> List[int]:
+    """
+    Function that lists the sizes of the 1-2-5 series between two sizes, the
+    steps the resources/input corpus uses. Both ends are always included.
+
+    Args:
+        min_size (int): smallest record count
+        max_size (int): largest record count
+
+    Returns:
+        List[int]: record counts in ascending order
+    """
+    sizes = {min_size, max_size}
+    decade = 1
+    while decade <= max_size:
+        sizes.update(step * decade for step in SIZE_STEPS
+                     if min_size <= step * decade <= max_size)
+        decade *= 10
+
+    return sorted(size for size in sizes if min_size <= size <= max_size)
+
+
+@contextmanager
+def time_budget(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Context manager that raises BudgetExceeded in the code it wraps once the
+    seconds run out. Without interval timers (Windows) or a budget it does
+    nothing. Only the main thread can be interrupted.
+
+    Args:
+        seconds (float): time budget, or None for no budget
+    """
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expire(signal_number: int, frame) -> None:
+        raise BudgetExceeded(f"over the {seconds:g}s budget")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_scaling_suite(jobs: Sequence["SortJob"], sizes: Sequence[int],
+                      patterns: Sequence[str] = DEFAULT_PATTERNS,
+                      budget: Optional[float] = DEFAULT_BUDGET,
+                      seed=DEFAULT_SEED, warmup=0, gc_mode="enabled",
+                      progress=False) \
+        -> Tuple["Performance", Dict["MetricKey", Tuple[int, str]]]:
+    """
+    Function that runs every job on records of every pattern and size.
+    Records are generated once per pattern and size and each run sorts a
+    fresh copy. A run that goes over budget or out of memory is aborted, and
+    its configuration skips the larger sizes of the pattern. Runs completed
+    before the abort stay logged.
+
+    Args:
+        jobs (Sequence[SortJob]): configurations with their repetitions
+        sizes (Sequence[int]): record counts in ascending order
+        patterns (Sequence[str]): input patterns to generate
+        budget (float): seconds a single run may take, or None for no limit
+        seed (int): seed of the random patterns
+        warmup (int): unlogged warmup runs before each configuration
+        gc_mode (str): garbage collector handling around each run
+        progress (bool): True if printing progress to stderr, otherwise False
+
+    Returns:
+        Performance: metrics of all runs, by configuration, pattern and size
+        Dict[MetricKey, Tuple[int, str]]: size and reason of each aborted
+            configuration, keyed with a size of 0
+    """
+    performance = Performance()
+    harness = BenchmarkHarness(warmup, gc_mode=gc_mode)
+    aborted: Dict["MetricKey", Tuple[int, str]] = {}
+
+    # Engines are imported before any timer starts
+    engines = {algorithm: load_engine(algorithm) for algorithm in ENGINES}
+
+    for pattern in patterns:
+        for size in sizes:
+            pending = [job for job in jobs
+                       if _config_key(job, pattern) not in aborted]
+            if not pending:
+                break
+
+            if progress:
+                print(f"{pattern} {size} records: {len(pending)} "
+                      f"configurations", file=stderr)
+
+            records = generate_records(pattern, size, seed)
+            representations = {}
+
+            for job in pending:
+                if job.representation not in representations:
+                    representations[job.representation] = \
+                        to_representation(records, job.representation)
+
+                key = _config_key(job, pattern)
+                try:
+                    harness.measure(
+                        _job_runner(job, key, engines, budget),
+                        representations[job.representation], performance,
+                        job.repetitions)
+                except (BudgetExceeded, MemoryError) as error:
+                    reason = str(error) if isinstance(error, BudgetExceeded) \
+                        else "out of memory"
+                    aborted[key] = (size, reason)
+                    if progress:
+                        print(f"  aborted {_label(key)}: {reason}",
+                              file=stderr)
+
+            # Free this size's records before generating the next
+            del records, representations
+
+    return performance, aborted
+
+
+def summarize_suite(performance: "Performance",
+                    aborted: Dict["MetricKey", Tuple[int, str]]) \
+        -> Dict[str, Tuple[List["ScalingSeries"], List["Crossover"]]]:
+    """
+    Function that fits the logged metrics of a scaling suite and finds the
+    crossovers between its configurations, pattern by pattern
+
+    Args:
+        performance (Performance): metrics logged by run_scaling_suite
+        aborted (Dict[MetricKey, Tuple[int, str]]): aborted configurations
+            returned by run_scaling_suite
+
+    Returns:
+        Dict[str, Tuple[List[ScalingSeries], List[Crossover]]]: series and
+            crossovers by pattern, in the order the suite ran them
+    """
+    medians: Dict["MetricKey", Tuple[Dict[int, float], Dict[int, float]]] \
+        = {}
+
+    for key, record in performance.get_records().items():
+        if not record.runtimes:
+            continue
+        runtimes, comparisons = medians.setdefault(key._replace(size=0),
+                                                   ({}, {}))
+        runtimes[key.size] = percentile(sorted(record.runtimes), 50)
+        if record.comparisons:
+            comparisons[key.size] = percentile(sorted(record.comparisons), 50)
+
+    # Configurations aborted at their smallest size still get a series
+    for key in aborted:
+        medians.setdefault(key, ({}, {}))
+
+    summary: Dict[str, Tuple[List["ScalingSeries"], List["Crossover"]]] = {}
+
+    for key, (runtimes, comparisons) in medians.items():
+        series, _ = summary.setdefault(key.pattern, ([], []))
+        series.append(ScalingSeries(key, runtimes, comparisons,
+                                    fit_complexity(runtimes),
+                                    fit_complexity(comparisons),
+                                    aborted.get(key)))
+
+    for series, crossovers in summary.values():
+        for first, second in combinations(series, 2):
+            for size, first_faster in find_crossovers(first.runtimes,
+                                                      second.runtimes):
+                faster_below, faster_above = (first, second) if first_faster \
+                    else (second, first)
+                crossovers.append(Crossover(size, faster_below.key,
+                                            faster_above.key))
+        crossovers.sort(key=lambda crossover: crossover.size)
+
+    return summary
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the scale subcommand
+
+    Args:
+        argv (List[str]): command line arguments after the subcommand name
+
+    Returns:
+        int: exit status
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m quickmerge scale")
+    arg_parser.add_argument("--min-size", type=parse_size, metavar="N",
+                            default=DEFAULT_MIN_SIZE,
+                            help="Smallest record count, with an optional K "
+                            "or M suffix (default: 1K)")
+    arg_parser.add_argument("--max-size", type=parse_size, metavar="N",
+                            default=DEFAULT_MAX_SIZE,
+                            help="Largest record count (default: 10M)")
+    arg_parser.add_argument("--sizes", type=parse_size, nargs="+",
+                            metavar="N",
+                            help="Record counts to run instead of the 1-2-5 "
+                            "series between --min-size and --max-size")
+    arg_parser.add_argument("--pattern", nargs="+", choices=PATTERNS,
+                            default=list(DEFAULT_PATTERNS),
+                            help="Input patterns to generate (default: "
+                            f"{' '.join(DEFAULT_PATTERNS)})")
+    arg_parser.add_argument("--budget", type=float, metavar="SEC",
+                            default=DEFAULT_BUDGET,
+                            help="Seconds a single run may take before it is "
+                            "aborted and its configuration skips larger "
+                            f"sizes, 0 for no limit (default: "
+                            f"{DEFAULT_BUDGET:g})")
+    arg_parser.add_argument("--repeat", type=int, metavar="N",
+                            default=DEFAULT_REPETITIONS,
+                            help="Measured runs per configuration and size "
+                            f"(default: {DEFAULT_REPETITIONS})")
+    arg_parser.add_argument("--warmup", type=int, default=0, metavar="N",
+                            help="Unlogged warmup runs before each "
+                            "configuration and size")
+    arg_parser.add_argument("--gc", choices=GC_MODES, default="enabled",
+                            help="Garbage collector handling around each run")
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                            help="Seed of the random patterns")
+    arg_parser.add_argument("--config", type=str, metavar="PATH",
+                            help="TOML or JSON file declaring the run matrix")
+    arg_parser.add_argument("--algorithm", nargs="+",
+                            choices=ALGORITHMS + REFERENCE_ENGINES,
+                            help="Only run these algorithms or reference "
+                            "engines")
+    arg_parser.add_argument("--reference", action="store_true",
+                            help="Also run every available reference engine "
+                            "(sorted, list.sort, heapq heapsort, NumPy sort)")
+    arg_parser.add_argument("--pivot", nargs="+", choices=PIVOT_OPTIONS,
+                            help="Quicksort pivot options, overriding the run "
+                            "matrix")
+    arg_parser.add_argument("--threshold", nargs="+", type=int, metavar="N",
+                            help="Quicksort insertion sort thresholds, "
+                            "overriding the run matrix")
+    arg_parser.add_argument("--representation", nargs="+",
+                            choices=REPRESENTATIONS,
+                            help="Record representations sorted, overriding "
+                            "the run matrix")
+    arg_parser.add_argument("--export", nargs="+", metavar="PATH",
+                            help="Export all metrics with the environment to "
+                            "these .json or .csv pathnames")
+    args = arg_parser.parse_args(argv)
+
+    if args.min_size > args.max_size:
+        arg_parser.error("--min-size must not exceed --max-size")
+    if args.repeat < 1:
+        arg_parser.error("--repeat must be at least 1")
+    if args.export and any(not export.lower().endswith((".json", ".csv"))
+                           for export in args.export):
+        arg_parser.error("--export pathnames must end with .json or .csv")
+
+    try:
+        jobs = build_run_matrix(
+            load_run_matrix(args.config) if args.config else None,
+            args.algorithm, args.pivot, args.threshold, args.representation,
+            args.repeat)
+    except (OSError, ValueError) as error:
+        arg_parser.error(str(error))
+
+    for job in jobs:
+        if job.algorithm in REFERENCE_ENGINES and \
+                not is_available(job.algorithm):
+            arg_parser.error(f"{job.algorithm} requires a package that is "
+                             "not installed")
+    if args.reference:
+        jobs = add_reference_jobs(jobs, get_available_engines())
+
+    sizes = sorted(set(args.sizes)) if args.sizes \
+        else geometric_sizes(args.min_size, args.max_size)
+
+    performance, aborted = run_scaling_suite(
+        jobs, sizes, args.pattern, args.budget or None, args.seed,
+        args.warmup, args.gc, progress=True)
+
+    print(format_scaling_report(summarize_suite(performance, aborted), sizes,
+                                args.budget or None))
+
+    if args.export:
+        from support.metrics_export import export_metrics
+        for export_file in args.export:
+            export_metrics(performance, export_file)
+
+    return 0
+
+
+def _config_key(job: "SortJob", pattern: str) -> "MetricKey":
+    """
+    Helper function for the key a job's runs are logged under on a pattern,
+    with a size of 0. The pivot and threshold only apply to Quicksort.
+    """
+    if job.algorithm == "quicksort":
+        return MetricKey(job.algorithm, job.pivot, job.insertion_threshold,
+                         job.representation, pattern, 0)
+    return MetricKey(job.algorithm, None, None, job.representation, pattern,
+                     0)
+
+
+def _job_runner(job: "SortJob", key: "MetricKey", engines: Dict[str, type],
+                budget: Optional[float]):
+    """
+    Helper function that builds the harness runner for one job. The "auto"
+    algorithm measures the records inside the timed region, since choosing
+    is part of its cost. Reference engines get their input form before it.
+
+    Args:
+        job (SortJob): algorithm and settings being run
+        key (MetricKey): configuration the runs are logged under
+        engines (Dict[str, type]): engine class by algorithm
+        budget (float): seconds the run may take, or None for no limit
+
+    Returns:
+        Callable: runner taking a copy of the records, a Performance object
+            and the measured run index
+    """
+    def run_once(records: Sequence[int], performance: "Performance",
+                 _index: int) -> Tuple[bool, str]:
+        performance.set_size(len(records)).set_config(
+            key.algorithm, key.pivot, key.threshold, key.representation,
+            key.pattern)
+        algorithm, pivot, threshold = job[:3]
+        sorter = None
+        if algorithm in REFERENCE_ENGINES:
+            records = prepare_records(algorithm, records)
+
+        with time_budget(budget):
+            performance.start()
+            try:
+                if algorithm == "auto":
+                    algorithm, pivot, threshold, _ = choose_plan(
+                        analyze_presortedness(records))
+
+                if algorithm in REFERENCE_ENGINES:
+                    reference_sort(algorithm, records)
+                elif algorithm == "quicksort":
+                    sorter = engines[algorithm](records, pivot, threshold)
+                    sorter.q_sort()
+                else:
+                    sorter = engines[algorithm](records)
+                    sorter.n_merge_sort()
+            finally:
+                performance.stop()
+
+        if sorter is None:
+            performance.log_success()
+        else:
+            performance.log_success(comparisons=sorter.get_num_comparisons(),
+                                    exchanges=sorter.get_num_exchanges())
+
+        # Case: no interval timer interrupted the run, so it finished late
+        if budget and performance.get_runtime() > budget * 1e9:
+            raise BudgetExceeded(f"over the {budget:g}s budget")
+        return False, ""
+
+    return run_once
+
+
+def _label(key: "MetricKey") -> str:
+    """
+    Helper function for a short name of a configuration in progress output
+    """
+    return ' '.join(str(part) for part in key[:4] if part is not None)
@@ -0,0 +1,216 @@
+"""
+benchmark_harness
+
+This module holds a class for taking repeated runtime measurements. Every run
+gets a fresh copy of the original input, made outside of the timed region, so
+in-place sorts never hand already-sorted data to the next run. Warmup runs,
+repetition counts and garbage collector control are configurable. Memory is
+traced in one extra untimed run per configuration, since tracing would slow
+down the timed runs.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import gc
+from array import array
+from sys import getsizeof
+from typing import Callable, List, Optional, Sequence, Tuple
+from support.performance import Performance
+
+GC_MODES = ("enabled", "disabled", "collect")
+
+
+def copy_records(records: Sequence[int]) -> Sequence[int]:
+    """
+    Function that copies the records with the cheapest copy for their type.
+    Memoryviews (such as memory-mapped binary input) are copied into a typed
+    array, since the view itself cannot be copied.
+
+    Args:
+        records (Sequence[int]): original records
+
+    Returns:
+        Sequence[int]: independent copy of the records
+    """
+    if isinstance(records, memoryview):
+        copy = array(records.format)
+        copy.frombytes(records.cast('B'))
+        return copy
+
+    return records[:]
+
+
+def get_records_footprint(records: Sequence[int]) -> int:
+    """
+    Function that estimates the bytes the records take up in memory. Lists
+    count every distinct boxed integer they point to on top of the list itself,
+    while typed arrays and memoryviews hold their values unboxed.
+
+    Args:
+        records (Sequence[int]): records in any representation
+
+    Returns:
+        int: estimated bytes held by the records
+    """
+    if isinstance(records, memoryview):
+        return records.nbytes
+
+    if isinstance(records, array):
+        return getsizeof(records)
+
+    # Equal small integers are shared objects, so each is counted once
+    values = {id(value): value for value in records}
+    return getsizeof(records) + sum(map(getsizeof, values.values()))
+
+
+class BenchmarkHarness:
+    """
+    Class for running a sort repeatedly on isolated copies of its input
+    """
+
+    def __init__(self, warmup=0, repetitions=1, gc_mode="enabled",
+                 memory=False) -> None:
+        """
+        Creates instance of BenchmarkHarness
+
+        Args:
+            warmup (int): number of unlogged runs before the measured ones
+            repetitions (int): default number of measured runs
+            gc_mode (str): "enabled" to leave the garbage collector alone,
+                "disabled" to turn it off during each run, or "collect" to
+                run a full collection before each run
+            memory (bool): True if tracing memory in an untimed run before
+                the measured runs, otherwise False
+
+        Raises:
+            ValueError: if gc_mode is not one of GC_MODES
+        """
+        if gc_mode not in GC_MODES:
+            raise ValueError(f"Invalid GC mode: {gc_mode}. Must be one of "
+                             f"{', '.join(GC_MODES)}")
+
+        self._warmup = max(warmup, 0)
+        self._repetitions = max(repetitions, 1)
+        self._gc_mode = gc_mode
+        self._memory = memory
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the harness settings
+        """
+        return f"Warmup runs: {self._warmup}, GC: {self._gc_mode}, " \
+            f"Memory tracing: {'on' if self._memory else 'off'}"
+
+    def measure(self, run_once: Callable[[Sequence[int], "Performance", int],
+                                         Tuple[bool, str]],
+                records: Sequence[int], performance: "Performance",
+                repetitions: Optional[int] = None) \
+            -> Tuple[bool, List[str]]:
+        """
+        Method for running warmup runs, then measured runs, of a runner. The
+        runner starts and stops the timer itself and logs to the Performance
+        object it is given. Warmup runs log to a throwaway Performance object,
+        as does the memory run, whose traced memory alone is kept.
+
+        Args:
+            run_once (Callable): runner called with a fresh copy of the
+                records, a Performance object and the measured run index (-1
+                for warmup and memory runs). Returns an error flag and output
+                text
+            records (Sequence[int]): original records, never modified
+            performance (Performance): Performance object for measured runs
+                and traced memory
+            repetitions (int): number of measured runs, or None for the
+                harness default
+
+        Returns:
+            bool: True if a run returned an error, otherwise False
+            List[str]: output text of each measured run
+        """
+        repetitions = repetitions or self._repetitions
+        out = []
+
+        # Unlogged runs only show up in the phases of the measured runs
+        if self._warmup:
+            with performance.phase("warmup"):
+                for _ in range(self._warmup):
+                    error, _ = self._run_isolated(run_once, records,
+                                                  Performance(), -1)
+                    if error:
+                        return error, out
+
+        if self._memory:
+            probe = Performance().set_memory_tracking()
+            with performance.phase("memory tracing"):
+                error, _ = self._run_isolated(run_once, records, probe, -1)
+            if error:
+                return error, out
+            performance.log_memory(probe.get_key(), probe.get_peak_memory(),
+                                   probe.get_current_memory(),
+                                   probe.get_max_rss())
+
+        for index in range(repetitions):
+            error, result_text = self._run_isolated(run_once, records,
+                                                    performance, index)
+            out.append(result_text)
+            if error:
+                return error, out
+
+        return False, out
+
+    def run_untimed(self, run_once: Callable[[Sequence[int], "Performance",
+                                             int], Tuple[bool, str]],
+                    records: Sequence[int],
+                    performance: Optional["Performance"] = None) \
+            -> Tuple[bool, str]:
+        """
+        Method for one extra run on a fresh copy, logged apart from the
+        measured runs. It is meant for instrumented runs, such as traced or
+        profiled ones, whose overhead would skew the measured runs.
+
+        Args:
+            run_once (Callable): runner called with a fresh copy of the
+                records, a Performance object and the run index -1
+            records (Sequence[int]): original records, never modified
+            performance (Performance): Performance object for the run, or
+                None for a throwaway one
+
+        Returns:
+            bool: True if the run returned an error, otherwise False
+            str: output text of the run
+        """
+        return self._run_isolated(run_once, records,
+                                  performance or Performance(), -1)
+
+    def _run_isolated(self, run_once: Callable, records: Sequence[int],
+                      performance: "Performance", index: int) \
+            -> Tuple[bool, str]:
+        """
+        Helper method for one run on a fresh copy with the GC mode applied.
+        The copy and any collection happen before the runner starts its timer.
+
+        Args:
+            run_once (Callable): runner being measured
+            records (Sequence[int]): original records
+            performance (Performance): Performance object for this run
+            index (int): measured run index, or -1 for warmup and memory runs
+
+        Returns:
+            bool: True if the run returned an error, otherwise False
+            str: output text of the run
+        """
+        with performance.phase("copy records"):
+            copy = copy_records(records)
+
+        # The collector is only turned back on if it was on before the run
+        was_enabled = gc.isenabled()
+        if self._gc_mode == "collect":
+            gc.collect()
+        elif self._gc_mode == "disabled":
+            gc.disable()
+
+        try:
+            return run_once(copy, performance, index)
+        finally:
+            if self._gc_mode == "disabled" and was_enabled:
+                gc.enable()
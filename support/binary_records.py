@@ -0,0 +1,229 @@
+"""
+binary_records
+
+This module contains helper functions for the binary record format: packed
+little-endian 64-bit signed integers with no separators. Binary input is
+memory-mapped and exposed as a memoryview, so no text parsing is needed. It
+also holds converters between the whitespace-separated text format and the
+binary format.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import mmap
+from array import array
+from pathlib import Path
+from sys import byteorder
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
+from support.compressed_io import open_records, open_output_stream, \
+    strip_compression_suffix
+from support.fast_parse import iter_token_blocks, convert_tokens, \
+    RECORD_TYPECODE, BLOCK_SIZE
+
+BINARY_EXTENSIONS = (".bin",)
+RECORD_SIZE = 8
+RECORDS_PER_CHUNK = 1 << 16
+
+
+def is_binary_file(file: Union[str, Path], force_binary=False) -> bool:
+    """
+    Function that checks whether a file uses the binary record format, either
+    because it is forced by the user or based on the file extension. A
+    compression extension is skipped, so "ran1K.bin.gz" is binary.
+
+    Args:
+        file (Union[str, Path]): path of the file being checked
+        force_binary (bool): True if binary format was requested explicitly
+
+    Returns:
+        bool: True if the file should be treated as binary, otherwise False
+    """
+    suffix = strip_compression_suffix(file).suffix.lower()
+    return force_binary or suffix in BINARY_EXTENSIONS
+
+
+def load_binary_records(input_file: Union[str, Path]) \
+        -> Tuple[Union[memoryview, array, List[str]], bool]:
+    """
+    Helper function for loading all records from a binary input file. The file
+    is memory-mapped copy-on-write, so sorting in place never modifies the
+    file. On big-endian machines a single byte-swapped copy is made instead.
+
+    Args:
+        input_file (Union[str, Path]): binary file of packed int64 records
+
+    Returns:
+        memoryview: writable view of the records cast to int64
+        List[str]: error message if the file is not made of whole records
+        bool: True if the file is invalid else False
+    """
+    with open(input_file, 'rb') as records:
+        size = Path(input_file).stat().st_size
+
+        if size % RECORD_SIZE:
+            error = f"binary input size {size} is not a multiple of "
+            error += f"{RECORD_SIZE} bytes"
+            return [error], True
+
+        if size == 0:
+            # Case: empty file. Zero-length files cannot be memory-mapped
+            return array(RECORD_TYPECODE), False
+
+        mapped = mmap.mmap(records.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if byteorder != "little":
+        # Case: big-endian machine. Copy once and swap to native order
+        swapped = array(RECORD_TYPECODE, bytes(mapped))
+        swapped.byteswap()
+        return swapped, False
+
+    # Mapping stays alive for as long as the view exists
+    return memoryview(mapped).cast(RECORD_TYPECODE), False
+
+
+def read_binary_records(input_file: Union[str, Path, BinaryIO]) \
+        -> Tuple[Union[array, List[str]], bool]:
+    """
+    Helper function for loading all records from a binary stream that cannot
+    be memory-mapped, such as a compressed file. Records are read block by
+    block into a typed array.
+
+    Args:
+        input_file (Union[str, Path, BinaryIO]): binary file of packed int64
+            records, or an open (possibly decompressing) stream of it
+
+    Returns:
+        array: typed array of all records
+        List[str]: error message if the stream is not made of whole records
+        bool: True if the stream is invalid else False
+    """
+    records = array(RECORD_TYPECODE)
+
+    with open_records(input_file) as stream:
+        try:
+            for block in iter_record_blocks(stream, True):
+                records.extend(block)
+        except ValueError as ve:
+            return [ve.args[0]], True
+
+    return records, False
+
+
+def iter_record_blocks(stream: BinaryIO, binary=False,
+                       block_size=BLOCK_SIZE) -> Iterator[array]:
+    """
+    Generator that streams records from an open input file in blocks, in
+    either the text or the binary format. Only one block is held at a time.
+
+    Args:
+        stream (BinaryIO): input stream opened in binary mode
+        binary (bool): True if the stream uses the binary record format
+        block_size (int): approximate number of bytes read per block
+
+    Yields:
+        array: int64 records of the current block
+
+    Raises:
+        ValueError: if a non-integer record or a partial binary record is
+            found
+        OverflowError: if a text record does not fit in a 64-bit integer
+    """
+    if not binary:
+        for tokens in iter_token_blocks(stream, block_size):
+            yield convert_tokens(tokens)
+        return
+
+    block_size -= block_size % RECORD_SIZE
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+
+        while len(block) % RECORD_SIZE:
+            # Case: a short read. Complete the record or reject the input
+            rest = stream.read(RECORD_SIZE - len(block) % RECORD_SIZE)
+            if not rest:
+                raise ValueError("binary input ends with a partial record")
+            block += rest
+
+        records = array(RECORD_TYPECODE, block)
+        if byteorder != "little":
+            records.byteswap()
+
+        yield records
+
+
+def to_binary_bytes(records: Iterable[int]) -> bytes:
+    """
+    Helper function for packing records as little-endian int64 bytes
+
+    Args:
+        records (Iterable[int]): records being packed
+
+    Returns:
+        bytes: packed records
+    """
+    if isinstance(records, (array, memoryview)) and byteorder == "little":
+        # Case: already packed int64 records. Copy the bytes directly
+        return records.tobytes()
+
+    packed = array(RECORD_TYPECODE, records)
+    if byteorder != "little":
+        packed.byteswap()
+
+    return packed.tobytes()
+
+
+def convert_text_to_binary(input_file: Union[str, Path],
+                           output_file: Union[str, Path]) -> int:
+    """
+    Function that converts a whitespace-separated text file of records into
+    the binary format. The input is streamed, so it is never held in memory.
+    Either file may be gzip, bz2 or xz compressed.
+
+    Args:
+        input_file (Union[str, Path]): text file of records
+        output_file (Union[str, Path]): binary file being written
+
+    Returns:
+        int: number of records converted
+
+    Raises:
+        ValueError: if a non-integer record is found
+    """
+    count = 0
+    with open_records(input_file) as text, \
+            open_output_stream(output_file) as output:
+        for block_records in iter_record_blocks(text):
+            output.write(to_binary_bytes(block_records))
+            count += len(block_records)
+
+    return count
+
+
+def convert_binary_to_text(input_file: Union[str, Path],
+                           output_file: Union[str, Path]) -> int:
+    """
+    Function that converts a binary file of records into the text format, with
+    one record per line. The input is streamed, so it is never held in memory.
+    Either file may be gzip, bz2 or xz compressed.
+
+    Args:
+        input_file (Union[str, Path]): binary file of records
+        output_file (Union[str, Path]): text file being written
+
+    Returns:
+        int: number of records converted
+
+    Raises:
+        ValueError: if the binary file is not made of whole records
+    """
+    count = 0
+    with open_records(input_file) as binary, \
+            open_output_stream(output_file) as output:
+        for block_records in iter_record_blocks(binary, True):
+            lines = '\n'.join(map(str, block_records)) + '\n'
+            output.write(lines.encode("utf-8"))
+            count += len(block_records)
+
+    return count
@@ -0,0 +1,121 @@
+"""
+complexity_fit
+
+This module contains functions that fit measurements taken at several input
+sizes, such as median runtimes or comparison counts, to growth models. Each
+fit holds the empirical exponent of a power law through the measurements and
+the best of the n, n·log n and n² models, which are scaled to the measurements
+by least squares on relative residuals so small and large sizes weigh alike.
+Crossovers are the sizes where one configuration overtakes another, found by
+interpolating between the sizes both were measured at. Sizes where the two
+are within a margin of each other count as ties, so noise between close
+configurations is not reported as a string of crossovers.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from math import exp, log, log2
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Growth models by name, as functions of the input size
+MODELS: Dict[str, Callable[[float], float]] = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * log2(n),
+    "n^2": lambda n: n * n}
+MIN_FIT_SIZES = 2
+CROSSOVER_MARGIN = 0.1
+
+
+class ComplexityFit(NamedTuple):
+    """
+    Growth of measurements with the input size. The power law is
+    scale * n ** exponent, and errors are the root mean square relative
+    residual of each model.
+    """
+    exponent: float
+    scale: float
+    model: str
+    model_errors: Dict[str, float]
+
+
+def fit_complexity(points: Dict[int, float]) -> Optional["ComplexityFit"]:
+    """
+    Function that fits measurements by input size to a power law and to each
+    of the growth models. Sizes below 2 and measurements of 0 are left out,
+    since neither has a logarithm.
+
+    Args:
+        points (Dict[int, float]): measurement by input size
+
+    Returns:
+        ComplexityFit: exponent, power law scale, best model and the error of
+            every model
+        None: if fewer than 2 sizes remain
+    """
+    points = {size: value for size, value in points.items()
+              if size >= 2 and value > 0}
+    if len(points) < MIN_FIT_SIZES:
+        return None
+
+    # Ordinary least squares of log value against log size
+    logs = [(log(size), log(value)) for size, value in points.items()]
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    spread = sum((x - mean_x) ** 2 for x, _ in logs)
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in logs) / spread
+    scale = exp(mean_y - exponent * mean_x)
+
+    model_errors = {name: _model_error(model, points)
+                    for name, model in MODELS.items()}
+
+    return ComplexityFit(exponent, scale,
+                         min(model_errors, key=model_errors.get),
+                         model_errors)
+
+
+def find_crossovers(first: Dict[int, float], second: Dict[int, float],
+                    margin=CROSSOVER_MARGIN) -> List[Tuple[float, bool]]:
+    """
+    Function that estimates the sizes where two configurations swap places,
+    interpolating the log of their ratio between neighbouring sizes measured
+    for both. Sizes where neither is faster by more than the margin are
+    skipped as ties.
+
+    Args:
+        first (Dict[int, float]): measurement of one configuration by size
+        second (Dict[int, float]): measurement of the other by size
+        margin (float): relative difference below which sizes are ties
+
+    Returns:
+        List[Tuple[float, bool]]: estimated crossover sizes in ascending
+            order, each with True if the first configuration is faster below
+            it
+    """
+    tie = log(1 + margin)
+    sizes = sorted(size for size in first
+                   if size in second and first[size] > 0 and second[size] > 0
+                   and abs(log(first[size] / second[size])) >= tie)
+    crossovers = []
+
+    for low, high in zip(sizes, sizes[1:]):
+        low_ratio = log(first[low] / second[low])
+        high_ratio = log(first[high] / second[high])
+        if low_ratio * high_ratio < 0:
+            share = low_ratio / (low_ratio - high_ratio)
+            crossovers.append((exp(log(low) + share * (log(high) - log(low))),
+                               low_ratio < 0))
+
+    return crossovers
+
+
+def _model_error(model: Callable[[float], float],
+                 points: Dict[int, float]) -> float:
+    """
+    Helper function for the root mean square relative residual of a model
+    scaled to the points. Minimizing the sum of (1 - c * f(n) / value) ** 2
+    gives the scale c = sum(r) / sum(r ** 2) for ratios r = f(n) / value.
+    """
+    ratios = [model(size) / value for size, value in points.items()]
+    scale = sum(ratios) / sum(ratio * ratio for ratio in ratios)
+    return (sum((1 - scale * ratio) ** 2 for ratio in ratios)
+            / len(ratios)) ** 0.5
@@ -0,0 +1,219 @@
+"""
+compressed_io
+
+This module contains helpers for reading and writing gzip, bz2 and xz
+compressed record files transparently. Compressed inputs are detected from
+their leading magic bytes and stream-decompressed block by block. Time spent
+decompressing is tracked separately so it can be reported apart from parsing
+and sorting.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import io
+from contextlib import nullcontext
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter_ns
+from typing import BinaryIO, Callable, ContextManager, Optional, Union
+from support.pipeline import is_stdio, open_stdout
+
+# Magic bytes at the start of each supported compressed format
+MAGIC_BYTES = {"gzip": b"\x1f\x8b", "bz2": b"BZh", "xz": b"\xfd7zXZ\x00"}
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+# Compression modules are only imported once a compressed file is opened
+OPENERS = {"gzip": "gzip", "bz2": "bz2", "xz": "lzma"}
+
+
+def detect_compression(file: Union[str, Path]) -> Optional[str]:
+    """
+    Function that detects the compression format of an existing file from its
+    magic bytes
+
+    Args:
+        file (Union[str, Path]): path of the file being checked
+
+    Returns:
+        Optional[str]: "gzip", "bz2" or "xz", or None if uncompressed
+    """
+    with open(file, 'rb') as stream:
+        header = stream.read(max(map(len, MAGIC_BYTES.values())))
+
+    for compression, magic in MAGIC_BYTES.items():
+        if header.startswith(magic):
+            return compression
+
+    return None
+
+
+def get_opener(compression: Optional[str]) -> Callable[..., BinaryIO]:
+    """
+    Function that returns the open function of a compression format
+
+    Args:
+        compression (Optional[str]): "gzip", "bz2" or "xz", or None
+
+    Returns:
+        Callable: open function of the compression module, or the built-in
+            open if uncompressed
+    """
+    if compression is None:
+        return open
+
+    return import_module(OPENERS[compression]).open
+
+
+def compression_from_extension(file: Union[str, Path]) -> Optional[str]:
+    """
+    Function that chooses the compression format of a file being written from
+    its extension
+
+    Args:
+        file (Union[str, Path]): path of the file being written
+
+    Returns:
+        Optional[str]: "gzip", "bz2" or "xz", or None if uncompressed
+    """
+    return COMPRESSION_EXTENSIONS.get(Path(file).suffix.lower())
+
+
+def strip_compression_suffix(file: Union[str, Path]) -> Path:
+    """
+    Function that removes a compression extension, so "ran1K.bin.gz" is
+    treated like "ran1K.bin" when detecting the record format
+
+    Args:
+        file (Union[str, Path]): path of the file
+
+    Returns:
+        Path: path without its compression extension
+    """
+    file = Path(file)
+    if compression_from_extension(file):
+        return file.with_suffix("")
+
+    return file
+
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Raw binary stream over a possibly compressed file. Data is decompressed
+    block by block as it is read, and the time and bytes involved are tracked.
+    """
+
+    def __init__(self, input_file: Union[str, Path]) -> None:
+        """
+        Creates instance of DecompressingReader and opens the input file with
+        the decompressor matching its magic bytes
+
+        Args:
+            input_file (Union[str, Path]): file being read
+        """
+        super().__init__()
+        self._compression = detect_compression(input_file)
+        opener = get_opener(self._compression)
+        self._stream = opener(input_file, 'rb')
+        self._read_time = 0
+        self._bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Reads decompressed bytes into a pre-allocated buffer while timing the
+        read
+
+        Args:
+            buffer (bytearray): buffer being filled
+
+        Returns:
+            int: number of bytes read, 0 at the end of the file
+        """
+        start = perf_counter_ns()
+        num_bytes = self._stream.readinto(buffer)
+        self._read_time += perf_counter_ns() - start
+        self._bytes_read += num_bytes
+        return num_bytes
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
+    def get_compression(self) -> Optional[str]:
+        """
+        Getter method for the detected compression format
+
+        Returns:
+            Optional[str]: "gzip", "bz2" or "xz", or None if uncompressed
+        """
+        return self._compression
+
+    def get_decompression_time(self) -> int:
+        """
+        Getter method for the time spent reading and decompressing. Zero for
+        uncompressed files, whose reads are plain I/O.
+
+        Returns:
+            int: time spent decompressing in ns
+        """
+        return self._read_time if self._compression else 0
+
+    def get_bytes_read(self) -> int:
+        """
+        Getter method for the number of decompressed bytes read so far
+
+        Returns:
+            int: decompressed bytes read
+        """
+        return self._bytes_read
+
+
+def open_input_stream(input_file: Union[str, Path]) -> "DecompressingReader":
+    """
+    Function that opens a possibly compressed input file as a binary stream
+
+    Args:
+        input_file (Union[str, Path]): file being read
+
+    Returns:
+        DecompressingReader: stream of decompressed bytes
+    """
+    return DecompressingReader(input_file)
+
+
+def open_records(input_file: Union[str, Path, BinaryIO]) \
+        -> ContextManager[BinaryIO]:
+    """
+    Function that gives parsers a binary stream whether they are handed a file
+    path or a stream that is already open. Streams are left open for the
+    caller to close.
+
+    Args:
+        input_file (Union[str, Path, BinaryIO]): file path or binary stream
+
+    Returns:
+        ContextManager[BinaryIO]: context manager yielding a binary stream
+    """
+    if hasattr(input_file, "read"):
+        return nullcontext(input_file)
+
+    return open_input_stream(input_file)
+
+
+def open_output_stream(output_file: Union[str, Path]) -> BinaryIO:
+    """
+    Function that opens an output file as a binary stream, compressing it if
+    its extension is .gz, .bz2 or .xz. The path "-" writes to stdout.
+
+    Args:
+        output_file (Union[str, Path]): file being written
+
+    Returns:
+        BinaryIO: stream accepting uncompressed bytes
+    """
+    if is_stdio(output_file):
+        return open_stdout()
+
+    opener = get_opener(compression_from_extension(output_file))
+    return opener(output_file, 'wb')
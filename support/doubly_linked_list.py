@@ -6,7 +6,7 @@ This module holds a class that implements a basic doubly linked list object.
 Author: Rani Hinnawi
 Date: 2023-08-22
 """
-from typing import List, TypeVar, Optional
+from typing import Iterator, List, TypeVar, Optional
 from support.node import Node
 
 # Set up generic type for stack to remain type-agnostic
@@ -41,6 +41,19 @@ class DoublyLinkedList:
         """
         return self._size
 
+    def __iter__(self) -> Iterator[T]:
+        """
+        Traverses the DoublyLinkedList from head to tail without building a
+        Python list
+
+        Yields:
+            T: data of each node in order
+        """
+        current = self._head
+        while current:
+            yield current.get_data()
+            current = current.get_next()
+
     def get_head(self) -> Optional["Node"]:
         """
         Getter method for retrieving node at head of the list
@@ -0,0 +1,135 @@
+"""
+fast_parse
+
+This module contains a bulk record parser for large data input files. Instead
+of reading line by line, the file is read as bytes in large blocks. Each block
+is split on whitespace, with partial tokens carried over to the next block, and
+converted in bulk straight into a preallocated typed array of 64-bit integers.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Tuple, Union
+from support.compressed_io import open_records, detect_compression
+
+BLOCK_SIZE = 1 << 22
+RECORD_TYPECODE = 'q'
+
+
+def iter_token_blocks(stream: BinaryIO, block_size=BLOCK_SIZE) \
+        -> Iterator[List[bytes]]:
+    """
+    Generator that reads a binary stream in blocks and yields the whitespace
+    separated tokens of each block. A token cut off at the end of a block is
+    carried over and completed by the next block.
+
+    Args:
+        stream (BinaryIO): binary stream being read
+        block_size (int): number of bytes read per block
+
+    Yields:
+        List[bytes]: complete tokens found in the current block
+    """
+    carry = b""
+
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+
+        block = carry + block
+        tokens = block.split()
+
+        # Hold back the last token if the block ends in the middle of it
+        if tokens and not block[-1:].isspace():
+            carry = tokens.pop()
+        else:
+            carry = b""
+
+        yield tokens
+
+    if carry:
+        yield [carry]
+
+
+def convert_tokens(tokens: List[bytes]) -> array:
+    """
+    Converts a list of byte tokens into a typed array of 64-bit integers in
+    bulk.
+
+    Args:
+        tokens (List[bytes]): whitespace-free tokens
+
+    Returns:
+        array: converted records
+
+    Raises:
+        ValueError: if a non-integer record is found. The message matches the
+            one raised when parsing the record as text
+        OverflowError: if a record does not fit in a 64-bit integer
+    """
+    try:
+        return array(RECORD_TYPECODE, map(int, tokens))
+    except ValueError:
+        # Reproduce the error message of the text parser for the bad token
+        for token in tokens:
+            int(token.decode("utf-8", errors="replace"))
+        raise
+    except OverflowError as oe:
+        for token in tokens:
+            if not -(1 << 63) <= int(token) < (1 << 63):
+                error = "record out of 64-bit integer range: "
+                error += token.decode("utf-8", errors="replace")
+                raise OverflowError(error) from oe
+        raise
+
+
+def parse_all_records_fast(input_file: Union[str, Path, BinaryIO],
+                           block_size=BLOCK_SIZE) \
+        -> Tuple[Union[array, List[str]], bool]:
+    """
+    Fast alternative to parse_all_records. Records are read in blocks of bytes
+    and written directly into a typed array. For uncompressed files the array
+    is preallocated using the record density of the first block. Error
+    semantics match parse_all_records.
+
+    Args:
+        input_file (Union[str, Path, BinaryIO]): text file with string items
+            to sort, or an open binary stream of it (possibly decompressing)
+        block_size (int): number of bytes read per block
+
+    Returns:
+        array: typed array of all records
+        List[str]: error message if a record is invalid
+        bool: True if ValueError raised else False
+    """
+    file_size = None
+    if not hasattr(input_file, "read") and not detect_compression(input_file):
+        file_size = Path(input_file).stat().st_size
+
+    records = array(RECORD_TYPECODE)
+    count = 0
+
+    with open_records(input_file) as stream:
+        for tokens in iter_token_blocks(stream, block_size):
+            try:
+                block_records = convert_tokens(tokens)
+            except (ValueError, OverflowError) as error:
+                # If record cannot be cast as an int, it is invalid
+                return [error.args[0]], True
+
+            if file_size and not records and block_records:
+                # Preallocate using the density of the first block
+                density = len(block_records) / min(block_size, file_size)
+                estimate = int(file_size * density * 1.05) + 1
+                records = array(RECORD_TYPECODE, [0]) * estimate
+
+            # Slice assignment writes in place, growing only past capacity
+            records[count:count + len(block_records)] = block_records
+            count += len(block_records)
+
+    # Drop unused preallocated space
+    del records[count:]
+    return records, False
@@ -8,14 +8,19 @@ performance report.
 Author: Rani Hinnawi
 Date: 2023-08-22
 """
-from support.performance import Performance
+from typing import Dict, List, Tuple
+from support.performance import MetricKey, MetricRecord, Performance
+from support.runtime_stats import percentile, summarize_runtimes
 
 
 def format_performance_report(metrics: 'Performance', micro_sec=False) -> str:
     """
-    Function that formats the size and runtime data logged for each success and
-    failure into a report. Runtimes are outputted by size in order from 
-    smallest to largest.
+    Function that formats the runtime data logged for each success and failure
+    into a report. Runtimes are outputted per configuration in the order the
+    configurations ran, from smallest to largest, each followed by a summary of
+    their distribution. Traced memory per configuration, the median runtime
+    per algorithm and size and the slowdown of each configuration against the
+    fastest close the report.
 
     Args:
         metrics (Performance): Performance object with logged metrics data
@@ -24,44 +29,48 @@ def format_performance_report(metrics: 'Performance', micro_sec=False) -> str:
 
     Returns:
         str: logged successes and failures, formatted to suit a text file
-
-    TODO: Update to have write be a List that is joined by \n
     """
     write = ["\n-------Performance Report-------\n"]
+    records = metrics.get_records()
 
-    # Note total number of successes and successes per size
+    # Note total number of successes and successes per configuration
     write.append(f"Total number of successes: {metrics.get_num_successes()}")
-
-    successes = metrics.get_successes()
-    for size in sorted(successes.keys()):
-        runtimes = sorted(successes[size])
-
-        if micro_sec:
-            # If measurements are in micro-seconds, convert runtimes
-            for i, time in enumerate(runtimes):
-                time /= 1000
-                runtimes[i] = int(time)
-
-        write.append(str(runtimes))
+    for key, record in records.items():
+        if record.runtimes:
+            write.extend(_format_runtimes(key, record.runtimes, micro_sec))
 
     write.append("-")
 
-    # Note total number of errors and errors per size
+    # Note total number of errors and errors per configuration
     write.append(f"Total number of errors: {metrics.get_num_errors()}")
-
-    errors = metrics.get_errors()
-    for size in sorted(errors.keys()):
-        runtime = sorted(errors[size])
-
-        if micro_sec:
-            # If measurements are in micro-seconds, convert runtimes
-            for i, time in enumerate(runtimes):
-                time /= 1000
-                runtimes[i] = int(time)
-
-        write.append(str(runtime))
-
-    write.append("\nFormat:\n\t[runtime1, ..., runtimeN]")
+    for key, record in records.items():
+        if record.error_runtimes:
+            write.extend(_format_runtimes(key, record.error_runtimes,
+                                          micro_sec))
+
+    # Note memory per configuration, where it was traced
+    traced = [(key, record) for key, record in records.items()
+              if record.peak_memory]
+    if traced:
+        write.append("\nMemory by configuration (traced in an untimed run):")
+    for key, record in traced:
+        write.append(f"\t{format_metric_key(key)}: "
+                     f"{format_memory(record, key.size)}")
+
+    # Pool the configurations of each algorithm to compare them by size
+    medians = metrics.get_summaries(("algorithm", "size"))
+    if medians:
+        write.append("\nMedian runtime by algorithm and size:")
+    for (algorithm, size), summary in medians.items():
+        median = summary.median / 1000 if micro_sec else summary.median
+        write.append(f"\t{algorithm or 'unknown'}, {size} records: "
+                     f"{median:.1f} ({summary.count} runs)")
+
+    write.extend(format_slowdowns(records, micro_sec))
+
+    write.append("\nFormat:\n\tconfiguration:\n\t[runtime1, ..., runtimeN]")
+    write.append("\tmin, median, mean, stddev, p95, p99, 95% bootstrap CI of "
+                 "the median, outliers beyond 1.5 IQR")
     footer = "\tNOTE: Runtimes measured in"
 
     if micro_sec:
@@ -72,3 +81,167 @@ def format_performance_report(metrics: 'Performance', micro_sec=False) -> str:
     write.append(footer)
 
     return '\n'.join(write)
+
+
+def format_slowdowns(records: Dict["MetricKey", "MetricRecord"],
+                     micro_sec=False) -> List[str]:
+    """
+    Function that ranks the configurations run on the same input by median
+    runtime, each with its slowdown against the fastest, such as a reference
+    engine. Inputs with a single configuration are left out.
+
+    Args:
+        records (Dict[MetricKey, MetricRecord]): metrics by configuration
+        micro_sec (bool): True if converting medians to microseconds
+
+    Returns:
+        List[str]: formatted lines, none if no input has two configurations
+    """
+    inputs: Dict[Tuple, List[Tuple[float, "MetricKey"]]] = {}
+    for key, record in records.items():
+        if record.runtimes:
+            inputs.setdefault((key.pattern, key.size), []).append(
+                (percentile(sorted(record.runtimes), 50), key))
+
+    write = []
+    for (pattern, size), medians in inputs.items():
+        if len(medians) < 2:
+            continue
+
+        medians.sort(key=lambda entry: entry[0])
+        fastest = medians[0][0]
+        if not write:
+            write.append("\nSlowdown against the fastest configuration "
+                         "(median runtime):")
+        write.append(f"\t{pattern or 'unknown'}, {size} records:")
+
+        for median, key in medians:
+            shown = median / 1000 if micro_sec else median
+            name = format_metric_key(key._replace(pattern=None),
+                                     with_size=False)
+            write.append(f"\t\t{name}: "
+                         f"{shown:.1f} (x{median / max(fastest, 1):.2f})")
+
+    return write
+
+
+def format_metric_key(key: "MetricKey", with_size=True) -> str:
+    """
+    Function that names the configuration of a MetricKey, leaving out settings
+    that do not apply
+
+    Args:
+        key (MetricKey): configuration runs were logged under
+        with_size (bool): True if naming the record count, otherwise False
+
+    Returns:
+        str: configuration such as "quicksort, first pivot, threshold 2,
+            parsed, ran, 1000 records"
+    """
+    parts = [key.algorithm,
+             f"{key.pivot} pivot" if key.pivot else None,
+             f"threshold {key.threshold}" if key.threshold is not None
+             else None,
+             key.representation, key.pattern,
+             f"{key.size} records" if with_size else None]
+    return ', '.join(part for part in parts if part)
+
+
+def format_memory(record: "MetricRecord", size: int) -> str:
+    """
+    Function that formats the largest memory traced for a configuration, with
+    its peak per record
+
+    Args:
+        record (MetricRecord): metrics of the configuration
+        size (int): number of records sorted
+
+    Returns:
+        str: peak bytes, bytes per record, retained bytes and RSS high-water
+            mark
+    """
+    peak = max(record.peak_memory)
+    text = f"peak {peak} bytes ({peak / max(size, 1):.1f} bytes/record), " \
+        f"retained {max(record.current_memory)} bytes"
+
+    if record.max_rss:
+        text += f", RSS high-water {max(record.max_rss)} bytes"
+
+    return text
+
+
+def format_phase_breakdown(phases: Dict[Tuple[str, ...], List[int]]) -> str:
+    """
+    Function that formats the time of each phase of a run as a table nested
+    by phase, with each phase's share of its parent phase, or of the total for
+    top-level phases. Time a phase spent outside its inner phases is listed
+    as "(other)".
+
+    Args:
+        phases (Dict[Tuple[str, ...], List[int]]): total time in ns and calls
+            by path of phase names, parents before children
+
+    Returns:
+        str: formatted phase breakdown
+    """
+    total = sum(runtime for path, (runtime, _) in phases.items()
+                if len(path) == 1)
+    rows = []
+
+    for path, (runtime, calls) in phases.items():
+        parent = path[:-1]
+        parent_runtime = phases[parent][0] if parent else total
+        rows.append(("  " * (len(path) - 1) + path[-1], str(calls), runtime,
+                     parent_runtime))
+
+        # The last inner phase of a parent closes it with its other time
+        children = [child for child in phases if child[:-1] == parent]
+        if parent and path == children[-1]:
+            other = parent_runtime - sum(phases[child][0]
+                                         for child in children)
+            rows.append(("  " * (len(path) - 1) + "(other)", "-",
+                         max(other, 0), parent_runtime))
+
+    width = max([len(name) for name, _, _, _ in rows] + [len("Phase")]) + 2
+    write = ["\n-------Phase Breakdown-------\n",
+             f"{'Phase':<{width}}{'Calls':>10}{'Total':>14}{'Share':>8}"]
+    for name, calls, runtime, parent_runtime in rows:
+        write.append(f"{name:<{width}}{calls:>10}{runtime / 1000:>14.1f}"
+                     f"{runtime / max(parent_runtime, 1):>8.1%}")
+    write.append(f"{'Total':<{width}}{'':>10}{total / 1000:>14.1f}"
+                 f"{1:>8.1%}")
+
+    write.append("\n\tNOTE: Times summed over all runs in microseconds (μs). "
+                 "Shares are of the\n\tparent phase, or of the total for "
+                 "top-level phases. Writing the\n\treport is not included")
+
+    return '\n'.join(write)
+
+
+def _format_runtimes(key: "MetricKey", runtimes: List[int], micro_sec=False) \
+        -> List[str]:
+    """
+    Helper function that formats the sorted runtimes of one configuration with
+    their summary
+
+    Args:
+        key (MetricKey): configuration the runtimes were logged under
+        runtimes (List[int]): runtimes (ns)
+        micro_sec (bool): True if converting runtimes to microseconds
+
+    Returns:
+        List[str]: configuration, runtimes and summary lines
+    """
+    runtimes = sorted(runtimes)
+
+    if micro_sec:
+        # If measurements are in micro-seconds, convert runtimes
+        runtimes = [int(time / 1000) for time in runtimes]
+
+    summary = summarize_runtimes(runtimes)
+    return [f"{format_metric_key(key)}:", str(runtimes),
+            f"\tmin {summary.min}, median {summary.median:.1f}, mean "
+            f"{summary.mean:.1f}, stddev {summary.stddev:.1f}, p95 "
+            f"{summary.p95:.1f}, p99 {summary.p99:.1f}, CI "
+            f"[{summary.ci_low:.1f}, {summary.ci_high:.1f}], outliers "
+            f"{list(summary.outliers)}"]
@@ -9,11 +9,13 @@ Author: Rani Hinnawi
 Date: 2023-08-22
 """
 from typing import TextIO, List
+from support.pipeline import is_stdio
 
 
 def is_valid_io(*files: List[TextIO]) -> bool:
     """
-    Function that validates that the input and the path to the output exist
+    Function that validates that the input and the path to the output exist.
+    The path "-" stands for stdin or stdout and is always valid.
 
     Args:
         *files (List[TextIO]): list of possible file paths
@@ -29,7 +31,7 @@ def is_valid_io(*files: List[TextIO]) -> bool:
 
     for file in files:
         # Validate path
-        if not file.exists():
+        if not is_stdio(file) and not file.exists():
             error_message += f"- {file.name}\n"
             error = True
 
@@ -38,3 +40,23 @@ def is_valid_io(*files: List[TextIO]) -> bool:
         raise FileNotFoundError(error_message)
 
     return True
+
+
+def is_valid_output(*files: List[TextIO]) -> bool:
+    """
+    Function that validates that output files can be created: each must either
+    be "-" (stdout) or be inside an existing directory. The files themselves
+    do not need to exist yet.
+
+    Args:
+        *files (List[TextIO]): list of possible output file paths
+
+    Returns:
+        bool: True if all output paths are valid
+
+    Raises:
+        FileNotFoundError: If the directory of any file does not exist
+    """
+    directories = [file.absolute().parent for file in files
+                   if not is_stdio(file)]
+    return is_valid_io(*directories)
@@ -0,0 +1,210 @@
+"""
+metrics_export
+
+This module contains functions that export the metrics logged by Performance
+objects as JSON or CSV, along with the environment they were measured in, and
+read exported runtimes back for comparisons against a baseline.
+
+JSON exports hold one entry per configuration with every logged value and a
+runtime summary. CSV exports hold one row per measured run, with the
+configuration, the memory traced for it and the environment repeated on every
+row, so they load directly into a spreadsheet or data frame. Runtimes are in
+nanoseconds.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import csv
+import json
+import platform
+import socket
+from datetime import datetime, timezone
+from os import cpu_count
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+from support.performance import METRIC_DIMENSIONS, MetricKey, MetricRecord, \
+    Performance
+from support.runtime_stats import summarize_runtimes
+
+EXPORT_FORMAT_VERSION = 1
+EXPORT_FORMATS = (".json", ".csv")
+MEMORY_FIELDS = ("peak_memory", "current_memory", "max_rss")
+CSV_FIELDS = METRIC_DIMENSIONS + ("status", "run", "runtime_ns", "comparisons",
+                                  "exchanges") + MEMORY_FIELDS
+
+
+def get_environment() -> Dict[str, Any]:
+    """
+    Function that describes the machine and interpreter metrics are measured on
+
+    Returns:
+        Dict[str, Any]: Python version and implementation, platform, CPU
+            count, hostname and the time of the export
+    """
+    return {"python_version": platform.python_version(),
+            "python_implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(),
+            "cpu_count": cpu_count(), "hostname": socket.gethostname(),
+            "exported_at": datetime.now(timezone.utc).isoformat()}
+
+
+def merge_records(performances: Sequence["Performance"]) \
+        -> Dict["MetricKey", "MetricRecord"]:
+    """
+    Function that pools the records of several Performance objects, such as
+    those of a batch, joining the runs logged under the same configuration
+
+    Args:
+        performances (Sequence[Performance]): metrics to pool
+
+    Returns:
+        Dict[MetricKey, MetricRecord]: pooled metrics by configuration
+    """
+    merged: Dict["MetricKey", "MetricRecord"] = {}
+
+    for performance in performances:
+        for key, record in performance.get_records().items():
+            if key not in merged:
+                merged[key] = MetricRecord(*([] for _ in record))
+            for pooled, values in zip(merged[key], record):
+                pooled.extend(values)
+
+    return merged
+
+
+def metrics_to_dict(performances: Sequence["Performance"]) -> Dict[str, Any]:
+    """
+    Function that converts the metrics of one or more Performance objects into
+    a JSON-serializable dictionary
+
+    Args:
+        performances (Sequence[Performance]): metrics to convert
+
+    Returns:
+        Dict[str, Any]: format version, environment, totals and one entry per
+            configuration
+    """
+    configurations = []
+
+    for key, record in merge_records(performances).items():
+        entry = {**key._asdict(), **record._asdict(), "summary": None}
+        if record.runtimes:
+            entry["summary"] = summarize_runtimes(record.runtimes)._asdict()
+            entry["summary"]["outliers"] = list(entry["summary"]["outliers"])
+        configurations.append(entry)
+
+    return {"format_version": EXPORT_FORMAT_VERSION,
+            "environment": get_environment(),
+            "totals": {
+                "successes": sum(performance.get_num_successes()
+                                 for performance in performances),
+                "errors": sum(performance.get_num_errors()
+                              for performance in performances)},
+            "configurations": configurations}
+
+
+def export_metrics(performances: Union["Performance",
+                                       Sequence["Performance"]],
+                   export_file: Union[str, Path]) -> None:
+    """
+    Function that writes metrics to a .json or .csv file, by its extension
+
+    Args:
+        performances (Performance | Sequence[Performance]): metrics to export
+        export_file (str | Path): pathname of the export
+
+    Raises:
+        ValueError: if the extension is neither .json nor .csv
+    """
+    export_file = Path(export_file)
+    if isinstance(performances, Performance):
+        performances = [performances]
+
+    if export_file.suffix.lower() == ".json":
+        with open(export_file, 'w', encoding="utf-8") as output:
+            json.dump(metrics_to_dict(performances), output, indent=2)
+        return
+
+    if export_file.suffix.lower() != ".csv":
+        raise ValueError(f"Invalid export file {export_file.name}. Must end "
+                         f"with one of {', '.join(EXPORT_FORMATS)}")
+
+    environment = get_environment()
+    with open(export_file, 'w', encoding="utf-8", newline='') as output:
+        writer = csv.DictWriter(output,
+                                fieldnames=CSV_FIELDS + tuple(environment))
+        writer.writeheader()
+
+        for key, record in merge_records(performances).items():
+            # Memory is traced once per configuration, so its largest reading
+            # is repeated on every run of the configuration
+            row = {**key._asdict(), **environment,
+                   **{field: max(getattr(record, field), default=None)
+                      for field in MEMORY_FIELDS}}
+
+            for run, runtime in enumerate(record.runtimes):
+                writer.writerow({
+                    **row, "status": "success", "run": run,
+                    "runtime_ns": runtime,
+                    "comparisons": _get(record.comparisons, run),
+                    "exchanges": _get(record.exchanges, run)})
+            for run, runtime in enumerate(record.error_runtimes):
+                writer.writerow({**row, "status": "error", "run": run,
+                                 "runtime_ns": runtime})
+
+
+def load_runtimes(export_file: Union[str, Path]) \
+        -> Dict["MetricKey", List[int]]:
+    """
+    Function that reads the runtimes of successful runs back from a JSON or
+    CSV export
+
+    Args:
+        export_file (str | Path): pathname of the export
+
+    Returns:
+        Dict[MetricKey, List[int]]: runtimes (ns) by configuration
+
+    Raises:
+        ValueError: if the file is not a readable export
+    """
+    export_file = Path(export_file)
+    runtimes: Dict["MetricKey", List[int]] = {}
+
+    try:
+        with open(export_file, encoding="utf-8", newline='') as export:
+            if export_file.suffix.lower() == ".csv":
+                for row in csv.DictReader(export):
+                    if row["status"] == "success":
+                        runtimes.setdefault(_to_key(row), []).append(
+                            int(row["runtime_ns"]))
+            else:
+                for entry in json.load(export)["configurations"]:
+                    if entry["runtimes"]:
+                        runtimes.setdefault(_to_key(entry), []).extend(
+                            entry["runtimes"])
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Invalid metrics export {export_file.name}: "
+                         f"{type(error).__name__}: {error}") from error
+
+    return runtimes
+
+
+def _to_key(fields: Dict[str, Any]) -> "MetricKey":
+    """
+    Helper function that rebuilds a MetricKey from exported fields. CSV leaves
+    missing settings as empty strings and numbers as text.
+    """
+    values = {name: fields.get(name) if fields.get(name) != '' else None
+              for name in METRIC_DIMENSIONS}
+    if values["threshold"] is not None:
+        values["threshold"] = int(values["threshold"])
+    values["size"] = int(values["size"] or 0)
+    return MetricKey(**values)
+
+
+def _get(values: List[int], index: int) -> Any:
+    """
+    Helper function for a list entry, or None past its end
+    """
+    return values[index] if index < len(values) else None
@@ -0,0 +1,379 @@
+"""
+operation_trace
+
+This module contains a class that traces the operations of a sort in bounded
+memory, and functions that export traces. Comparisons, exchanges and spans of
+work (partitions, insertion sorts, run detection and merges) are sampled at a
+configurable rate, with random gaps between samples so periodic loops are not
+aliased, and kept in a fixed-size ring buffer of typed arrays. Memory is set
+by the capacity alone, whatever the input size: once the buffer is full, each
+new sample overwrites the oldest.
+
+Traces are exported in one of two formats, picked by the file extension:
+
+- .json: Chrome trace-event format, with one thread per configuration, for
+  chrome://tracing or Perfetto. Operations are instant events and spans are
+  complete events, with their operands as arguments
+- any other extension: compact binary, a header per configuration followed
+  by packed little-endian events, read back with load_traces
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import json
+import struct
+from array import array
+from itertools import chain
+from math import log
+from pathlib import Path
+from random import Random
+from time import perf_counter_ns
+from typing import Dict, Iterator, List, NamedTuple, Union
+
+DEFAULT_CAPACITY = 100_000
+DEFAULT_SAMPLE_RATE = 1.0
+DEFAULT_SEED = 0
+CHROME_EXTENSIONS = (".json",)
+
+# Event kinds, as stored in the trace
+KINDS = ("comparison", "exchange", "partition", "insertion sort",
+         "run detection", "merge")
+COMPARISON, EXCHANGE, PARTITION, INSERTION_SORT, RUN_DETECTION, MERGE = \
+    range(len(KINDS))
+SPAN_KINDS = (PARTITION, INSERTION_SORT, RUN_DETECTION, MERGE)
+
+# Binary format: file header, then per trace a header, its UTF-8 label and
+# its events from oldest to newest
+TRACE_MAGIC = b"QMTRACE\x00"
+TRACE_FORMAT_VERSION = 1
+FILE_HEADER = struct.Struct("<8sHI")
+TRACE_HEADER = struct.Struct("<IdQQI")
+EVENT = struct.Struct("<QQQBqq")
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+class TraceEvent(NamedTuple):
+    """
+    Sampled operation. The sequence is the operation's position among all
+    operations seen, times are ns since the trace started, and the operands
+    depend on the kind: two values for comparisons and exchanges, the low
+    and high indexes for partitions and insertion sorts, the number of runs
+    for run detection and the two run lengths for merges.
+    """
+    sequence: int
+    timestamp: int
+    duration: int
+    kind: str
+    first: int
+    second: int
+
+
+class OperationTrace:
+    """
+    Class for sampling the operations of a sort into a ring buffer
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY,
+                 sample_rate=DEFAULT_SAMPLE_RATE, seed=DEFAULT_SEED) -> None:
+        """
+        Creates instance of OperationTrace. All events are allocated up front.
+
+        Args:
+            capacity (int): number of events kept, the most recent ones
+            sample_rate (float): share of operations sampled, above 0 and up
+                to 1
+            seed (int): seed of the gaps between samples
+
+        Raises:
+            ValueError: if the capacity or sample rate is out of range
+        """
+        if capacity < 1 or not 0 < sample_rate <= 1:
+            raise ValueError("Trace capacity must be >= 1 and the sample "
+                             "rate above 0 and up to 1")
+
+        self._capacity = capacity
+        self._sample_rate = sample_rate
+        self._rng = Random(seed)
+        self._log_skip = log(1 - sample_rate) if sample_rate < 1 else None
+        self._num_seen = 0
+        self._num_sampled = 0
+        self._countdown = self._next_gap()
+        self._origin = perf_counter_ns()
+
+        # One typed array per field, so events hold no Python objects
+        self._sequences = array("Q", bytes(8 * capacity))
+        self._timestamps = array("Q", bytes(8 * capacity))
+        self._durations = array("Q", bytes(8 * capacity))
+        self._kinds = array("B", bytes(capacity))
+        self._firsts = array("q", bytes(8 * capacity))
+        self._seconds = array("q", bytes(8 * capacity))
+
+    def __len__(self) -> int:
+        """
+        Returns the number of events held in the buffer
+        """
+        return min(self._num_sampled, self._capacity)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the trace
+        """
+        return f"{self._num_sampled} of {self._num_seen} operations sampled " \
+            f"(rate {self._sample_rate:g}), {len(self)} kept"
+
+    def comparison(self, first: int, second: int) -> None:
+        """
+        Method for tracing a comparison of two values
+
+        Args:
+            first (int): value compared
+            second (int): value it is compared against
+        """
+        self._num_seen += 1
+        self._countdown -= 1
+        if not self._countdown:
+            self._record(COMPARISON, perf_counter_ns(), 0, first, second)
+
+    def exchange(self, first: int, second: int) -> None:
+        """
+        Method for tracing an exchange of two values
+
+        Args:
+            first (int): value moved out of place
+            second (int): value moved into its place
+        """
+        self._num_seen += 1
+        self._countdown -= 1
+        if not self._countdown:
+            self._record(EXCHANGE, perf_counter_ns(), 0, first, second)
+
+    def span(self, kind: str, start: int, first: int, second=0) -> None:
+        """
+        Method for tracing a span of work once it has ended. Its sequence is
+        taken at the end, after the operations done within it.
+
+        Args:
+            kind (str): name of one of SPAN_KINDS, such as "partition"
+            start (int): perf_counter_ns() when the span started
+            first (int): first operand of the span
+            second (int): second operand of the span
+        """
+        self._num_seen += 1
+        self._countdown -= 1
+        if not self._countdown:
+            end = perf_counter_ns()
+            self._record(KINDS.index(kind), start, end - start, first,
+                         second)
+
+    def get_num_seen(self) -> int:
+        """
+        Method for retrieving the number of operations traced, sampled or not
+
+        Returns:
+            int: number of operations seen
+        """
+        return self._num_seen
+
+    def get_num_sampled(self) -> int:
+        """
+        Method for retrieving the number of operations sampled, including
+        those since overwritten
+
+        Returns:
+            int: number of operations sampled
+        """
+        return self._num_sampled
+
+    def get_capacity(self) -> int:
+        """
+        Method for retrieving the number of events the buffer holds
+
+        Returns:
+            int: capacity of the ring buffer
+        """
+        return self._capacity
+
+    def get_sample_rate(self) -> float:
+        """
+        Method for retrieving the share of operations sampled
+
+        Returns:
+            float: sample rate
+        """
+        return self._sample_rate
+
+    def get_events(self) -> List["TraceEvent"]:
+        """
+        Method for retrieving the events held, from oldest to newest
+
+        Returns:
+            List[TraceEvent]: events in the buffer
+        """
+        return [TraceEvent(self._sequences[i], self._timestamps[i],
+                           self._durations[i], KINDS[self._kinds[i]],
+                           self._firsts[i], self._seconds[i])
+                for i in self._positions()]
+
+    def to_bytes(self) -> bytes:
+        """
+        Method for packing the events held, from oldest to newest
+
+        Returns:
+            bytes: packed events
+        """
+        return b"".join(
+            EVENT.pack(self._sequences[i], self._timestamps[i],
+                       self._durations[i], self._kinds[i], self._firsts[i],
+                       self._seconds[i])
+            for i in self._positions())
+
+    def _record(self, kind: int, timestamp: int, duration: int, first: int,
+                second: int) -> None:
+        """
+        Helper method for storing a sampled event over the oldest one, then
+        drawing the gap to the next sample
+        """
+        slot = self._num_sampled % self._capacity
+        self._num_sampled += 1
+        self._countdown = self._next_gap()
+
+        self._sequences[slot] = self._num_seen - 1
+        self._timestamps[slot] = max(timestamp - self._origin, 0)
+        self._durations[slot] = duration
+        self._kinds[slot] = kind
+        self._firsts[slot] = min(max(first, INT64_MIN), INT64_MAX)
+        self._seconds[slot] = min(max(second, INT64_MIN), INT64_MAX)
+
+    def _next_gap(self) -> int:
+        """
+        Helper method for the number of operations until the next sample. Gaps
+        are geometric, so every operation is sampled with the sample rate
+        while the generator is only drawn from once per sample.
+        """
+        if self._log_skip is None:
+            return 1
+        return 1 + int(log(1 - self._rng.random()) / self._log_skip)
+
+    def _positions(self) -> Iterator[int]:
+        """
+        Helper method for the buffer slots of the events held, oldest first
+        """
+        if self._num_sampled <= self._capacity:
+            return iter(range(self._num_sampled))
+
+        start = self._num_sampled % self._capacity
+        return chain(range(start, self._capacity), range(start))
+
+
+def write_traces(traces: Dict[str, "OperationTrace"],
+                 output_file: Union[str, Path]) -> int:
+    """
+    Function that exports traces by configuration label, as Chrome trace
+    events for a .json extension and in the binary format otherwise
+
+    Args:
+        traces (Dict[str, OperationTrace]): traces by configuration label
+        output_file (Union[str, Path]): file to which traces are written
+
+    Returns:
+        int: number of events written
+    """
+    if Path(output_file).suffix.lower() in CHROME_EXTENSIONS:
+        with open(output_file, "w", encoding="utf-8") as output:
+            json.dump(to_chrome_trace(traces), output)
+        return sum(map(len, traces.values()))
+
+    with open(output_file, "wb") as output:
+        output.write(FILE_HEADER.pack(TRACE_MAGIC, TRACE_FORMAT_VERSION,
+                                      len(traces)))
+        for label, trace in traces.items():
+            name = label.encode("utf-8")
+            output.write(TRACE_HEADER.pack(
+                len(name), trace.get_sample_rate(), trace.get_num_seen(),
+                trace.get_num_sampled(), len(trace)))
+            output.write(name)
+            output.write(trace.to_bytes())
+
+    return sum(map(len, traces.values()))
+
+
+def to_chrome_trace(traces: Dict[str, "OperationTrace"]) -> Dict:
+    """
+    Function that converts traces to the Chrome trace-event format. Each
+    configuration is a thread of its own, named after its label, and every
+    thread starts at time 0. Times are in microseconds.
+
+    Args:
+        traces (Dict[str, OperationTrace]): traces by configuration label
+
+    Returns:
+        Dict: JSON object of the trace events
+    """
+    events = []
+    for thread, (label, trace) in enumerate(traces.items(), 1):
+        events.append({"name": "thread_name", "ph": "M", "pid": 1,
+                       "tid": thread, "args": {"name": label}})
+
+        for event in trace.get_events():
+            entry = {"name": event.kind, "cat": "sort", "pid": 1,
+                     "tid": thread, "ts": event.timestamp / 1000,
+                     "args": {"sequence": event.sequence,
+                              "first": event.first, "second": event.second}}
+            if KINDS.index(event.kind) in SPAN_KINDS:
+                entry.update(ph="X", dur=event.duration / 1000)
+            else:
+                entry.update(ph="i", s="t")
+            events.append(entry)
+
+    return {"traceEvents": events, "displayTimeUnit": "ns",
+            "otherData": {label: str(trace)
+                          for label, trace in traces.items()}}
+
+
+def load_traces(input_file: Union[str, Path]) \
+        -> Dict[str, List["TraceEvent"]]:
+    """
+    Function that reads back the events of a binary trace export
+
+    Args:
+        input_file (Union[str, Path]): binary trace file
+
+    Returns:
+        Dict[str, List[TraceEvent]]: events by configuration label, oldest
+            first
+
+    Raises:
+        ValueError: if the file is not a binary trace export
+    """
+    with open(input_file, "rb") as trace_file:
+        data = trace_file.read()
+
+    try:
+        magic, version, num_traces = FILE_HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC or version != TRACE_FORMAT_VERSION:
+            raise ValueError(f"Not a version {TRACE_FORMAT_VERSION} trace "
+                             f"export: {input_file}")
+
+        traces = {}
+        offset = FILE_HEADER.size
+        for _ in range(num_traces):
+            name_size, _, _, _, num_events = \
+                TRACE_HEADER.unpack_from(data, offset)
+            offset += TRACE_HEADER.size
+            label = data[offset:offset + name_size].decode("utf-8")
+            offset += name_size
+            events = data[offset:offset + num_events * EVENT.size]
+            offset += num_events * EVENT.size
+            if len(events) != num_events * EVENT.size:
+                raise struct.error("events end early")
+
+            traces[label] = [
+                TraceEvent(sequence, timestamp, duration, KINDS[kind], first,
+                           second)
+                for sequence, timestamp, duration, kind, first, second
+                in EVENT.iter_unpack(events)]
+    except (struct.error, IndexError) as error:
+        raise ValueError(f"Truncated trace export: {input_file}") from error
+
+    return traces
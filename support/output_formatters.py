@@ -7,19 +7,23 @@ outputted to a text file.
 Author: Rani Hinnawi
 Date: 2023-08-08
 """
-from typing import TextIO, List, Tuple, Union
+from io import TextIOWrapper
+from typing import Dict, Optional, TextIO, List, Tuple, Union
+from support.compressed_io import open_output_stream
 
 
 def write_to_output(output_file: TextIO, output_text: List[str]) -> None:
     """
     Helper function for writing to an output file the text from a list of
-    result and formatting strings.
+    result and formatting strings. A .gz, .bz2 or .xz extension compresses
+    the output.
 
     Args:
         output_file (TextIO): file to which the results are written
         output_text (List[str]): list of results
     """
-    with open(output_file, 'w', encoding="utf-8") as output:
+    with TextIOWrapper(open_output_stream(output_file),
+                       encoding="utf-8") as output:
         output.write('\n'.join(output_text))
         output.write("\nDone.")
 
@@ -149,3 +153,336 @@ def format_logs(comparisons: List[Tuple[int, int]],
                                                  chars_per_line - len(prefix)))
 
     return '\n'.join(output_text) + '\n'
+
+
+def format_parse_throughput(num_bytes: int, runtime: int) -> str:
+    """
+    Function that formats the throughput of parsing the input file
+
+    Args:
+        num_bytes (int): size of the parsed input in bytes
+        runtime (int): time spent parsing in ns
+
+    Returns:
+        str: formatted parse throughput in MB/s
+    """
+    seconds = runtime / 1e9
+    throughput = num_bytes / 1e6 / seconds if seconds > 0 else 0.0
+    return f"Parse throughput: {throughput:.2f} MB/s " \
+        f"({num_bytes} bytes in {runtime // 1000}μs)"
+
+
+def format_sort_plan(features: "PresortednessFeatures", plan: "SortPlan",
+                     runtime: int) -> str:
+    """
+    Function that formats the presortedness measurements of the records and
+    the engine the "auto" algorithm chose from them
+
+    Args:
+        features (PresortednessFeatures): measurements of the records
+        plan (SortPlan): chosen engine and settings
+        runtime (int): time spent measuring in ns
+
+    Returns:
+        str: formatted measurements and plan
+    """
+    text = f"Presortedness ({features.sample_size} of {features.size} " \
+        f"records sampled in {runtime // 1000}μs): ~{features.runs} runs, " \
+        f"~{features.descending_runs} descending runs, " \
+        f"{features.inversion_ratio:.1%} inversions, " \
+        f"{features.duplicate_ratio:.1%} duplicates\n"
+
+    if plan.algorithm == "quicksort":
+        return text + f"Plan: Quicksort, {plan.pivot} pivot, insertion " \
+            f"threshold {plan.insertion_threshold} ({plan.reason})"
+
+    return text + f"Plan: Natural Merge Sort ({plan.reason})"
+
+
+def format_records_memory(num_bytes: int, num_records: int) -> str:
+    """
+    Function that formats the memory held by the records being sorted
+
+    Args:
+        num_bytes (int): estimated bytes held by the records
+        num_records (int): number of records
+
+    Returns:
+        str: formatted bytes and bytes per record
+    """
+    return f"Records in memory: {num_bytes} bytes " \
+        f"({num_bytes / max(num_records, 1):.1f} bytes/record)"
+
+
+def format_trace_summary(traces: Dict[str, "OperationTrace"],
+                         trace_output: TextIO) -> str:
+    """
+    Function that formats the operation traces exported, one line per
+    configuration
+
+    Args:
+        traces (Dict[str, OperationTrace]): traces by configuration label
+        trace_output (TextIO): file the traces were exported to
+
+    Returns:
+        str: formatted sampling and buffer use of each trace
+    """
+    lines = [f"\nOperation traces (untimed runs): {trace_output}"]
+    for label, trace in traces.items():
+        lines.append(f"{label}: {trace}, capacity {trace.get_capacity()}")
+
+    return "\n".join(lines)
+
+
+def format_profile_summary(profiles: List["ProfileResult"]) -> str:
+    """
+    Function that formats the profile of each configuration: its .pstats
+    file, the overhead of the profiler and the hot functions
+
+    Args:
+        profiles (List[ProfileResult]): profile per configuration
+
+    Returns:
+        str: formatted profiles
+    """
+    lines = ["\nProfiles (untimed runs, cProfile):"]
+    for profile in profiles:
+        lines.append(f"\n{profile.label}: {profile.path}")
+
+        runtime = profile.runtime / 1000
+        if profile.unprofiled_runtime:
+            unprofiled = profile.unprofiled_runtime / 1000
+            lines.append(f"Profiler overhead: {runtime:.0f} μs profiled vs "
+                         f"{unprofiled:.0f} μs unprofiled median "
+                         f"({runtime / unprofiled - 1:+.1%})")
+        else:
+            lines.append(f"Profiled runtime: {runtime:.0f} μs")
+
+        lines.append(f"{'Calls':>10}  {'Total (s)':>10}  {'Cumul. (s)':>10}"
+                     "  Function")
+        for function in profile.hot_functions:
+            lines.append(f"{function.calls:>10}  {function.total_time:>10.4f}"
+                         f"  {function.cumulative_time:>10.4f}  "
+                         f"{function.function}")
+
+    return "\n".join(lines)
+
+
+def format_metrics_comparison(outcomes: List["ConfigComparison"],
+                              threshold: float) -> str:
+    """
+    Function that formats the comparison of a run against a baseline, one line
+    per configuration, with the regressions counted at the end
+
+    Args:
+        outcomes (List[ConfigComparison]): outcome per configuration
+        threshold (float): change of the median, in percent, that counts
+
+    Returns:
+        str: formatted comparison
+    """
+    from support.format_performance_report import format_metric_key
+
+    write = ["-------Baseline Comparison-------\n"]
+
+    for outcome in outcomes:
+        line = f"{outcome.status.upper():<12}{format_metric_key(outcome.key)}"
+        if outcome.comparison:
+            change = (outcome.current_median / outcome.baseline_median - 1) \
+                if outcome.baseline_median else 0.0
+            line += f": {outcome.baseline_median / 1000:.1f} -> " \
+                f"{outcome.current_median / 1000:.1f}μs ({change:+.1%}), " \
+                f"speedup {outcome.comparison.speedup:.3f} CI " \
+                f"[{outcome.comparison.ci_low:.3f}, " \
+                f"{outcome.comparison.ci_high:.3f}]"
+        write.append(line)
+
+    num_regressions = sum(outcome.status == "regression"
+                          for outcome in outcomes)
+    write.append(f"\nRegressions beyond {threshold:g}%: {num_regressions} of "
+                 f"{len(outcomes)} configurations")
+    write.append("NOTE: Speedup is the baseline median over the current "
+                 "median")
+
+    return '\n'.join(write)
+
+
+def format_scaling_report(
+        summary: Dict[str, Tuple[List["ScalingSeries"], List["Crossover"]]],
+        sizes: List[int], budget: Optional[float]) -> str:
+    """
+    Function that formats the results of a scaling suite: a table of median
+    runtimes by size per pattern, the complexity fits of each configuration
+    and the sizes where configurations overtake each other
+
+    Args:
+        summary (Dict[str, Tuple[List[ScalingSeries], List[Crossover]]]):
+            series and crossovers by pattern
+        sizes (List[int]): record counts the suite ran
+        budget (float): seconds a single run could take, or None
+
+    Returns:
+        str: formatted scaling report
+    """
+    from support.format_performance_report import format_metric_key
+
+    # Configurations are numbered once for all patterns
+    numbers: Dict["MetricKey", int] = {}
+    for series, _ in summary.values():
+        for entry in series:
+            numbers.setdefault(entry.key._replace(pattern=None),
+                               len(numbers) + 1)
+
+    def name(key: "MetricKey") -> str:
+        return f"#{numbers[key._replace(pattern=None)]}"
+
+    write = ["-------Scaling Suite-------\n",
+             f"Sizes: {sizes[0]} to {sizes[-1]} records ({len(sizes)} "
+             "sizes)",
+             "Time budget per run: "
+             + (f"{budget:g}s" if budget else "none"),
+             "\nConfigurations:"]
+    write.extend(f"{name(key)} {format_metric_key(key, with_size=False)}"
+                 for key in numbers)
+
+    for pattern, (series, crossovers) in summary.items():
+        write.append(f"\n-----{pattern}:")
+        write.append(f"{'Size':>10}" + ''.join(f"{name(entry.key):>12}"
+                                              for entry in series))
+        for size in sizes:
+            cells = [f"{entry.runtimes[size] / 1000:>12.1f}"
+                     if size in entry.runtimes else f"{'-':>12}"
+                     for entry in series]
+            write.append(f"{size:>10}" + ''.join(cells))
+
+        write.append("Fits:")
+        for entry in series:
+            line = f"{name(entry.key)} runtime " \
+                f"{_format_fit(entry.runtime_fit)}, comparisons " + \
+                (_format_fit(entry.comparison_fit) if entry.comparisons
+                 else "not counted")
+            if entry.aborted:
+                line += f", aborted at {entry.aborted[0]} records " \
+                    f"({entry.aborted[1]})"
+            write.append(line)
+
+        write.append("Crossovers:" if crossovers else "Crossovers: none")
+        write.extend(f"{name(crossover.faster_above)} overtakes "
+                     f"{name(crossover.faster_below)} at "
+                     f"~{crossover.size:.0f} records"
+                     for crossover in crossovers)
+
+    write.append("\nNOTE: Runtimes are medians in microseconds (μs). Fits "
+                 "are over the sizes with completed runs")
+    return '\n'.join(write)
+
+
+def format_external_stats(external_sort: "ExternalMergeSort",
+                          memory_budget: int, sorted_output: str) -> str:
+    """
+    Function that formats the spill and merge metrics of an external sort
+
+    Args:
+        external_sort (ExternalMergeSort): finished external sort
+        memory_budget (int): bytes of records held in memory at once
+        sorted_output (str): file where the sorted records were written
+
+    Returns:
+        str: formatted external sort metrics
+    """
+    output_text = [
+        f"\nMemory budget: {memory_budget} bytes "
+        f"({external_sort.get_run_length()} records per run)",
+        f"Records sorted: {external_sort.get_num_records()}",
+        f"Spill files: {external_sort.get_num_spills()}",
+        f"Bytes spilled: {external_sort.get_bytes_spilled()}",
+        f"Merge fan-in: {external_sort.get_merge_fan_in()}",
+        f"Merge passes: {external_sort.get_num_merge_passes()}",
+        f"Comparisons: {external_sort.get_num_comparisons()}",
+        f"Exchanges: {external_sort.get_num_exchanges()}",
+        f"Sorted output: {sorted_output}"]
+
+    return '\n'.join(output_text) + '\n'
+
+
+def format_decompression(compression: str, compressed_bytes: int,
+                         decompressed_bytes: int, runtime: int) -> str:
+    """
+    Function that formats the time spent decompressing the input file
+
+    Args:
+        compression (str): compression format of the input
+        compressed_bytes (int): size of the input file in bytes
+        decompressed_bytes (int): size of the decompressed input in bytes
+        runtime (int): time spent decompressing in ns
+
+    Returns:
+        str: formatted decompression metrics
+    """
+    return f"Decompression ({compression}): {compressed_bytes} -> " \
+        f"{decompressed_bytes} bytes in {runtime // 1000}μs"
+
+
+def format_batch_summary(results: List[Tuple[str, "Performance"]],
+                         failures: Dict[str, str]) -> str:
+    """
+    Function that aggregates the runtimes logged for every file of a batch by
+    configuration, input pattern and size, with the minimum, median and
+    maximum per group. Configurations are never pooled together, since their
+    runtimes can differ by orders of magnitude.
+
+    Args:
+        results (List[Tuple[str, Performance]]): input pattern and metrics of
+            each file that ran
+        failures (Dict[str, str]): error message by name of each failed file
+
+    Returns:
+        str: formatted batch summary
+    """
+    from support.format_performance_report import format_metric_key
+    from support.performance import METRIC_DIMENSIONS, MetricKey
+
+    groups: Dict["MetricKey", List[int]] = {}
+    num_files: Dict["MetricKey", int] = {}
+
+    for pattern, performance in results:
+        for group, runtimes in performance.aggregate(
+                METRIC_DIMENSIONS).items():
+            key = MetricKey(*group)
+            key = key._replace(pattern=key.pattern or pattern)
+            groups.setdefault(key, []).extend(runtimes)
+            num_files[key] = num_files.get(key, 0) + 1
+
+    write = ["-------Batch Performance Summary-------\n",
+             f"Files run: {len(results)}",
+             f"Files with errors: {len(failures)}\n",
+             f"{'Pattern':<12}{'Size':>10}{'Files':>7}{'Runs':>6}"
+             f"{'Min':>12}{'Median':>12}{'Max':>12}  Configuration"]
+
+    # Configurations keep their run order within each pattern and size
+    for key in sorted(groups, key=lambda key: (key.pattern, key.size)):
+        runtimes = sorted(groups[key])
+        median = runtimes[len(runtimes) // 2]
+        name = format_metric_key(key._replace(pattern=None), with_size=False)
+        write.append(f"{key.pattern:<12}{key.size:>10}{num_files[key]:>7}"
+                     f"{len(runtimes):>6}{runtimes[0] // 1000:>12}"
+                     f"{median // 1000:>12}{runtimes[-1] // 1000:>12}  "
+                     f"{name}")
+
+    if failures:
+        write.append("\nFiles with errors:")
+        write.extend(f"- {name}: {error}"
+                     for name, error in sorted(failures.items()))
+
+    write.append("\nNOTE: Runtimes measured in microseconds (μs)")
+    return '\n'.join(write)
+
+
+def _format_fit(fit: Optional["ComplexityFit"]) -> str:
+    """
+    Helper function that formats a complexity fit, or notes it is missing
+    """
+    if fit is None:
+        return "too few sizes to fit"
+    return f"~n^{fit.exponent:.2f} (best fit {fit.model}, " \
+        f"{fit.model_errors[fit.model]:.1%} error)"
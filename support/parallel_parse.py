@@ -0,0 +1,245 @@
+"""
+parallel_parse
+
+This module contains a parallel record parser for large text input files. The
+file is split into byte ranges aligned on whitespace boundaries and each range
+is parsed by a worker process through a memory map. Workers first count their
+records, then write them into their slice of a shared-memory int64 buffer at an
+offset computed from a prefix sum of the per-range counts.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import mmap
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing import resource_tracker, shared_memory
+from os import cpu_count, path
+from typing import List, Optional, Tuple, Union
+from support.fast_parse import iter_token_blocks, convert_tokens, \
+    parse_all_records_fast, BLOCK_SIZE, RECORD_TYPECODE
+
+RECORD_SIZE = 8
+MIN_CHUNK_SIZE = 1 << 20
+
+
+class _RangeReader:
+    """
+    Minimal binary stream over one byte range of a memory map, so the range
+    can be tokenized block by block like a regular file.
+    """
+
+    def __init__(self, mapped: mmap.mmap, start: int, end: int) -> None:
+        self._mapped = mapped
+        self._position = start
+        self._end = end
+
+    def read(self, size: int) -> bytes:
+        """
+        Reads up to size bytes without going past the end of the range
+
+        Args:
+            size (int): maximum number of bytes to read
+
+        Returns:
+            bytes: bytes read, empty at the end of the range
+        """
+        stop = min(self._position + size, self._end)
+        data = self._mapped[self._position:stop]
+        self._position = stop
+        return data
+
+
+def find_chunk_bounds(mapped: mmap.mmap, num_chunks: int) \
+        -> List[Tuple[int, int]]:
+    """
+    Function that splits a memory map into byte ranges of roughly equal size.
+    Each split point is moved forward to the next whitespace byte, so no
+    record is cut in two.
+
+    Args:
+        mapped (mmap.mmap): memory-mapped input file
+        num_chunks (int): requested number of ranges
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) byte offsets of each range
+    """
+    size = len(mapped)
+    bounds = [0]
+
+    for i in range(1, num_chunks):
+        split = max(size * i // num_chunks, bounds[-1])
+        while split < size and not mapped[split:split + 1].isspace():
+            split += 1
+
+        if split > bounds[-1]:
+            bounds.append(split)
+
+    if bounds[-1] < size:
+        bounds.append(size)
+
+    return list(zip(bounds, bounds[1:]))
+
+
+def _locate_error(mapped: mmap.mmap, start: int, end: int,
+                  chunk_index: int) -> str:
+    """
+    Helper function for finding the first invalid record in a byte range and
+    the line of the file it is on. Only runs once a range is known to fail.
+
+    Args:
+        mapped (mmap.mmap): memory-mapped input file
+        start (int): first byte of the range
+        end (int): byte after the end of the range
+        chunk_index (int): index of the range
+
+    Returns:
+        str: error message with the chunk and line of the invalid record
+    """
+    # Newlines before the range are counted in bounded blocks, so the file is
+    # never copied whole
+    line_number = 1 + sum(
+        mapped[offset:min(offset + BLOCK_SIZE, start)].count(b"\n")
+        for offset in range(0, start, BLOCK_SIZE))
+
+    position = start
+    while position < end:
+        newline = mapped.find(b"\n", position, end)
+        line_end = end if newline == -1 else newline
+        for token in mapped[position:line_end].split():
+            try:
+                int(token.decode("utf-8", errors="replace"))
+            except ValueError as ve:
+                return f"{ve.args[0]} (chunk {chunk_index}, line " \
+                    f"{line_number})"
+
+        line_number += 1
+        position = line_end + 1
+
+    return f"invalid record (chunk {chunk_index})"
+
+
+def _count_chunk(job: Tuple[str, int, int]) -> int:
+    """
+    Worker function that counts the whitespace-separated records in a range
+
+    Args:
+        job (Tuple[str, int, int]): input file, start and end of the range
+
+    Returns:
+        int: number of records in the range
+    """
+    input_file, start, end = job
+    count = 0
+
+    with open(input_file, 'rb') as records, \
+            mmap.mmap(records.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for tokens in iter_token_blocks(_RangeReader(mapped, start, end)):
+            count += len(tokens)
+
+    return count
+
+
+def _parse_chunk(job: Tuple[str, int, int, int, str, int]) -> Optional[str]:
+    """
+    Worker function that parses a range and writes its records into the
+    shared buffer, starting at the range's offset
+
+    Args:
+        job (Tuple[str, int, int, int, str, int]): input file, start and end
+            of the range, chunk index, shared memory name and record offset
+
+    Returns:
+        Optional[str]: error message if a record is invalid, otherwise None
+    """
+    input_file, start, end, chunk_index, shm_name, offset = job
+    shared = shared_memory.SharedMemory(name=shm_name)
+    buffer = shared.buf.cast(RECORD_TYPECODE)
+    error = None
+
+    try:
+        with open(input_file, 'rb') as records, \
+                mmap.mmap(records.fileno(), 0,
+                          access=mmap.ACCESS_READ) as mapped:
+            reader = _RangeReader(mapped, start, end)
+            for tokens in iter_token_blocks(reader):
+                try:
+                    block_records = convert_tokens(tokens)
+                except ValueError:
+                    error = _locate_error(mapped, start, end, chunk_index)
+                    break
+                except OverflowError as oe:
+                    error = f"{oe.args[0]} (chunk {chunk_index})"
+                    break
+
+                buffer[offset:offset + len(block_records)] = block_records
+                offset += len(block_records)
+    finally:
+        buffer.release()
+        shared.close()
+
+    return error
+
+
+def parse_all_records_parallel(input_file: str,
+                               workers: Optional[int] = None,
+                               min_chunk_size=MIN_CHUNK_SIZE) \
+        -> Tuple[Union[array, List[str]], bool]:
+    """
+    Parallel alternative to parse_all_records. Small files are parsed by the
+    single-process fast parser, since starting workers would cost more than it
+    saves. Error semantics match parse_all_records, with the chunk and line of
+    the invalid record added to the message.
+
+    Args:
+        input_file (str): text file with string items to sort
+        workers (int): number of worker processes, or None for all cores
+        min_chunk_size (int): smallest byte range given to a worker
+
+    Returns:
+        array: typed array of all records
+        List[str]: error message if a record is invalid
+        bool: True if ValueError raised else False
+    """
+    workers = workers or cpu_count() or 1
+    file_size = path.getsize(input_file)
+    num_chunks = min(workers, file_size // max(min_chunk_size, 1))
+
+    if num_chunks <= 1:
+        return parse_all_records_fast(input_file)
+
+    with open(input_file, 'rb') as records, \
+            mmap.mmap(records.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        bounds = find_chunk_bounds(mapped, num_chunks)
+
+    # Workers must share the parent's resource tracker, or each would report
+    # the shared buffer as leaked when it exits
+    resource_tracker.ensure_running()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # First pass: count records per range, then prefix sum the offsets
+        counts = list(pool.map(_count_chunk, [(str(input_file), start, end)
+                                              for start, end in bounds]))
+        offsets = [0] + list(accumulate(counts))
+        total = offsets[-1]
+
+        # Second pass: parse each range into its slice of the shared buffer
+        shared = shared_memory.SharedMemory(
+            create=True, size=max(total * RECORD_SIZE, 1))
+        try:
+            jobs = [(str(input_file), start, end, i, shared.name, offsets[i])
+                    for i, (start, end) in enumerate(bounds)]
+            errors = [error for error in pool.map(_parse_chunk, jobs)
+                      if error]
+
+            if errors:
+                return [errors[0]], True
+
+            all_records = array(RECORD_TYPECODE)
+            all_records.frombytes(shared.buf[:total * RECORD_SIZE])
+        finally:
+            shared.close()
+            shared.unlink()
+
+    return all_records, False
@@ -5,14 +5,65 @@ This module holds a class that tracks metrics and performance. It allows for
 maintaining a timer for runtime, storing size of a process (user's discretion),
 and tracking previous successes' and errors' sizes and runtimes. Methods that 
 would otherwise return None instead return current instance to allow for method
-chaining.
+chaining. Timing uses a monotonic high-resolution clock, so runtimes are not
+skewed by system clock adjustments.
+
+Every logged run is also recorded under a MetricKey of the configuration that
+was run (algorithm, pivot, threshold, representation, input pattern and size),
+with its runtime and counters attached, and can be aggregated over any subset
+of those dimensions.
+
+With memory tracking on, each timed region also traces allocations with
+tracemalloc, recording the peak and retained bytes above what was allocated
+before the run, along with the process RSS high-water mark. Tracing can be
+started ahead of the timer, so the data structures an engine builds before
+sorting are counted without being timed. Tracing slows
+runs down considerably, so it is off by default.
+
+With phase timing on, named phases of a run (parse, sort, format, ...) can be
+timed with nested phase() blocks, and the sorting engines log the time of
+their inner phases under the current one. Time and call counts are summed by
+the path of phase names over all runs.
 
 Author: Rani Hinnawi
 Date: 2023-07-25
 """
-from sys import stderr
-from time import time_ns
-from typing import Dict, List
+from contextlib import contextmanager, nullcontext
+from sys import platform, stderr
+from time import perf_counter_ns
+from typing import Any, ContextManager, Dict, Iterator, List, NamedTuple, \
+    Optional, Sequence, Tuple
+
+METRIC_DIMENSIONS = ("algorithm", "pivot", "threshold", "representation",
+                     "pattern", "size")
+
+
+class MetricKey(NamedTuple):
+    """
+    Configuration a run was logged under. Settings that do not apply to a run,
+    such as the pivot option of Natural Merge Sort, are None.
+    """
+    algorithm: Optional[str] = None
+    pivot: Optional[str] = None
+    threshold: Optional[int] = None
+    representation: Optional[str] = None
+    pattern: Optional[str] = None
+    size: int = 0
+
+
+class MetricRecord(NamedTuple):
+    """
+    Metrics of all runs logged under one MetricKey, one list entry per run.
+    Counters are only kept for runs that reported them, and memory in bytes
+    only for runs that traced it.
+    """
+    runtimes: List[int]
+    error_runtimes: List[int]
+    comparisons: List[int]
+    exchanges: List[int]
+    peak_memory: List[int]
+    current_memory: List[int]
+    max_rss: List[int]
 
 
 class Performance:
@@ -26,8 +77,8 @@ class Performance:
         and size of input. It also logs previous runs. Times are all in ns
         """
         self._size = 0
-        self._start_time = time_ns()
-        self._stop_time = time_ns()
+        self._start_time = perf_counter_ns()
+        self._stop_time = perf_counter_ns()
 
         # Log previous successes and failures. Track number of each
         self._successes: Dict[int, List[int]] = {}
@@ -36,6 +87,24 @@ class Performance:
         self._num_successes = 0
         self._num_errors = 0
 
+        # Configuration of the runs being logged and the metrics of each one
+        self._config: Dict[str, Any] = {}
+        self._records: Dict["MetricKey", "MetricRecord"] = {}
+
+        # Memory of the last timed region in bytes, if it was traced
+        self._trace_memory = False
+        self._tracing_memory = False
+        self._started_tracing = False
+        self._memory_baseline = 0
+        self._peak_memory: Optional[int] = None
+        self._current_memory: Optional[int] = None
+        self._max_rss: Optional[int] = None
+
+        # Total time (ns) and calls of each phase by its path of phase names
+        self._time_phases = False
+        self._phase_stack: List[str] = []
+        self._phases: Dict[Tuple[str, ...], List[int]] = {}
+
     def __str__(self):
         """
         Returns a string representation of the Performance class
@@ -60,6 +129,41 @@ class Performance:
         self._size = max(size, 0)
         return self
 
+    def set_config(self, algorithm: Optional[str] = None,
+                   pivot: Optional[str] = None,
+                   threshold: Optional[int] = None,
+                   representation: Optional[str] = None,
+                   pattern: Optional[str] = None) -> 'Performance':
+        """
+        Setter method for the configuration later runs are logged under.
+        Together with the size it forms the MetricKey of each run.
+
+        Args:
+            algorithm (str): sorting algorithm being run
+            pivot (str): Quicksort pivot option, or None if not applicable
+            threshold (int): Quicksort insertion sort threshold, or None if
+                not applicable
+            representation (str): record representation being sorted
+            pattern (str): input pattern of the records (asc, rev, ran, ...)
+
+        Returns:
+            "Performance": Current instance of Performance class with updated
+                configuration
+        """
+        self._config = {"algorithm": algorithm, "pivot": pivot,
+                        "threshold": threshold,
+                        "representation": representation, "pattern": pattern}
+        return self
+
+    def get_key(self) -> "MetricKey":
+        """
+        Getter method for the MetricKey the next run is logged under
+
+        Returns:
+            MetricKey: current configuration and size
+        """
+        return MetricKey(size=self._size, **self._config)
+
     def get_size(self) -> int:
         """
         Getter method for size attribute
@@ -69,26 +173,242 @@ class Performance:
         """
         return self._size
 
+    def set_memory_tracking(self, enabled=True) -> 'Performance':
+        """
+        Setter method for tracing the memory of later timed regions
+
+        Args:
+            enabled (bool): True if tracing memory with tracemalloc, otherwise
+                False
+
+        Returns:
+            "Performance": Current instance of Performance class with updated
+                memory tracking
+        """
+        self._trace_memory = enabled
+        return self
+
+    def start_memory_tracing(self) -> 'Performance':
+        """
+        Setter method for starting memory tracing ahead of the timer, such as
+        before an engine builds its data structures. Does nothing with memory
+        tracking off. The next stop() reads and ends the tracing.
+
+        Returns:
+            "Performance": Current instance of Performance class with memory
+                tracing started
+        """
+        if self._trace_memory and not self._tracing_memory:
+            import tracemalloc
+
+            # Memory is measured above what is already traced, so a caller
+            # that is tracing memory itself is left undisturbed
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            self._tracing_memory = True
+
+        return self
+
     def start(self) -> 'Performance':
         """
-        Setter method for start time. Essentially starts a timer in nanoseconds
+        Setter method for start time. Essentially starts a timer in
+        nanoseconds. With memory tracking on, memory tracing starts before the
+        timer, unless it was already started with start_memory_tracing().
 
         Returns: 
             "Performance": Current instance of Performance class with updated 
                 _start_time attribute
         """
-        self._start_time = time_ns()
+        self.start_memory_tracing()
+        self._start_time = perf_counter_ns()
         return self
 
     def stop(self) -> 'Performance':
         """
-        Setter method for stop time. Essentially ends a timer in nanoseconds
+        Setter method for stop time. Essentially ends a timer in nanoseconds.
+        With memory tracking on, memory is read after the timer stops.
 
         Returns: 
             "Performance": Current instance of Performance class with updated 
                 _stop_time attribute
         """
-        self._stop_time = time_ns()
+        self._stop_time = perf_counter_ns()
+
+        if self._tracing_memory:
+            import tracemalloc
+
+            self._tracing_memory = False
+            current, peak = tracemalloc.get_traced_memory()
+            self._current_memory = max(current - self._memory_baseline, 0)
+            self._peak_memory = max(peak - self._memory_baseline, 0)
+            self._max_rss = _get_max_rss()
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+        return self
+
+    def set_phase_timing(self, enabled=True) -> 'Performance':
+        """
+        Setter method for timing the phases of later runs
+
+        Args:
+            enabled (bool): True if timing phases, otherwise False
+
+        Returns:
+            "Performance": Current instance of Performance class with updated
+                phase timing
+        """
+        self._time_phases = enabled
+        return self
+
+    def is_timing_phases(self) -> bool:
+        """
+        Getter method for whether phases are being timed
+
+        Returns:
+            bool: True if phase timing is on, otherwise False
+        """
+        return self._time_phases
+
+    def phase(self, name: str) -> ContextManager['Performance']:
+        """
+        Method that times the block it wraps as a phase nested in the current
+        one. Does nothing unless phase timing is on.
+
+        Args:
+            name (str): name of the phase
+
+        Returns:
+            ContextManager[Performance]: context manager yielding current
+                instance
+        """
+        # Timed regions wrap phases too, so the disabled case stays cheap
+        if not self._time_phases:
+            return nullcontext(self)
+        return self._time_phase(name)
+
+    @contextmanager
+    def _time_phase(self, name: str) -> Iterator['Performance']:
+        """
+        Helper method that times a phase while phase timing is on
+        """
+        # The path is registered on entry, so phases are listed in the order
+        # they began, parents before children
+        self._phase_stack.append(name)
+        self._phases.setdefault(tuple(self._phase_stack), [0, 0])
+        start = perf_counter_ns()
+        try:
+            yield self
+        finally:
+            runtime = perf_counter_ns() - start
+            self._phase_stack.pop()
+            self.log_phase(name, runtime)
+
+    def log_phase(self, name: str, runtime: int, calls=1) -> 'Performance':
+        """
+        Method for adding time spent in a phase nested in the current one,
+        such as a sorting engine's partitioning. Does nothing unless phase
+        timing is on.
+
+        Args:
+            name (str): name of the phase
+            runtime (int): time spent in the phase in ns
+            calls (int): number of times the phase ran
+
+        Returns:
+            "Performance": Current instance of Performance class with the
+                phase time added
+        """
+        if self._time_phases:
+            totals = self._phases.setdefault(
+                tuple(self._phase_stack) + (name,), [0, 0])
+            totals[0] += runtime
+            totals[1] += calls
+        return self
+
+    def get_phases(self) -> Dict[Tuple[str, ...], List[int]]:
+        """
+        Getter method for the time of every phase, summed over all runs
+
+        Returns:
+            Dict[Tuple[str, ...], List[int]]: total time in ns and number of
+                calls by path of phase names, parents before children
+        """
+        return self._phases
+
+    def get_peak_memory(self) -> Optional[int]:
+        """
+        Getter method for the peak traced bytes of the last timed region,
+        above what was allocated before it
+
+        Returns:
+            int: peak bytes, or None if memory was not traced
+        """
+        return self._peak_memory
+
+    def get_current_memory(self) -> Optional[int]:
+        """
+        Getter method for the traced bytes still allocated at the end of the
+        last timed region, above what was allocated before it
+
+        Returns:
+            int: retained bytes, or None if memory was not traced
+        """
+        return self._current_memory
+
+    def get_max_rss(self) -> Optional[int]:
+        """
+        Getter method for the process RSS high-water mark at the end of the
+        last timed region
+
+        Returns:
+            int: RSS high-water mark in bytes, or None if memory was not
+                traced or the platform does not report it
+        """
+        return self._max_rss
+
+    def log_memory(self, key: Optional["MetricKey"] = None,
+                   peak_memory: Optional[int] = None,
+                   current_memory: Optional[int] = None,
+                   max_rss: Optional[int] = None) -> 'Performance':
+        """
+        Method for logging memory under a configuration. By default the memory
+        of the last timed region is logged under the current configuration.
+        Memory traced by another Performance object, such as one used for an
+        untimed run, can be logged by passing its key and readings.
+
+        Args:
+            key (MetricKey): configuration to log under, or None for the
+                current one
+            peak_memory (int): peak bytes, or None for the last timed region
+            current_memory (int): retained bytes, or None for the last timed
+                region
+            max_rss (int): RSS high-water mark in bytes, or None for the last
+                timed region
+
+        Returns:
+            "Performance": Current instance of Performance class with newly
+                logged memory
+        """
+        peak_memory = self._peak_memory if peak_memory is None \
+            else peak_memory
+        if peak_memory is None:
+            return self
+
+        record = self._get_record(key)
+        record.peak_memory.append(peak_memory)
+        record.current_memory.append(
+            self._current_memory if current_memory is None
+            else current_memory)
+
+        max_rss = self._max_rss if max_rss is None else max_rss
+        if max_rss is not None:
+            record.max_rss.append(max_rss)
+
         return self
 
     def get_runtime(self) -> int:
@@ -121,13 +441,16 @@ class Performance:
         """
         return f"Size: {self._size}, Runtime: {self.get_runtime_micro_sec()}μs"
 
-    def log_success(self, micro_sec=False) -> 'Performance':
+    def log_success(self, micro_sec=False, comparisons: Optional[int] = None,
+                    exchanges: Optional[int] = None) -> 'Performance':
         """
         Method for logging the current metrics stored as a success
 
         Args:
             micro_sec (bool): True if saving runtime in microseconds, otherwise
                 False
+            comparisons (int): comparisons made by the run, if counted
+            exchanges (int): exchanges made by the run, if counted
 
         Returns:
             "Performance": Current instance of Performance class with newly 
@@ -145,6 +468,13 @@ class Performance:
         # Update number of success
         self._num_successes += 1
 
+        record = self._get_record()
+        record.runtimes.append(new_log)
+        if comparisons is not None:
+            record.comparisons.append(comparisons)
+        if exchanges is not None:
+            record.exchanges.append(exchanges)
+
         return self
 
     def log_error(self, micro_sec=False) -> 'Performance':
@@ -170,6 +500,7 @@ class Performance:
 
         # Update number of errors
         self._num_errors += 1
+        self._get_record().error_runtimes.append(new_log)
 
         return self
 
@@ -195,6 +526,72 @@ class Performance:
         """
         return self._errors
 
+    def get_records(self) -> Dict["MetricKey", "MetricRecord"]:
+        """
+        Getter method for the metrics of every configuration that was logged
+
+        Returns:
+            Dict[MetricKey, MetricRecord]: metrics by configuration
+        """
+        return self._records
+
+    def aggregate(self, by: Sequence[str] = ("size",), errors=False,
+                  **filters: Any) -> Dict[Tuple, List[int]]:
+        """
+        Method that pools the logged runtimes of all configurations that share
+        values for the given dimensions, such as ("algorithm", "size")
+
+        Args:
+            by (Sequence[str]): dimensions of METRIC_DIMENSIONS to group by
+            errors (bool): True if pooling failed runs, otherwise False
+            filters (Any): dimension values runs must have to be included,
+                such as algorithm="quicksort"
+
+        Returns:
+            Dict[Tuple, List[int]]: runtimes by the values of the dimensions,
+                in the order given
+
+        Raises:
+            ValueError: if a dimension is not one of METRIC_DIMENSIONS
+        """
+        unknown = (set(by) | set(filters)) - set(METRIC_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown metric dimensions: "
+                             f"{', '.join(sorted(unknown))}. Must be among "
+                             f"{', '.join(METRIC_DIMENSIONS)}")
+
+        groups: Dict[Tuple, List[int]] = {}
+        for key, record in self._records.items():
+            if any(getattr(key, name) != value
+                   for name, value in filters.items()):
+                continue
+
+            runtimes = record.error_runtimes if errors else record.runtimes
+            if runtimes:
+                group = tuple(getattr(key, name) for name in by)
+                groups.setdefault(group, []).extend(runtimes)
+
+        return groups
+
+    def get_summaries(self, by: Sequence[str] = ("size",), errors=False,
+                      **filters: Any) -> Dict[Tuple, "RuntimeSummary"]:
+        """
+        Method that summarizes the distribution of the logged runtimes for
+        each group of aggregate
+
+        Args:
+            by (Sequence[str]): dimensions of METRIC_DIMENSIONS to group by
+            errors (bool): True if summarizing failed runs, otherwise False
+            filters (Any): dimension values runs must have to be included
+
+        Returns:
+            Dict[Tuple, RuntimeSummary]: runtime summary by group
+        """
+        from support.runtime_stats import summarize_runtimes
+
+        return {group: summarize_runtimes(runtimes) for group, runtimes
+                in self.aggregate(by, errors, **filters).items()}
+
     def get_num_successes(self) -> int:
         """
         Getter method that returns the total number of successful runs logge
@@ -212,3 +609,28 @@ class Performance:
             int: Number of errors logged
         """
         return self._num_errors
+
+    def _get_record(self, key: Optional["MetricKey"] = None) \
+            -> "MetricRecord":
+        """
+        Helper method for the record of a configuration, by default the
+        current one, created on its first logged run
+        """
+        return self._records.setdefault(
+            key or self.get_key(), MetricRecord([], [], [], [], [], [], []))
+
+
+def _get_max_rss() -> Optional[int]:
+    """
+    Helper function for the RSS high-water mark of this process in bytes, or
+    None where the resource module is unavailable (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes and macOS reports bytes
+    return max_rss if platform == "darwin" else max_rss * 1024
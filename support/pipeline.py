@@ -0,0 +1,165 @@
+"""
+pipeline
+
+This module contains helpers for running QuickMerge inside a Unix pipeline.
+The path "-" stands for stdin when reading and stdout when writing. Input from
+a pipe is prefetched by a background thread, so records keep arriving while
+earlier chunks are being sorted.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import io
+import sys
+from typing import BinaryIO, Union
+from pathlib import Path
+
+STDIO = "-"
+PREFETCH_BLOCK_SIZE = 1 << 20
+PREFETCH_DEPTH = 8
+
+
+def is_stdio(file: Union[str, Path, None]) -> bool:
+    """
+    Function that checks whether a file path stands for stdin or stdout
+
+    Args:
+        file (Union[str, Path, None]): file path given by the user
+
+    Returns:
+        bool: True if the path is "-", otherwise False
+    """
+    return file is not None and str(file) == STDIO
+
+
+class PrefetchReader:
+    """
+    Binary stream that reads another stream on a background thread into a
+    bounded queue of blocks. The bound applies backpressure to the producer
+    once the consumer falls behind.
+    """
+
+    def __init__(self, stream: BinaryIO, block_size=PREFETCH_BLOCK_SIZE,
+                 depth=PREFETCH_DEPTH) -> None:
+        """
+        Creates instance of PrefetchReader and starts reading the stream
+
+        Args:
+            stream (BinaryIO): stream being prefetched, usually stdin
+            block_size (int): largest number of bytes read at once
+            depth (int): number of blocks buffered ahead of the consumer
+        """
+        # Only pipelines need threads, so they are imported here rather than
+        # by every module that checks for "-"
+        from queue import Queue
+        from threading import Thread
+
+        self._stream = stream
+        self._block_size = block_size
+        self._blocks: Queue = Queue(maxsize=depth)
+        self._done = False
+        self._pending = b""
+        self._bytes_read = 0
+        self._thread = Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    def _prefetch(self) -> None:
+        """
+        Background loop that moves blocks from the stream to the queue as soon
+        as they arrive. An empty block marks the end of the stream.
+        """
+        read = getattr(self._stream, "read1", self._stream.read)
+        while True:
+            block = read(self._block_size)
+            self._blocks.put(block)
+            if not block:
+                break
+
+    def read(self, size=-1) -> bytes:
+        """
+        Returns up to size bytes of the current prefetched block, waiting for
+        one if none is ready. Like a raw file read, it may return fewer bytes
+        than asked for, and the rest of the block is kept for the next read.
+
+        Args:
+            size (int): largest number of bytes returned, or -1 to read up to
+                the end of the stream
+
+        Returns:
+            bytes: next bytes, empty at the end of the stream
+        """
+        if size < 0:
+            return b"".join(iter(lambda: self.read(self._block_size), b""))
+
+        if not self._pending and not self._done:
+            self._pending = self._blocks.get()
+            self._done = not self._pending
+
+        data, self._pending = self._pending[:size], self._pending[size:]
+        self._bytes_read += len(data)
+        return data
+
+    def close(self) -> None:
+        """
+        Stops consuming the stream. The stream itself belongs to the caller.
+        """
+        self._done = True
+        self._pending = b""
+
+    def __enter__(self) -> "PrefetchReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_bytes_read(self) -> int:
+        """
+        Getter method for the number of bytes consumed so far
+
+        Returns:
+            int: bytes consumed
+        """
+        return self._bytes_read
+
+
+def open_stdin() -> "PrefetchReader":
+    """
+    Function that opens stdin for incremental binary reads
+
+    Returns:
+        PrefetchReader: prefetching stream over stdin
+    """
+    return PrefetchReader(sys.stdin.buffer)
+
+
+def open_stdout() -> BinaryIO:
+    """
+    Function that returns stdout as a binary stream. Closing it only flushes,
+    so later output to stdout still works.
+
+    Returns:
+        BinaryIO: binary stream over stdout
+    """
+    return _UnclosableStream(sys.stdout.buffer)
+
+
+class _UnclosableStream(io.BufferedIOBase):
+    """
+    Wrapper that turns close into flush, for streams owned by the process
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__()
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        return self._stream.write(data)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def close(self) -> None:
+        self._stream.flush()
@@ -0,0 +1,150 @@
+"""
+profiling
+
+This module contains functions that profile one run of a configuration with
+cProfile, save the statistics as a .pstats file and pick out the hot
+functions for the report. The overhead of the profiler is the slowdown of the
+profiled run against the median of the unprofiled runs of the same
+configuration, both timed by the sort itself.
+
+Saved statistics load with pstats, or with viewers such as snakeviz:
+python -m pstats profiles/natural_merge_sort-parsed.pstats
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import cProfile
+import pstats
+import re
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, \
+    Tuple, Union
+from support.runtime_stats import percentile
+
+DEFAULT_TOP = 10
+PROFILE_EXTENSION = ".pstats"
+
+
+class HotFunction(NamedTuple):
+    """
+    Profiled function with its calls and times in seconds. Total time is
+    spent in the function itself and cumulative time includes its callees.
+    """
+    function: str
+    calls: int
+    total_time: float
+    cumulative_time: float
+
+
+class ProfileResult(NamedTuple):
+    """
+    Profile of one configuration. Runtimes are in ns, the unprofiled one
+    being the median of the measured runs, or None without any.
+    """
+    label: str
+    path: "Path"
+    runtime: int
+    unprofiled_runtime: Optional[float]
+    hot_functions: List["HotFunction"]
+
+
+def profiled(function: Callable[..., Any]) \
+        -> Tuple[Callable[..., Any], "cProfile.Profile"]:
+    """
+    Function that wraps a function so every call to it runs under cProfile
+
+    Args:
+        function (Callable): function being profiled
+
+    Returns:
+        Callable: wrapped function, taking the same arguments
+        cProfile.Profile: profile collected over all calls
+    """
+    profiler = cProfile.Profile()
+
+    def call(*args: Any) -> Any:
+        return profiler.runcall(function, *args)
+
+    return call, profiler
+
+
+def save_profile(profiler: "cProfile.Profile", directory: Union[str, Path],
+                 label: str) -> "Path":
+    """
+    Function that writes a profile as a .pstats file named after its
+    configuration label
+
+    Args:
+        profiler (cProfile.Profile): collected profile
+        directory (Union[str, Path]): existing directory for the file
+        label (str): configuration label, such as "natural_merge_sort, list"
+
+    Returns:
+        Path: written file
+    """
+    name = re.sub(r"[^A-Za-z0-9_]+", "-", label).strip("-")
+    profile_file = Path(directory) / f"{name}{PROFILE_EXTENSION}"
+    profiler.dump_stats(profile_file)
+    return profile_file
+
+
+def summarize_profile(profiler: "cProfile.Profile", label: str,
+                      directory: Union[str, Path], runtime: int,
+                      unprofiled_runtimes: Sequence[int], top=DEFAULT_TOP) \
+        -> "ProfileResult":
+    """
+    Function that saves the profile of a configuration and summarizes it
+    against the unprofiled runs of the same configuration
+
+    Args:
+        profiler (cProfile.Profile): collected profile
+        label (str): configuration label
+        directory (Union[str, Path]): existing directory for the .pstats file
+        runtime (int): runtime of the profiled run in ns
+        unprofiled_runtimes (Sequence[int]): runtimes of the measured runs
+        top (int): number of hot functions kept
+
+    Returns:
+        ProfileResult: saved file, runtimes and hot functions
+    """
+    unprofiled_runtime = percentile(sorted(unprofiled_runtimes), 50) \
+        if unprofiled_runtimes else None
+    return ProfileResult(label, save_profile(profiler, directory, label),
+                         runtime, unprofiled_runtime,
+                         get_hot_functions(profiler, top))
+
+
+def get_hot_functions(profiler: "cProfile.Profile", top=DEFAULT_TOP) \
+        -> List["HotFunction"]:
+    """
+    Function that picks the functions with the most total time in a profile.
+    The profiling call itself is left out.
+
+    Args:
+        profiler (cProfile.Profile): collected profile
+        top (int): number of functions kept
+
+    Returns:
+        List[HotFunction]: hottest functions first
+    """
+    stats = pstats.Stats(profiler)
+    functions = [
+        HotFunction(_function_name(function), calls, total_time,
+                    cumulative_time)
+        for function, (_, calls, total_time, cumulative_time, _)
+        in stats.stats.items()
+        if "_lsprof.Profiler" not in function[2]]
+
+    functions.sort(key=lambda function: function.total_time, reverse=True)
+    return functions[:top]
+
+
+def _function_name(function: Tuple[str, int, str]) -> str:
+    """
+    Helper function that names a profiled function by its file name, line and
+    name, or by name alone for built-ins
+    """
+    file_name, line, name = function
+    if file_name == "~":
+        return name
+    return f"{Path(file_name).name}:{line}({name})"
@@ -0,0 +1,147 @@
+"""
+record_writer
+
+This module holds a class for streaming records to a file in large buffered
+chunks, using either the text format (one record per line) or the packed int64
+binary format. Records are never joined into one large string. Methods that
+would otherwise return None instead return current instance to allow for method
+chaining.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Union
+from support.binary_records import is_binary_file, to_binary_bytes, \
+    RECORD_SIZE, RECORDS_PER_CHUNK
+from support.compressed_io import open_output_stream
+
+
+class RecordWriter:
+    """
+    Class for writing records to a file in buffered chunks. Can be used as a
+    context manager.
+    """
+
+    def __init__(self, output_file: Union[str, Path], binary=False,
+                 records_per_chunk=RECORDS_PER_CHUNK) -> None:
+        """
+        Creates instance of RecordWriter class and opens the output file. The
+        binary format is used if requested or implied by the file extension.
+        A .gz, .bz2 or .xz extension compresses the output as it is written.
+
+        Args:
+            output_file (Union[str, Path]): file to which records are written
+            binary (bool): True if forcing the binary record format
+            records_per_chunk (int): number of records per buffered write
+        """
+        self._binary = is_binary_file(output_file, binary)
+        self._records_per_chunk = records_per_chunk
+        self._output = open_output_stream(output_file)
+        self._num_records = 0
+        self._num_bytes = 0
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write_records(self, records: Iterable[int]) -> "RecordWriter":
+        """
+        Method for writing an iterable of records in chunks
+
+        Args:
+            records (Iterable[int]): records being written
+
+        Returns:
+            RecordWriter: current instance of RecordWriter
+        """
+        if isinstance(records, (list, array, memoryview)):
+            # Case: random access records. Write slices without copying
+            for start in range(0, len(records), self._records_per_chunk):
+                self._write_chunk(
+                    records[start:start + self._records_per_chunk])
+            return self
+
+        records = iter(records)
+        chunk = list(islice(records, self._records_per_chunk))
+
+        while chunk:
+            self._write_chunk(chunk)
+            chunk = list(islice(records, self._records_per_chunk))
+
+        return self
+
+    def _write_chunk(self, chunk: Iterable[int]) -> "RecordWriter":
+        """
+        Helper method for encoding and writing one chunk of records
+
+        Args:
+            chunk (Iterable[int]): records in the current chunk
+
+        Returns:
+            RecordWriter: current instance of RecordWriter
+        """
+        if self._binary:
+            data = to_binary_bytes(chunk)
+            self._num_records += len(data) // RECORD_SIZE
+        else:
+            lines = list(map(str, chunk))
+            data = ('\n'.join(lines) + '\n').encode("utf-8")
+            self._num_records += len(lines)
+
+        self._output.write(data)
+        self._num_bytes += len(data)
+        return self
+
+    def close(self) -> "RecordWriter":
+        """
+        Method for flushing and closing the output file
+
+        Returns:
+            RecordWriter: current instance of RecordWriter
+        """
+        self._output.close()
+        return self
+
+    def get_num_records(self) -> int:
+        """
+        Getter method for the number of records written so far
+
+        Returns:
+            int: number of records written
+        """
+        return self._num_records
+
+    def get_num_bytes(self) -> int:
+        """
+        Getter method for the number of uncompressed bytes written so far
+
+        Returns:
+            int: number of bytes written
+        """
+        return self._num_bytes
+
+
+def write_sorted_records(output_file: Union[str, Path],
+                         result: Iterable[int], binary=False) -> int:
+    """
+    Function that streams a sorter's result to a file. Python lists, typed
+    arrays and memoryviews are written in slices. DoublyLinkedLists are
+    written by traversing their nodes, without converting to a list.
+
+    Args:
+        output_file (Union[str, Path]): file to which records are written
+        result (Iterable[int]): sorted records
+        binary (bool): True if forcing the binary record format
+
+    Returns:
+        int: number of records written
+    """
+    with RecordWriter(output_file, binary) as writer:
+        writer.write_records(result)
+
+    return writer.get_num_records()
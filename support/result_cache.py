@@ -0,0 +1,209 @@
+"""
+result_cache
+
+This module holds a class for a local on-disk cache of run results. Entries are
+keyed by a hash of the input file contents plus the run configuration, so a
+byte-identical input run with the same settings is answered from the cache
+without parsing or sorting. Each entry stores the report lines, the logged
+Performance object and the sorted output file. The least recently used
+entries are evicted once the cache outgrows its size limit. Hit and miss counts
+and the input bytes that did not need reprocessing are kept across runs.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from support.performance import Performance
+
+CACHE_FORMAT_VERSION = 6
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "QUICKMERGE_CACHE_DIR", Path.home() / ".cache" / "quickmerge"))
+DEFAULT_CACHE_SIZE = 1 << 30
+HASH_BLOCK_SIZE = 1 << 20
+ENTRY_FILE = "entry.pickle"
+SORTED_FILE = "sorted"
+STATS_FILE = "stats.json"
+
+
+class ResultCache:
+    """
+    Class for storing and looking up run results by input contents and
+    configuration
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+                 max_bytes=DEFAULT_CACHE_SIZE) -> None:
+        """
+        Creates instance of ResultCache. The directory is created on first use.
+
+        Args:
+            cache_dir (Union[str, Path]): directory holding the cache entries
+            max_bytes (int): total size of the entries before the least
+                recently used are evicted
+        """
+        self._cache_dir = Path(cache_dir)
+        self._max_bytes = max(max_bytes, 0)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the cache counters
+        """
+        stats = self.get_stats()
+        return f"{stats['hits']} hits, {stats['misses']} misses, " \
+            f"{stats['bytes_saved']} bytes saved"
+
+    def make_key(self, input_file: Union[str, Path],
+                 config: Dict[str, Any]) -> str:
+        """
+        Method that hashes the raw bytes of the input file together with the
+        run configuration
+
+        Args:
+            input_file (Union[str, Path]): input file being run
+            config (Dict[str, Any]): settings that affect the results
+
+        Returns:
+            str: hex digest identifying the results
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([CACHE_FORMAT_VERSION, config],
+                                 sort_keys=True, default=str).encode("utf-8"))
+
+        with open(input_file, 'rb') as records:
+            for block in iter(lambda: records.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def get(self, key: str, input_size=0) \
+            -> Optional[Tuple["Performance", List[str], Optional[Path]]]:
+        """
+        Method that looks up an entry and counts the hit or miss. A hit marks
+        the entry as recently used.
+
+        Args:
+            key (str): key from make_key
+            input_size (int): bytes of input a hit saves from reprocessing
+
+        Returns:
+            Performance: metrics logged by the cached run
+            List[str]: report lines of the cached run
+            Optional[Path]: cached sorted output file, if the run wrote one
+            None: if there is no entry for the key
+        """
+        entry_dir = self._entry_dir(key)
+
+        try:
+            with open(entry_dir / ENTRY_FILE, 'rb') as entry:
+                performance, report = pickle.load(entry)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            self._update_stats(misses=1)
+            return None
+
+        os.utime(entry_dir)
+        self._update_stats(hits=1, bytes_saved=input_size)
+
+        sorted_file = entry_dir / SORTED_FILE
+        return performance, report, \
+            sorted_file if sorted_file.exists() else None
+
+    def put(self, key: str, performance: "Performance", report: List[str],
+            sorted_file: Optional[Union[str, Path]] = None) -> "ResultCache":
+        """
+        Method that stores the results of a run, then evicts the least recently
+        used entries beyond the size limit. The entry is written under a
+        temporary name and renamed, so readers never see half an entry.
+
+        Args:
+            key (str): key from make_key
+            performance (Performance): metrics logged by the run
+            report (List[str]): report lines of the run
+            sorted_file (Union[str, Path]): sorted output file of the run
+
+        Returns:
+            ResultCache: current instance
+        """
+        entry_dir = self._entry_dir(key)
+        staging_dir = entry_dir.with_name(f"{key}.{os.getpid()}.tmp")
+        staging_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(staging_dir / ENTRY_FILE, 'wb') as entry:
+            pickle.dump((performance, report), entry)
+        if sorted_file is not None:
+            shutil.copyfile(sorted_file, staging_dir / SORTED_FILE)
+
+        try:
+            staging_dir.rename(entry_dir)
+        except OSError:
+            # Case: another process stored the same entry first
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        return self.evict()
+
+    def evict(self) -> "ResultCache":
+        """
+        Method that removes the least recently used entries until the cache
+        fits its size limit
+
+        Returns:
+            ResultCache: current instance
+        """
+        entries = []
+        total = 0
+
+        for entry_dir in self._cache_dir.glob("*/*"):
+            if entry_dir.suffix == ".tmp" or not entry_dir.is_dir():
+                continue
+            size = sum(file.stat().st_size for file in entry_dir.iterdir())
+            entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            total += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+        return self
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Getter method for the cache counters kept across runs
+
+        Returns:
+            Dict[str, int]: hits, misses and bytes_saved
+        """
+        try:
+            with open(self._cache_dir / STATS_FILE, encoding="utf-8") as file:
+                stats = json.load(file)
+        except (OSError, ValueError):
+            stats = {}
+
+        return {name: stats.get(name, 0)
+                for name in ("hits", "misses", "bytes_saved")}
+
+    def _entry_dir(self, key: str) -> Path:
+        """
+        Helper method for the directory of an entry, sharded by key prefix
+        """
+        return self._cache_dir / key[:2] / key
+
+    def _update_stats(self, **increments: int) -> None:
+        """
+        Helper method that adds to the counters kept in the stats file
+        """
+        stats = self.get_stats()
+        for name, increment in increments.items():
+            stats[name] += increment
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        staging_file = self._cache_dir / f"{STATS_FILE}.{os.getpid()}.tmp"
+        with open(staging_file, 'w', encoding="utf-8") as file:
+            json.dump(stats, file)
+        os.replace(staging_file, self._cache_dir / STATS_FILE)
@@ -0,0 +1,195 @@
+"""
+runtime_stats
+
+This module contains functions that summarize the runtimes logged by
+repeated runs of one configuration, and compare two configurations. Summaries
+hold the usual order statistics and moments, a bootstrap confidence interval
+for the median and the runs outside Tukey's fences. Comparisons bootstrap the
+ratio of two medians, so a speedup only counts when its interval excludes 1.
+
+Bootstrap resampling is seeded, so a report is reproducible from its runtimes.
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from math import sqrt
+from random import Random
+from typing import List, NamedTuple, Sequence, Tuple
+
+CONFIDENCE = 0.95
+BOOTSTRAP_RESAMPLES = 1000
+BOOTSTRAP_SEED = 0
+OUTLIER_FENCE = 1.5
+MIN_OUTLIER_RUNS = 4
+
+
+class RuntimeSummary(NamedTuple):
+    """
+    Distribution of the runtimes of one configuration, in the runtimes' unit
+    """
+    count: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+    p95: float
+    p99: float
+    ci_low: float
+    ci_high: float
+    outliers: Tuple[float, ...]
+
+
+class RuntimeComparison(NamedTuple):
+    """
+    Ratio of a baseline median runtime to a candidate median runtime, above 1
+    when the candidate is faster, with its bootstrap confidence interval
+    """
+    speedup: float
+    ci_low: float
+    ci_high: float
+
+    def is_significant(self) -> bool:
+        """
+        Method that tells whether the interval excludes equal runtimes
+
+        Returns:
+            bool: True if one configuration is faster beyond noise
+        """
+        return self.ci_low > 1 or self.ci_high < 1
+
+
+def summarize_runtimes(runtimes: Sequence[float], confidence=CONFIDENCE,
+                       resamples=BOOTSTRAP_RESAMPLES,
+                       seed=BOOTSTRAP_SEED) -> "RuntimeSummary":
+    """
+    Function that summarizes the runtimes of repeated runs
+
+    Args:
+        runtimes (Sequence[float]): runtimes of one configuration. Must not be
+            empty
+        confidence (float): coverage of the median's confidence interval
+        resamples (int): number of bootstrap resamples
+        seed (int): seed of the bootstrap resampling
+
+    Returns:
+        RuntimeSummary: distribution of the runtimes
+
+    Raises:
+        ValueError: if there are no runtimes
+    """
+    if not runtimes:
+        raise ValueError("cannot summarize an empty list of runtimes")
+
+    ordered = sorted(runtimes)
+    count = len(ordered)
+    mean = sum(ordered) / count
+    stddev = sqrt(sum((time - mean) ** 2 for time in ordered) / (count - 1)) \
+        if count > 1 else 0.0
+
+    rng = Random(seed)
+    medians = sorted(_median(_resample(ordered, rng))
+                     for _ in range(resamples if count > 1 else 1))
+    alpha = (1 - confidence) / 2
+
+    return RuntimeSummary(count, ordered[0], _median(ordered), mean, stddev,
+                          percentile(ordered, 95), percentile(ordered, 99),
+                          percentile(medians, 100 * alpha),
+                          percentile(medians, 100 * (1 - alpha)),
+                          tuple(find_outliers(ordered)))
+
+
+def compare_runtimes(baseline: Sequence[float], candidate: Sequence[float],
+                     confidence=CONFIDENCE, resamples=BOOTSTRAP_RESAMPLES,
+                     seed=BOOTSTRAP_SEED) -> "RuntimeComparison":
+    """
+    Function that estimates how much faster the candidate configuration is
+    than the baseline, by bootstrapping the ratio of their median runtimes
+
+    Args:
+        baseline (Sequence[float]): runtimes of the baseline configuration
+        candidate (Sequence[float]): runtimes of the candidate configuration
+        confidence (float): coverage of the speedup's confidence interval
+        resamples (int): number of bootstrap resamples
+        seed (int): seed of the bootstrap resampling
+
+    Returns:
+        RuntimeComparison: speedup of the candidate with its interval
+
+    Raises:
+        ValueError: if either configuration has no runtimes
+    """
+    if not baseline or not candidate:
+        raise ValueError("cannot compare an empty list of runtimes")
+
+    rng = Random(seed)
+    ratios = sorted(_ratio(_median(_resample(baseline, rng)),
+                           _median(_resample(candidate, rng)))
+                    for _ in range(resamples))
+    alpha = (1 - confidence) / 2
+
+    return RuntimeComparison(_ratio(_median(sorted(baseline)),
+                                    _median(sorted(candidate))),
+                             percentile(ratios, 100 * alpha),
+                             percentile(ratios, 100 * (1 - alpha)))
+
+
+def find_outliers(runtimes: Sequence[float]) -> List[float]:
+    """
+    Function that lists the runtimes outside Tukey's fences, 1.5 interquartile
+    ranges beyond the quartiles. Fewer than 4 runs have no outliers.
+
+    Args:
+        runtimes (Sequence[float]): runtimes of one configuration
+
+    Returns:
+        List[float]: outlying runtimes in ascending order
+    """
+    if len(runtimes) < MIN_OUTLIER_RUNS:
+        return []
+
+    ordered = sorted(runtimes)
+    q1, q3 = percentile(ordered, 25), percentile(ordered, 75)
+    fence = OUTLIER_FENCE * (q3 - q1)
+    return [time for time in ordered if time < q1 - fence or time > q3 + fence]
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """
+    Function that interpolates the q-th percentile of sorted values
+
+    Args:
+        ordered (Sequence[float]): values in ascending order. Must not be
+            empty
+        q (float): percentile between 0 and 100
+
+    Returns:
+        float: q-th percentile
+    """
+    position = (len(ordered) - 1) * min(max(q, 0), 100) / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _median(ordered: Sequence[float]) -> float:
+    """
+    Helper function for the median of sorted values
+    """
+    return percentile(ordered, 50)
+
+
+def _resample(values: Sequence[float], rng: "Random") -> List[float]:
+    """
+    Helper function that draws a sorted bootstrap resample of the values
+    """
+    return sorted(rng.choices(values, k=len(values)))
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """
+    Helper function for a ratio of runtimes, with a zero runtime only equal
+    to another zero runtime
+    """
+    if not denominator:
+        return float("inf") if numerator else 1.0
+    return numerator / denominator
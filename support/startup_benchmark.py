@@ -0,0 +1,158 @@
+"""
+startup_benchmark
+
+This module contains a startup-time benchmark for the QuickMerge CLI. Each
+scenario runs the CLI in a fresh interpreter with "python -X importtime", then
+checks the total import time against a budget and checks that modules the
+scenario does not need were never imported. It is run from the repository
+root and exits with status 1 on any regression:
+python -m support.startup_benchmark [--repeat N] [--budget-scale X]
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, NamedTuple, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SMALL_INPUT = ROOT / "resources" / "input" / "ran50.dat"
+
+# Modules that only some runs need: worker pools, compression codecs, spill
+# files, memory tracing and the sort runners themselves. bz2 and lzma are left
+# out since argparse imports them through shutil
+HEAVY_MODULES = ("concurrent.futures", "multiprocessing", "gzip", "tempfile",
+                 "tracemalloc", "threading")
+# Small runs trace memory by default, so they may import tracemalloc
+SMALL_INPUT_MODULES = tuple(name for name in HEAVY_MODULES
+                            if name != "tracemalloc")
+RUNNER_MODULES = ("quickmerge.run", "quickmerge.api", "quickmerge.quicksort",
+                  "quickmerge.natural_merge_sort")
+
+
+class Scenario(NamedTuple):
+    """
+    One CLI invocation with its import time budget in ms and the modules it
+    must not import
+    """
+    name: str
+    args: Tuple[str, ...]
+    budget_ms: float
+    forbidden: Tuple[str, ...]
+
+
+def get_scenarios(output_dir: Path) -> List["Scenario"]:
+    """
+    Function that lists the startup scenarios. Reports go to output_dir.
+
+    Args:
+        output_dir (Path): directory where report files are written
+
+    Returns:
+        List[Scenario]: help, validation failure and small input scenarios
+    """
+    return [
+        Scenario("help", ("-h",), 75,
+                 HEAVY_MODULES + RUNNER_MODULES),
+        Scenario("validation_failure",
+                 (str(output_dir / "missing.dat"),
+                  str(output_dir / "report.txt")), 75,
+                 HEAVY_MODULES + RUNNER_MODULES),
+        Scenario("small_input",
+                 (str(SMALL_INPUT), str(output_dir / "report.txt"),
+                  "--no-cache"), 100,
+                 SMALL_INPUT_MODULES)]
+
+
+def parse_import_times(importtime_output: str) -> Dict[str, int]:
+    """
+    Function that parses "-X importtime" output into the cumulative import time
+    of each module in μs
+
+    Args:
+        importtime_output (str): stderr of an interpreter run with importtime
+
+    Returns:
+        Dict[str, int]: cumulative μs by module name, with the total of all
+            top-level imports under ""
+    """
+    times = {"": 0}
+
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split('|')
+        times[name.strip()] = int(cumulative)
+
+        # Top-level imports are not indented beyond the separating space
+        if not name[1:].startswith(' '):
+            times[""] += int(cumulative)
+
+    return times
+
+
+def measure(scenario: "Scenario") -> Dict[str, int]:
+    """
+    Function that runs the CLI once for a scenario with importtime enabled
+
+    Args:
+        scenario (Scenario): CLI invocation being measured
+
+    Returns:
+        Dict[str, int]: cumulative import μs by module name
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "quickmerge",
+         *scenario.args],
+        cwd=ROOT, capture_output=True, text=True, check=False)
+    return parse_import_times(completed.stderr)
+
+
+def main(argv: List[str]) -> int:
+    """
+    Entry point for the startup benchmark
+
+    Args:
+        argv (List[str]): command line arguments
+
+    Returns:
+        int: exit status, 1 if any scenario regressed
+    """
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m support.startup_benchmark")
+    arg_parser.add_argument("--repeat", type=int, default=5, metavar="N",
+                            help="Runs per scenario; the fastest is kept")
+    arg_parser.add_argument("--budget-scale", type=float, default=1.0,
+                            metavar="X",
+                            help="Multiplier on every budget, for slower "
+                            "machines")
+    args = arg_parser.parse_args(argv)
+    failed = False
+
+    with TemporaryDirectory(prefix="quickmerge-startup-") as output_dir:
+        for scenario in get_scenarios(Path(output_dir)):
+            runs = [measure(scenario) for _ in range(max(args.repeat, 1))]
+            fastest = min(runs, key=lambda times: times[""])
+            total_ms = fastest[""] / 1000
+            budget_ms = scenario.budget_ms * args.budget_scale
+            imported = [name for name in scenario.forbidden if name in fastest]
+
+            status = "OK"
+            if total_ms > budget_ms or imported:
+                status = "FAIL"
+                failed = True
+
+            print(f"{scenario.name:<20} {total_ms:>8.1f}ms of imports "
+                  f"(budget {budget_ms:.0f}ms) {status}")
+            if imported:
+                print(f"    imported unneeded modules: {', '.join(imported)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
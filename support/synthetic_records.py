@@ -0,0 +1,273 @@
+"""
+synthetic_records
+
+This module contains functions that generate records of a named input pattern,
+deterministically from a seed, in fixed-size blocks. Only the current block is
+held in memory, plus O(swaps) for nearly sorted records, so files of any size
+can be streamed to disk. Values are spread over a configurable range, 1 to the
+number of records by default, which reproduces the resources/input files:
+
+- asc, rev: ascending or descending values
+- ran: a random permutation of the ascending values, computed per position
+  by a Feistel network so no shuffled list is needed
+- dup: random values, with repeats
+- organ_pipe: ascending to the middle, then descending
+- sawtooth: a number of ascending teeth
+- few_unique: random values out of a few distinct ones
+- nearly_sorted: ascending values with a number of random swaps
+- sorted_batches: batches of sorted random values appended to each other,
+  drawn as ascending order statistics so no batch is sorted in memory
+
+Author: Rani Hinnawi
+Date: 2026-10-19
+"""
+from pathlib import Path
+from random import Random
+from typing import Callable, Iterator, List, Optional, Union
+from support.binary_records import RECORDS_PER_CHUNK
+from support.record_writer import RecordWriter
+
+PATTERNS = ("asc", "rev", "ran", "dup", "organ_pipe", "sawtooth",
+            "few_unique", "nearly_sorted", "sorted_batches")
+DEFAULT_SEED = 0
+DEFAULT_UNIQUE = 10
+DEFAULT_TEETH = 10
+DEFAULT_BATCHES = 10
+DEFAULT_SWAP_RATIO = 0.01
+SIZE_SUFFIXES = {"K": 1000, "M": 1000 ** 2, "G": 1000 ** 3}
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+FEISTEL_ROUNDS = 4
+FEISTEL_MULTIPLIER = 0x9E3779B1
+
+
+def parse_size(text: str) -> int:
+    """
+    Function that reads a record count with an optional K, M or G suffix
+
+    Args:
+        text (str): record count such as 5000, 5K or 10M
+
+    Returns:
+        int: record count
+
+    Raises:
+        ValueError: if the text is not a positive record count
+    """
+    text = text.strip().upper()
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    if text[-1:] in SIZE_SUFFIXES:
+        text = text[:-1]
+
+    size = int(float(text) * multiplier)
+    if size < 1:
+        raise ValueError(f"invalid record count: {text}")
+    return size
+
+
+def iter_synthetic_blocks(pattern: str, size: int, seed=DEFAULT_SEED,
+                          min_value=1, max_value: Optional[int] = None,
+                          swaps: Optional[int] = None, unique=DEFAULT_UNIQUE,
+                          teeth=DEFAULT_TEETH, batches=DEFAULT_BATCHES,
+                          block_size=RECORDS_PER_CHUNK) \
+        -> Iterator[List[int]]:
+    """
+    Function that generates the records of a pattern in blocks. The same
+    arguments always give the same records, whatever the block size.
+
+    Args:
+        pattern (str): one of PATTERNS
+        size (int): number of records
+        seed (int): seed of the random patterns
+        min_value (int): smallest value
+        max_value (int): largest value, or None for min_value + size - 1
+        swaps (int): random swaps of nearly_sorted, or None for 1% of size
+        unique (int): distinct values of few_unique
+        teeth (int): ascending teeth of sawtooth
+        batches (int): sorted batches of sorted_batches
+        block_size (int): number of records per block
+
+    Returns:
+        Iterator[List[int]]: blocks of records in order
+
+    Raises:
+        ValueError: if the pattern is unknown or a setting is out of range
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Invalid pattern: {pattern}. Must be one of "
+                         f"{', '.join(PATTERNS)}")
+
+    if max_value is None:
+        max_value = min_value + max(size, 1) - 1
+    if swaps is None:
+        swaps = int(size * DEFAULT_SWAP_RATIO)
+
+    if size < 0 or min(unique, teeth, batches, block_size) < 1 or swaps < 0:
+        raise ValueError("Size and swaps must be >= 0, and unique values, "
+                         "teeth, batches and block size >= 1")
+    if not INT64_MIN <= min_value <= max_value <= INT64_MAX:
+        raise ValueError(f"Invalid value range {min_value} to {max_value}. "
+                         "Must be ascending and within 64-bit integers")
+
+    if not size:
+        return
+
+    record = _record_function(pattern, size, Random(seed), min_value,
+                              max_value - min_value + 1, swaps, unique,
+                              teeth, batches)
+
+    for start in range(0, size, block_size):
+        yield [record(i) for i in range(start, min(start + block_size, size))]
+
+
+def generate_records(pattern: str, size: int, seed=DEFAULT_SEED,
+                     **options) -> List[int]:
+    """
+    Function that generates the records of a pattern as one list
+
+    Args:
+        pattern (str): one of PATTERNS
+        size (int): number of records
+        seed (int): seed of the random patterns
+        **options: value range and pattern settings of iter_synthetic_blocks
+
+    Returns:
+        List[int]: generated records
+    """
+    records = []
+    for block in iter_synthetic_blocks(pattern, size, seed, **options):
+        records.extend(block)
+
+    return records
+
+
+def write_synthetic_records(output_file: Union[str, Path], pattern: str,
+                            size: int, seed=DEFAULT_SEED, binary=False,
+                            **options) -> int:
+    """
+    Function that streams the records of a pattern to a file, block by block.
+    The extension picks the binary format and compression, as for sorted
+    output.
+
+    Args:
+        output_file (Union[str, Path]): file to which records are written, or
+            - for stdout
+        pattern (str): one of PATTERNS
+        size (int): number of records
+        seed (int): seed of the random patterns
+        binary (bool): True if forcing the binary record format
+        **options: value range and pattern settings of iter_synthetic_blocks
+
+    Returns:
+        int: number of bytes written, before any compression
+    """
+    blocks = iter_synthetic_blocks(pattern, size, seed, **options)
+
+    # Settings are checked before the output file is created
+    first_block = next(blocks, [])
+    with RecordWriter(output_file, binary) as writer:
+        writer.write_records(first_block)
+        for block in blocks:
+            writer.write_records(block)
+
+    return writer.get_num_bytes()
+
+
+def _record_function(pattern: str, size: int, rng: "Random", min_value: int,
+                     span: int, swaps: int, unique: int, teeth: int,
+                     batches: int) -> Callable[[int], int]:
+    """
+    Helper function that builds the function computing the record at each
+    position. Random patterns draw from the generator in position order, so
+    records must be computed in that order.
+
+    Args:
+        pattern (str): one of PATTERNS
+        size (int): number of records
+        rng (Random): seeded random number generator
+        min_value (int): smallest value
+        span (int): number of values in the range
+        swaps (int): random swaps of nearly_sorted
+        unique (int): distinct values of few_unique
+        teeth (int): ascending teeth of sawtooth
+        batches (int): sorted batches of sorted_batches
+
+    Returns:
+        Callable[[int], int]: record by position
+    """
+    def ramp(rank: int, length: int) -> int:
+        # Spreads ranks 0 to length - 1 evenly over the value range
+        return min_value + rank * span // length
+
+    if pattern == "asc":
+        return lambda i: ramp(i, size)
+    if pattern == "rev":
+        return lambda i: ramp(size - 1 - i, size)
+    if pattern == "ran":
+        permute = _feistel_permutation(size, rng)
+        return lambda i: ramp(permute(i), size)
+    if pattern == "dup":
+        return lambda i: min_value + rng.randrange(span)
+    if pattern == "organ_pipe":
+        middle = (size + 1) // 2
+        return lambda i: ramp(min(i, size - 1 - i), middle)
+    if pattern == "sawtooth":
+        tooth = -(-size // teeth)
+        return lambda i: ramp(i % tooth, tooth)
+    if pattern == "few_unique":
+        return lambda i: ramp(rng.randrange(unique), unique)
+
+    if pattern == "nearly_sorted":
+        # Only swapped positions are stored, mapped to the rank they now hold
+        swapped = {}
+        for _ in range(swaps):
+            a, b = rng.randrange(size), rng.randrange(size)
+            swapped[a], swapped[b] = swapped.get(b, b), swapped.get(a, a)
+        return lambda i: ramp(swapped.get(i, i), size)
+
+    # sorted_batches: the minimum of the n uniform values left in a batch,
+    # above the previous value, is drawn directly from its distribution
+    batch = -(-size // batches)
+    state = {"low": 0.0, "left": 0}
+
+    def sorted_batch_record(i: int) -> int:
+        if i % batch == 0:
+            state["low"], state["left"] = 0.0, min(batch, size - i)
+        state["low"] += (1 - state["low"]) * \
+            (1 - rng.random() ** (1 / state["left"]))
+        state["left"] -= 1
+        return min_value + min(int(state["low"] * span), span - 1)
+
+    return sorted_batch_record
+
+
+def _feistel_permutation(size: int, rng: "Random") -> Callable[[int], int]:
+    """
+    Helper function for a random permutation of 0 to size - 1 that maps one
+    position at a time. A balanced Feistel network permutes the smallest even
+    power of 2 covering size, and outputs beyond size are walked through the
+    network again until they fall inside it.
+
+    Args:
+        size (int): number of positions
+        rng (Random): seeded random number generator for the round keys
+
+    Returns:
+        Callable[[int], int]: permuted position by position
+    """
+    bits = max((size - 1).bit_length(), 2)
+    half = (bits + 1) // 2
+    mask = (1 << half) - 1
+    keys = [rng.getrandbits(32) for _ in range(FEISTEL_ROUNDS)]
+
+    def permute(index: int) -> int:
+        while True:
+            left, right = index >> half, index & mask
+            for key in keys:
+                left, right = right, \
+                    left ^ ((right * FEISTEL_MULTIPLIER ^ key) >> 7 & mask)
+            index = left << half | right
+            if index < size:
+                return index
+
+    return permute